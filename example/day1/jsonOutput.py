@@ -1,9 +1,17 @@
+import asyncio
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from streamingJson import StreamingJsonFieldParser, astream_fields
+from structuredOutput import structured_chain
+
 
 # 1. Schema Pydantic
 class Explanation(BaseModel):
@@ -12,14 +20,15 @@ class Explanation(BaseModel):
     difficulty: str = Field(description="beginner/intermediate/advanced")
 
 
-def main():
-    load_dotenv()
-
-    # 2. Parser berbasis schema
-    parser = JsonOutputParser(pydantic_object=Explanation)
+def build_chain(streaming=False, structured=False, llm=None):
+    # 2. Parser berbasis schema (streaming -> emit per field yang sudah lengkap)
+    if streaming:
+        parser = StreamingJsonFieldParser(pydantic_object=Explanation)
+    else:
+        parser = JsonOutputParser(pydantic_object=Explanation)
 
-    # 3. Model
-    llm = ChatOpenAI(
+    # 3. Model (llm custom, mis. FakeChatOpenAI untuk benchmark offline)
+    llm = llm or ChatOpenAI(
         model="gpt-4.1-mini",
         temperature=0.2,
     )
@@ -38,8 +47,17 @@ def main():
         },
     )
 
-    # 5. Rangkaian: prompt -> llm -> parser
-    chain = prompt | llm | parser
+    # 5. structured -> schema dikirim lewat API, format_instructions dikosongkan
+    if structured:
+        return structured_chain(prompt, llm, Explanation)
+
+    # 6. Rangkaian: prompt -> llm -> parser
+    return prompt | llm | parser
+
+
+def main(structured=False):
+    load_dotenv()
+    chain = build_chain(structured=structured)
 
     print("Memanggil chain...\n")
 
@@ -50,5 +68,19 @@ def main():
     print("\nTipe objek:", type(result))
 
 
+async def main_stream():
+    load_dotenv()
+    chain = build_chain(streaming=True)
+
+    print("Streaming chain...\n")
+
+    # field tampil begitu selesai, tanpa menunggu seluruh JSON
+    async for key, value in astream_fields(chain, {"topic": "LangChain"}):
+        print(f"[{key}] {value}")
+
+
 if __name__ == "__main__":
-    main()
+    if "--stream" in sys.argv:
+        asyncio.run(main_stream())
+    else:
+        main(structured="--structured" in sys.argv)
@@ -0,0 +1,86 @@
+import json
+import re
+from typing import Literal, get_args, get_origin
+
+from pydantic import BaseModel
+from langchain_core.utils.json import parse_partial_json
+
+
+FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+# ========== PERBAIKAN LOKAL (tanpa LLM) ==========
+def strip_code_fences(text):
+    match = FENCE_RE.search(text)
+    text = match.group(1) if match else text
+
+    # buang teks penjelasan sebelum object JSON
+    start = text.find("{")
+    return text[start:].strip() if start != -1 else text.strip()
+
+
+def load_lenient(text):
+    """json.loads, kalau gagal tutup string/bracket yang terpotong."""
+    text = strip_code_fences(text)
+    try:
+        # teks penjelasan setelah object JSON juga dibuang
+        return json.loads(text[:text.rfind("}") + 1])
+    except json.JSONDecodeError:
+        data = parse_partial_json(text)
+        if data is None:
+            raise
+        return data
+
+
+def coerce_to_schema(data, schema):
+    """Perbaiki tipe yang umum meleset: case enum, angka dalam string, dst."""
+    if not isinstance(data, dict):
+        return data
+
+    for name, field in schema.model_fields.items():
+        if name not in data:
+            continue
+        ann, value = field.annotation, data[name]
+
+        if get_origin(ann) is Literal and isinstance(value, str):
+            options = {str(o).lower(): o for o in get_args(ann)}
+            data[name] = options.get(value.strip().lower(), value)
+
+        elif ann is int and not isinstance(value, (int, bool)):
+            if isinstance(value, float):
+                data[name] = int(round(value))
+            elif isinstance(value, str):
+                m = NUMBER_RE.search(value)
+                if m:
+                    data[name] = int(round(float(m.group())))
+
+        elif get_origin(ann) is list and isinstance(value, str):
+            data[name] = [value]
+
+        elif isinstance(ann, type) and issubclass(ann, BaseModel):
+            coerce_to_schema(value, ann)
+
+    return data
+
+
+def repair_locally(raw, schema):
+    """Return (instance, None) kalau berhasil, atau (data_terbaik, error)."""
+    try:
+        data = coerce_to_schema(load_lenient(raw), schema)
+    except (json.JSONDecodeError, ValueError) as e:
+        return None, e
+
+    try:
+        return schema.model_validate(data), None
+    except ValueError as e:   # ValidationError turunan ValueError
+        return data, e
+
+
+def format_errors(error):
+    if hasattr(error, "errors"):
+        return "\n".join(
+            f"- {'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+            for err in error.errors()
+        )
+    return f"- {error}"
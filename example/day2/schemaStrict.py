@@ -1,10 +1,19 @@
+import asyncio
+import sys
+from pathlib import Path
 from typing import Literal
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, ValidationError
 from langchain_openai import ChatOpenAI
+from langchain_core.exceptions import OutputParserException
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from modelCascade import CascadeRouter, print_cascade_report
+from streamingJson import StreamingJsonFieldParser, astream_fields
+from structuredOutput import structured_chain
+
 
 # ========== STRICT NESTED SCHEMA ==========
 class Analysis(BaseModel):
@@ -24,10 +33,15 @@ class DevOpsReport(BaseModel):
 
 
 # ===========================================
-def build_chain():
-    parser = JsonOutputParser(pydantic_object=DevOpsReport)
-
-    llm = ChatOpenAI(
+def build_chain(streaming=False, structured=False, llm=None):
+    # streaming -> parser incremental, field di-emit begitu lengkap
+    if streaming:
+        parser = StreamingJsonFieldParser(pydantic_object=DevOpsReport)
+    else:
+        parser = JsonOutputParser(pydantic_object=DevOpsReport)
+
+    # llm custom (mis. FakeChatOpenAI untuk benchmark offline)
+    llm = llm or ChatOpenAI(
         model="gpt-4.1-mini",
         temperature=0.1,
     )
@@ -43,6 +57,10 @@ def build_chain():
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
+    # structured -> JSON schema lewat API, fallback ke parser kalau tidak didukung
+    if structured:
+        return structured_chain(prompt, llm, DevOpsReport)
+
     return prompt | llm | parser
 
 
@@ -60,14 +78,57 @@ def troubleshoot(chain, issue: str):
         return None
 
 
+def build_routed_chain(router=None, structured=False):
+    # nano dulu; ValidationError / confidence rendah -> mini -> gpt-4.1
+    router = router or CascadeRouter(temperature=0.1)
+    chain = router.as_chain(lambda llm: build_chain(structured=structured, llm=llm), schema=DevOpsReport)
+    return router, chain
+
+
+async def troubleshoot_stream(chain, issue: str):
+    print(f"\n=== ANALISIS (stream): {issue} ===")
+
+    result = {}
+    try:
+        # risk_level sudah bisa ditampilkan sebelum suggestions selesai
+        async for key, value in astream_fields(chain, {"issue": issue}):
+            print(f"  [{key}] {value}")
+            result[key] = value
+        DevOpsReport.model_validate(result)
+        print("✅ Output VALID")
+        return result
+    except (ValidationError, OutputParserException) as ve:
+        # field rusak di tengah stream -> OutputParserException dari parser
+        print("❌ Output TIDAK valid schema")
+        print(ve)
+        return None
+
+
 if __name__ == "__main__":
     load_dotenv()
-    chain = build_chain()
+    streaming = "--stream" in sys.argv
+    structured = "--structured" in sys.argv
+    router = None
+    if "--route" in sys.argv and not streaming:
+        router, chain = build_routed_chain(structured=structured)
+    else:
+        chain = build_chain(streaming=streaming, structured=structured)
 
     tests = [
         "API latency meningkat drastis setelah deploy baru",
         "Port already used ketika deploy Docker Container"
     ]
 
-    for t in tests:
-        troubleshoot(chain, t)
+    if streaming:
+        async def run_all():
+            for t in tests:
+                await troubleshoot_stream(chain, t)
+
+        asyncio.run(run_all())
+    else:
+        for t in tests:
+            troubleshoot(chain, t)
+
+    if router is not None:
+        print()
+        print_cascade_report(router)
@@ -1,9 +1,18 @@
+import json
+import sys
+from pathlib import Path
 from typing import Literal
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, ValidationError
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.exceptions import OutputParserException
+
+from jsonRepair import format_errors, repair_locally
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from instrumentation import count, instrument, print_stage_report, stage
 
 
 # ==== STRICT SCHEMA ====
@@ -24,10 +33,13 @@ class DevOpsReport(BaseModel):
 
 
 # ==== BUILD CHAIN ====
-def build_chain():
+def build_chain(structured=False, llm=None):
+    """-> (generate, llm, parser). generate: {"issue"} -> AIMessage mentah,
+    llm dipakai lagi untuk call perbaikan."""
     parser = JsonOutputParser(pydantic_object=DevOpsReport)
 
-    llm = ChatOpenAI(
+    # llm custom (mis. FakeChatOpenAI untuk benchmark offline)
+    llm = llm or ChatOpenAI(
         model="gpt-4.1-mini",
         temperature=0.1,
     )
@@ -42,31 +54,105 @@ def build_chain():
         partial_variables={"format_instructions": parser.get_format_instructions()},
     )
 
-    return prompt, llm, parser
+    # structured -> schema dikirim sebagai response_format, bukan teks di prompt.
+    # Output mentah tetap AIMessage berisi JSON, jadi safe_invoke tidak berubah.
+    # Fallback (model menolak response_format) memakai prompt asli: justru di
+    # jalur itu format_instructions dibutuhkan.
+    if structured:
+        native = prompt.partial(format_instructions="") | llm.bind(response_format=DevOpsReport)
+        generate = native.with_fallbacks([prompt | llm])
+        llm = llm.bind(response_format=DevOpsReport).with_fallbacks([llm])
+        return generate, llm, parser
+
+    return prompt | llm, llm, parser
 
 
 # ==== SELF HEALING PIPELINE ====
-def safe_invoke(prompt, llm, parser, issue):
-    try:
-        return (prompt | llm | parser).invoke({"issue": issue})
-    except ValidationError:
-        # try healing
-        raw = (prompt | llm).invoke({"issue": issue}).content
-        fix_prompt = f"""
-Perbaiki JSON berikut agar VALID sesuai schema:
+class HealMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.valid_first_try = 0
+        self.repaired_locally = 0
+        self.repaired_by_llm = 0
+        self.failed = 0
+        self.llm_calls = 0
+
+    def record(self, outcome, llm_calls):
+        self.requests += 1
+        self.llm_calls += llm_calls
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "valid_first_try": self.valid_first_try,
+            "repaired_locally": self.repaired_locally,
+            "repaired_by_llm": self.repaired_by_llm,
+            "failed": self.failed,
+            "llm_calls_per_request": self.llm_calls / self.requests if self.requests else 0.0,
+        }
+
+
+HEAL_METRICS = HealMetrics()
+
+REPAIR_PROMPT = """JSON berikut gagal validasi schema. Perbaiki HANYA field yang error,
+pertahankan isi field lain, dan jawab dengan JSON saja.
+
+Error validasi:
+{errors}
+
+JSON:
+{json}
+"""
 
-{parser.get_format_instructions()}
 
-JSON rusak:
-{raw}
-"""
-        healed = llm.invoke(fix_prompt).content
-        return parser.parse(healed)
+def safe_invoke(generate, llm, parser, issue, metrics=HEAL_METRICS):
+    schema = parser.pydantic_object
+
+    # 1. satu call LLM, output mentah disimpan (tidak dibuang kalau gagal)
+    raw = generate.invoke({"issue": issue}).content
+
+    try:
+        with stage("validate", schema.__name__):
+            report = schema.model_validate(parser.parse(raw))
+        metrics.record("valid_first_try", 1)
+        return report.model_dump()
+    except (OutputParserException, ValidationError):
+        pass
+
+    # 2. perbaikan lokal: code fence, bracket terpotong, case enum, int
+    with stage("repair", "local"):
+        result, error = repair_locally(raw, schema)
+    if error is None:
+        metrics.record("repaired_locally", 1)
+        count("heals_total", kind="local")
+        return result.model_dump()
+
+    # 3. satu call perbaikan yang hanya membawa error validasi
+    broken = raw if result is None else json.dumps(result, ensure_ascii=False)
+    healed = llm.invoke(REPAIR_PROMPT.format(errors=format_errors(error), json=broken)).content
+
+    with stage("repair", "llm"):
+        result, error = repair_locally(healed, schema)
+    if error is None:
+        metrics.record("repaired_by_llm", 2)
+        count("heals_total", kind="llm")
+        return result.model_dump()
+
+    metrics.record("failed", 2)
+    count("heal_failures_total")
+    raise error
 
 
 if __name__ == "__main__":
     load_dotenv()
-    prompt, llm, parser = build_chain()
+    generate, llm, parser = build_chain(structured="--structured" in sys.argv)
 
-    result = safe_invoke(prompt, llm, parser, "Server pod mati karena memory leak")
+    # --trace -> span per stage ke traces.jsonl + histogram Prometheus ke metrics.prom
+    trace = "--trace" in sys.argv
+    with instrument(trace_path="traces.jsonl" if trace else None,
+                    prom_path="metrics.prom" if trace else None):
+        result = safe_invoke(generate, llm, parser, "Server pod mati karena memory leak")
     print(result)
+    print("Heal metrics:", HEAL_METRICS.summary())
+    print_stage_report()
@@ -0,0 +1,89 @@
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class NodeTiming:
+    start: float
+    end: float
+
+    @property
+    def seconds(self):
+        return self.end - self.start
+
+
+class DAG:
+    """DAG kecil: tiap node mendeklarasikan input-nya (nama node lain atau
+    input awal). Node yang tidak saling bergantung jalan bersamaan."""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name, fn, deps=()):
+        # fn async -> di-await; fn sync (mis. chain.invoke) -> asyncio.to_thread
+        self.nodes[name] = (fn, tuple(deps))
+        return self
+
+    async def run(self, **inputs):
+        for name, (_, deps) in self.nodes.items():
+            unknown = [d for d in deps if d not in self.nodes and d not in inputs]
+            if unknown:
+                raise ValueError(f"Node {name!r} bergantung pada input yang tidak ada: {unknown}")
+
+        origin = time.perf_counter()
+        timings = {}
+        tasks = {}
+
+        async def resolve(dep):
+            return inputs[dep] if dep in inputs else await tasks[dep]
+
+        async def run_node(name):
+            fn, deps = self.nodes[name]
+            kwargs = {d: await resolve(d) for d in deps}
+
+            start = time.perf_counter() - origin
+            if inspect.iscoroutinefunction(fn):
+                result = await fn(**kwargs)
+            else:
+                result = await asyncio.to_thread(fn, **kwargs)
+            timings[name] = NodeTiming(start, time.perf_counter() - origin)
+            return result
+
+        # semua task dibuat dulu, baru di-await -> urutan deklarasi bebas
+        for name in self.nodes:
+            tasks[name] = asyncio.ensure_future(run_node(name))
+        try:
+            values = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for t in tasks.values():
+                t.cancel()
+            raise
+
+        return dict(zip(tasks, values)), timings
+
+    def critical_path(self, timings):
+        # mundur dari node yang selesai paling akhir, selalu ikuti dependency
+        # yang selesainya paling lambat
+        name = max(timings, key=lambda n: timings[n].end)
+        path = [name]
+        while True:
+            deps = [d for d in self.nodes[name][1] if d in timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda d: timings[d].end)
+            path.append(name)
+        return path[::-1]
+
+
+def print_report(dag, timings):
+    print(f"{'node':<16} {'start':>8} {'end':>8} {'latency':>9}")
+    for name, t in sorted(timings.items(), key=lambda kv: kv[1].start):
+        print(f"{name:<16} {t.start:>7.2f}s {t.end:>7.2f}s {t.seconds:>8.2f}s")
+
+    path = dag.critical_path(timings)
+    total = max(t.end for t in timings.values())
+    serial = sum(t.seconds for t in timings.values())
+    print(f"\nCritical path: {' -> '.join(path)}")
+    print(f"End-to-end {total:.2f}s (jumlah semua node {serial:.2f}s)")
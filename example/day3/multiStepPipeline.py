@@ -1,10 +1,20 @@
+import asyncio
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from typing import Literal
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from chainRegistry import get_llm
+from dagExecutor import DAG, print_report
+from instrumentation import instrument, print_stage_report
+from modelCascade import CascadeRouter, print_cascade_report
+from structuredOutput import structured_chain
+
 
 # ========== FINAL OUTPUT SCHEMA ==========
 class FinalDevOpsReport(BaseModel):
@@ -15,9 +25,8 @@ class FinalDevOpsReport(BaseModel):
     estimated_fix_time_minutes: int
 
 
-def step1_classifier(llm, issue):
-    prompt = PromptTemplate.from_template(
-        """
+STEP1_PROMPT = PromptTemplate.from_template(
+    """
 Klasifikasikan issue berikut secara singkat.
 Berikan dalam format:
 - issue_type
@@ -30,15 +39,10 @@ Jawab dengan format:
 issue_type: ...
 severity: ...
 """
-    )
-    chain = prompt | llm 
-    res = chain.invoke(prompt.invoke({"issue": issue}).text)
-    return res.content
-
+)
 
-def step2_root_cause(llm, issue, classification):
-    prompt = PromptTemplate.from_template(
-        """
+STEP2_PROMPT = PromptTemplate.from_template(
+    """
 Issue:
 {issue}
 
@@ -48,49 +52,74 @@ Classification:
 Jelaskan akar masalah (root cause) secara teknis dan jelas.
 Jawab 3-5 kalimat.
 """
-    )
-    chain = prompt | llm 
-    res = chain.invoke({"issue": issue, "classification": classification})
-    return res.content
+)
 
+# versi tanpa classification -> root cause bisa di-draft bersamaan dengan step1
+STEP2_DRAFT_PROMPT = PromptTemplate.from_template(
+    """
+Issue:
+{issue}
 
-def step3_action_plan(llm, root_cause):
-    prompt = PromptTemplate.from_template(
-        """
+Jelaskan akar masalah (root cause) secara teknis dan jelas.
+Jawab 3-5 kalimat.
+"""
+)
+
+STEP3_PROMPT = PromptTemplate.from_template(
+    """
 Root cause:
 {root_cause}
 
 Buat rencana tindakan untuk memperbaiki masalah.
 Output 3-5 rekomendasi dalam bullet list (tanpa numbering).
 """
-    )
-    chain = prompt | llm 
-    res = chain.invoke(prompt.invoke({"root_cause": root_cause}).text)
+)
+
+# parser & format_instructions cukup dibuat sekali, bukan tiap panggilan step4
+STEP4_PARSER = JsonOutputParser(pydantic_object=FinalDevOpsReport)
+
+STEP4_PROMPT = PromptTemplate(
+    template=(
+        "Format seluruh data menjadi JSON valid.\n"
+        "{format_instructions}\n\n"
+        "Classification:\n{classification}\n\n"
+        "Root cause:\n{root_cause}\n\n"
+        "Actions:\n{actions}\n"
+    ),
+    input_variables=["classification", "root_cause", "actions"],
+    partial_variables={"format_instructions": STEP4_PARSER.get_format_instructions()},
+)
+
+
+# prompt di-render sekali oleh chain (dulu hasil render dimasukkan lagi ke prompt)
+def step1_classifier(llm, issue):
+    chain = STEP1_PROMPT | llm 
+    res = chain.invoke({"issue": issue})
     return res.content
 
 
-def step4_format_json(llm, classification, root_cause, actions):
-    class ParserOut(BaseModel):
-        issue_type: str
-        severity: Literal["low", "medium", "high", "critical"]
-        root_cause: str
-        recommended_actions: list[str]
-        estimated_fix_time_minutes: int
-
-    parser = JsonOutputParser(pydantic_object=ParserOut)
-
-    prompt = PromptTemplate(
-        template=(
-            "Format seluruh data menjadi JSON valid.\n"
-            "{format_instructions}\n\n"
-            "Classification:\n{classification}\n\n"
-            "Root cause:\n{root_cause}\n\n"
-            "Actions:\n{actions}\n"
-        ),
-        input_variables=["classification", "root_cause", "actions"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
-    )
-    chain = prompt | llm | parser
+def step2_root_cause(llm, issue, classification=None):
+    if classification is None:
+        res = (STEP2_DRAFT_PROMPT | llm).invoke({"issue": issue})
+        return res.content
+
+    chain = STEP2_PROMPT | llm 
+    res = chain.invoke({"issue": issue, "classification": classification})
+    return res.content
+
+
+def step3_action_plan(llm, root_cause):
+    chain = STEP3_PROMPT | llm 
+    res = chain.invoke({"root_cause": root_cause})
+    return res.content
+
+
+def step4_format_json(llm, classification, root_cause, actions, structured=False):
+    # structured -> schema lewat API (format_instructions kosong), fallback ke parser
+    if structured:
+        chain = structured_chain(STEP4_PROMPT, llm, FinalDevOpsReport)
+    else:
+        chain = STEP4_PROMPT | llm | STEP4_PARSER
     res = chain.invoke({
         "classification": classification,
         "root_cause": root_cause,
@@ -100,29 +129,89 @@ def step4_format_json(llm, classification, root_cause, actions):
     return res
 
 
-def run_pipeline(issue: str):
+SEVERITIES = ("low", "medium", "high", "critical")
+
+
+def valid_classification(text):
+    # step1 harus memberi issue_type & severity yang dikenal, kalau tidak -> tier berikutnya
+    fields = dict(
+        line.strip("- ").split(":", 1) for line in text.lower().splitlines() if ":" in line
+    )
+    return bool(fields.get("issue_type", "").strip()) and fields.get("severity", "").strip() in SEVERITIES
+
+
+def run_pipeline(issue: str, trace_path=None, router=None, structured=False):
     load_dotenv()
-    llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0.1)
+    # tiap step mulai dari gpt-4.1-nano; naik ke mini / gpt-4.1 hanya kalau
+    # output gagal validasi atau confidence rendah
+    router = router or CascadeRouter(temperature=0.1)
+
+    # tiap step = prompt | llm (| parser) -> latency, token & cost per stage tercatat
+    with instrument(trace_path=trace_path):
+        print("=== STEP 1: CLASSIFICATION ===")
+        step1 = router.run(lambda llm: step1_classifier(llm, issue), accept=valid_classification)
+        print(step1)
+
+        print("\n=== STEP 2: ROOT CAUSE ANALYSIS ===")
+        step2 = router.run(lambda llm: step2_root_cause(llm, issue, step1))
+        print(step2)
+
+        print("\n=== STEP 3: ACTION PLAN ===")
+        step3 = router.run(lambda llm: step3_action_plan(llm, step2))
+        print(step3)
+
+        print("\n=== STEP 4: FINAL JSON ===")
+        final = router.run(lambda llm: step4_format_json(llm, step1, step2, step3, structured),
+                           schema=FinalDevOpsReport)
+        print(final)
+
+    print()
+    print_stage_report()
+    print()
+    print_cascade_report(router)
+    return final
 
-    print("=== STEP 1: CLASSIFICATION ===")
-    step1 = step1_classifier(llm, issue)
-    print(step1)
 
-    print("\n=== STEP 2: ROOT CAUSE ANALYSIS ===")
-    step2 = step2_root_cause(llm, issue, step1)
-    print(step2)
+def build_dag(llm, structured=False):
+    # classification & root cause hanya butuh issue -> jalan paralel;
+    # classification baru dipakai lagi di step4
+    return (
+        DAG()
+        .add("classification", lambda issue: step1_classifier(llm, issue), deps=["issue"])
+        .add("root_cause", lambda issue: step2_root_cause(llm, issue), deps=["issue"])
+        .add("actions", lambda root_cause: step3_action_plan(llm, root_cause), deps=["root_cause"])
+        .add(
+            "final",
+            lambda classification, root_cause, actions: step4_format_json(
+                llm, classification, root_cause, actions, structured
+            ),
+            deps=["classification", "root_cause", "actions"],
+        )
+    )
 
-    print("\n=== STEP 3: ACTION PLAN ===")
-    step3 = step3_action_plan(llm, step2)
-    print(step3)
 
-    print("\n=== STEP 4: FINAL JSON ===")
-    final = step4_format_json(llm, step1, step2, step3)
-    print(final)
+async def arun_pipeline_dag(issue: str, llm=None, trace_path=None, structured=False):
+    load_dotenv()
+    llm = llm or get_llm(model="gpt-4.1-nano", temperature=0.1)
 
-    return final
+    dag = build_dag(llm, structured)
+    with instrument(trace_path=trace_path):
+        results, timings = await dag.run(issue=issue)
+
+    print("=== FINAL JSON ===")
+    print(results["final"])
+    print()
+    print_report(dag, timings)
+    print()
+    print_stage_report()
+
+    return results["final"]
+
+
+def run_pipeline_dag(issue: str, llm=None, trace_path=None, structured=False):
+    return asyncio.run(arun_pipeline_dag(issue, llm, trace_path, structured))
 
 
 if __name__ == "__main__":
-    run_pipeline("Kubernetes HPA tidak scaling meskipun CPU 200%")
+    run_pipeline_dag("Kubernetes HPA tidak scaling meskipun CPU 200%")
     # run_pipeline("API latency naik drastis setelah deploy baru")
@@ -1,6 +1,6 @@
 from dotenv import load_dotenv
 from langchain_community.document_loaders import TextLoader, PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from fastSplit import FastTextSplitter
 
 
 # 1. LOAD DOCUMENT
@@ -15,8 +15,9 @@ def load_pdf(path):
 
 
 # 2. SPLIT DOCUMENTS
-def split_docs(docs):
-    splitter = RecursiveCharacterTextSplitter(
+# splitter_cls=RecursiveCharacterTextSplitter -> baseline lama (angka benchmark day4)
+def split_docs(docs, splitter_cls=FastTextSplitter):
+    splitter = splitter_cls(
         chunk_size=800,
         chunk_overlap=150,
         length_function=len
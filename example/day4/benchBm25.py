@@ -0,0 +1,63 @@
+import random
+import time
+
+from langchain_core.documents import Document
+
+from bm25Index import build_index, tokenize
+from ragMin import naive_retriever
+
+
+N_CHUNKS = 100_000
+WORDS_PER_CHUNK = 120
+
+QUERIES = [
+    "bagaimana scalling di Kubernates",
+    "apa penyebab HPA tidak melakukan scaling",
+    "timeout to bank API payment-svc",
+    "exit code 137 memory limit",
+]
+
+
+def make_corpus(path="sample_noise.txt", n=N_CHUNKS, seed=42):
+    rng = random.Random(seed)
+    with open(path, encoding="utf-8") as f:
+        vocab = tokenize(f.read())
+
+    # tambahkan token unik supaya distribusi term tidak terlalu seragam
+    vocab += [f"svc{i}" for i in range(5000)]
+
+    return [
+        Document(page_content=" ".join(rng.choices(vocab, k=WORDS_PER_CHUNK)))
+        for _ in range(n)
+    ]
+
+
+def bench(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    chunks = make_corpus()
+    print(f"Corpus: {len(chunks)} chunks x {WORDS_PER_CHUNK} kata")
+
+    start = time.perf_counter()
+    index = build_index(chunks)
+    print(f"Build BM25 index: {time.perf_counter() - start:.2f}s "
+          f"({len(index.postings)} terms)\n")
+
+    print(f"{'query':<45} {'naive (ms)':>12} {'bm25 (ms)':>12} {'speedup':>9}")
+    for q in QUERIES:
+        t_naive = bench(lambda: naive_retriever(chunks, q), repeat=1)
+        t_bm25 = bench(lambda: index.search(q, k=3), repeat=20)
+        print(f"{q:<45} {t_naive * 1000:>12.1f} {t_bm25 * 1000:>12.2f} "
+              f"{t_naive / t_bm25:>8.0f}x")
+
+    # incremental update: hapus & tambah chunk tanpa rebuild
+    start = time.perf_counter()
+    for doc_id in range(1000):
+        index.remove(doc_id)
+    index.add_many(chunks[:1000])
+    print(f"\nRemove + add 1000 chunks: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,108 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchStreamSplit import make_file
+
+
+SIZES_MB = [10, 100, 1024]
+MODES = ("recursive", "fast", "fast-tokens")
+# 1GB teks + semua chunk sebagai Document tidak muat di RAM ~5GB (splitter apa pun)
+# -> ukuran besar dibaca per block seperti iter_load_and_split
+STREAM_FROM_MB = 512
+
+
+def make_long_file(size_mb, src="sample.txt"):
+    # paragraf > chunk_size (dump PDF/log tanpa baris kosong) -> splitter harus
+    # turun sampai level kata, di sini RecursiveCharacterTextSplitter paling lambat
+    with open(src, encoding="utf-8") as f:
+        text = " ".join(f.read().split()) + "\n\n"
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as out:
+        written, i = 0, 0
+        while written < size_mb * 1024**2:
+            block = f"DUMP {i} {text}"
+            out.write(block)
+            written += len(block.encode("utf-8"))
+            i += 1
+    return path
+
+
+CORPORA = {"paragraf": make_file, "panjang": make_long_file}
+
+
+def make_splitter(mode):
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from fastSplit import FastTextSplitter
+
+    if mode == "recursive":
+        return RecursiveCharacterTextSplitter(
+            chunk_size=800, chunk_overlap=150, length_function=len, add_start_index=True
+        )
+    if mode == "fast":
+        return FastTextSplitter(chunk_size=800, chunk_overlap=150)
+    return FastTextSplitter(chunk_size=200, chunk_overlap=40, length_function="tokens")
+
+
+def count_streaming(splitter, path):
+    # sama dengan stream_split, tapi splitter bisa diganti dan chunk langsung dibuang
+    from streamSplit import iter_text_blocks
+
+    n, buffer = 0, ""
+    for block in iter_text_blocks(path):
+        buffer += block
+        docs = splitter.create_documents([buffer])
+        if len(docs) < 2:
+            continue
+        n += len(docs) - 1
+        buffer = buffer[docs[-1].metadata["start_index"]:]
+    if buffer:
+        n += len(splitter.create_documents([buffer]))
+    return n
+
+
+def run_child(mode, path, streaming):
+    from baseSplit import load_text
+
+    splitter = make_splitter(mode)
+    docs = None if streaming else load_text(path)
+
+    start = time.perf_counter()
+    n = count_streaming(splitter, path) if streaming else len(splitter.split_documents(docs))
+    elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{n} {elapsed:.2f} {peak_mb:.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3], sys.argv[4] == "stream")
+        sys.exit(0)
+
+    # python benchFastSplit.py 10 100  -> ukuran tertentu saja
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES_MB
+    print(f"{'file':>8} {'korpus':<9} {'input':<7} {'mode':<12} {'chunks':>9} "
+          f"{'split (s)':>10} {'MB/s':>8} {'peak RSS (MB)':>14}")
+    for size in sizes:
+        how = "stream" if size >= STREAM_FROM_MB else "file"
+        for corpus, make in CORPORA.items():
+            path = make(size)
+            try:
+                for mode in MODES:
+                    proc = subprocess.run(
+                        [sys.executable, __file__, "--child", mode, path, how],
+                        capture_output=True, text=True,
+                    )
+                    label = f"{size:>6}MB {corpus:<9} {how:<7} {mode:<12}"
+                    if proc.returncode != 0:
+                        print(f"{label} gagal (exit {proc.returncode})")
+                        continue
+                    n, elapsed, peak = proc.stdout.split()
+                    print(f"{label} {n:>9} {elapsed:>10} {size / float(elapsed):>8.1f} {peak:>14}")
+            finally:
+                os.remove(path)
@@ -0,0 +1,63 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SIZES_MB = [10, 50, 200]
+
+
+def make_file(size_mb, src="sample.txt"):
+    with open(src, encoding="utf-8") as f:
+        text = f.read() + "\n\n"
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as out:
+        written, i = 0, 0
+        while written < size_mb * 1024**2:
+            block = f"==== DUMP {i} ====\n{text}"
+            out.write(block)
+            written += len(block.encode("utf-8"))
+            i += 1
+    return path
+
+
+def run_child(mode, path):
+    # jalankan di proses terpisah supaya ru_maxrss tiap mode tidak tercampur.
+    # Splitter dipatok ke RecursiveCharacterTextSplitter supaya angka tetap
+    # sebanding dengan baseline awal; perbandingan splitter di benchFastSplit.py
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from baseSplit import load_text, split_docs
+    from streamSplit import stream_split
+
+    start = time.perf_counter()
+    if mode == "baseline":
+        n = len(split_docs(load_text(path), splitter_cls=RecursiveCharacterTextSplitter))
+    else:
+        n = sum(1 for _ in stream_split(path, splitter_cls=RecursiveCharacterTextSplitter))
+    elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{n} {elapsed:.2f} {peak_mb:.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    print(f"{'file':>8} {'mode':<10} {'chunks':>9} {'time (s)':>9} {'peak RSS (MB)':>14}")
+    for size in SIZES_MB:
+        path = make_file(size)
+        try:
+            for mode in ("baseline", "stream"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, path],
+                    capture_output=True, text=True, check=True,
+                ).stdout.split()
+                n, elapsed, peak = out
+                print(f"{size:>6}MB {mode:<10} {n:>9} {elapsed:>9} {peak:>14}")
+        finally:
+            os.remove(path)
@@ -0,0 +1,94 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Inverted index term -> {doc_id: tf} dengan scoring BM25.
+
+    Tokenisasi hanya dilakukan sekali saat chunk ditambahkan, jadi biaya
+    query sebanding dengan panjang postings dari term di query, bukan
+    dengan ukuran corpus.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_len = {}
+        self.docs = {}
+        self.total_len = 0
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ---------- INDEXING ----------
+    def add(self, chunk):
+        doc_id = self._next_id
+        self._next_id += 1
+
+        tf = Counter(tokenize(chunk.page_content))
+        for term, freq in tf.items():
+            self.postings.setdefault(term, {})[doc_id] = freq
+
+        length = sum(tf.values())
+        self.doc_len[doc_id] = length
+        self.total_len += length
+        self.docs[doc_id] = chunk
+        return doc_id
+
+    def add_many(self, chunks):
+        return [self.add(c) for c in chunks]
+
+    def remove(self, doc_id):
+        chunk = self.docs.pop(doc_id)
+        self.total_len -= self.doc_len.pop(doc_id)
+
+        for term in set(tokenize(chunk.page_content)):
+            plist = self.postings[term]
+            del plist[doc_id]
+            if not plist:
+                del self.postings[term]
+
+    # ---------- SEARCH ----------
+    def idf(self, term):
+        df = len(self.postings.get(term, ()))
+        n = len(self.docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=3):
+        if not self.docs:
+            return []
+
+        avgdl = self.total_len / len(self.docs)
+        k1, b = self.k1, self.b
+        scores = {}
+
+        for term, qtf in Counter(tokenize(query)).items():
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+
+            idf = self.idf(term)
+            for doc_id, freq in plist.items():
+                norm = k1 * (1 - b + b * self.doc_len[doc_id] / avgdl)
+                s = idf * freq * (k1 + 1) / (freq + norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + qtf * s
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.docs[doc_id], score) for doc_id, score in top]
+
+
+def build_index(chunks, k1=1.5, b=0.75):
+    index = BM25Index(k1=k1, b=b)
+    index.add_many(chunks)
+    return index
@@ -0,0 +1,202 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import lru_cache
+
+from langchain_core.documents import Document
+
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+
+# ====================================
+# Fast splitter: pengganti RecursiveCharacterTextSplitter
+# ====================================
+# Hasil chunk sama dengan RecursiveCharacterTextSplitter (keep_separator=True,
+# strip_whitespace=True), tapi:
+# 1. teks tidak pernah di-split/join ulang: semua level rekursi bekerja dengan
+#    offset (start, end) di atas string asli, satu slice per chunk
+# 2. mode karakter: panjang = selisih offset, batas chunk + overlap dicari
+#    dengan bisect; mode token: merge satu pass (deque, bukan list[1:])
+# 3. start_index langsung dari offset (bukan text.find per chunk) + offset byte
+# 4. length_function="tokens" -> tokenizer tiktoken di-cache per encoding
+
+
+@lru_cache(maxsize=None)
+def get_token_length(encoding="cl100k_base"):
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding(encoding)
+        return lambda text: len(enc.encode_ordinary(text))
+    except Exception:
+        # offline / tiktoken tidak ada: estimasi kasar ~4 karakter per token
+        return lambda text: max(1, len(text) // 4)
+
+
+@lru_cache(maxsize=None)
+def _separator_re(sep):
+    return re.compile(re.escape(sep))
+
+
+class FastTextSplitter:
+    def __init__(self, chunk_size=800, chunk_overlap=150, separators=None,
+                 length_function=len, encoding="cl100k_base", add_start_index=True):
+        if chunk_overlap > chunk_size:
+            raise ValueError("chunk_overlap harus <= chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators or DEFAULT_SEPARATORS
+        self.add_start_index = add_start_index
+
+        # len -> panjang dihitung dari offset saja, teks tidak di-slice
+        self._by_chars = length_function is len
+        if length_function == "tokens":
+            length_function = get_token_length(encoding)
+        self.length_function = length_function
+        # panjang separator join (keep_separator -> "") ikut dihitung seperti LangChain
+        self._sep_len = 0 if self._by_chars else length_function("")
+
+    # ---------- SPAN ----------
+    def _bounds(self, text, start, end, sep):
+        """Batas potongan per separator: potongan ke-i = [P[i], P[i+1]).
+        Separator ikut di awal potongan berikutnya (keep_separator="start")."""
+        if sep == "":
+            return list(range(start, end + 1))
+        # finditer(pos, endpos) tidak meng-copy teks; loop-nya di C
+        bounds = [m.start() for m in _separator_re(sep).finditer(text, start, end)]
+        if not bounds or bounds[0] != start:
+            bounds.insert(0, start)
+        if end > bounds[-1]:
+            bounds.append(end)
+        return bounds
+
+    def _split(self, text, start, end, separators, out):
+        sep, rest = separators[-1], []
+        for i, s in enumerate(separators):
+            if s == "" or text.find(s, start, end) != -1:
+                sep, rest = s, separators[i + 1:]
+                break
+
+        if self._by_chars:
+            self._split_chars(text, start, end, sep, rest, out)
+            return
+
+        good = []
+        P = self._bounds(text, start, end, sep)
+        for a, b in zip(P, P[1:]):
+            length = self.length_function(text[a:b])
+            if length < self.chunk_size:
+                good.append((a, b, length))
+                continue
+            if good:
+                self._merge(text, good, out)
+                good = []
+            if rest:
+                self._split(text, a, b, rest, out)
+            else:
+                out.append((a, b))        # tidak bisa dipecah lagi, apa adanya
+        if good:
+            self._merge(text, good, out)
+
+    # ---------- MODE KARAKTER ----------
+    def _split_chars(self, text, start, end, sep, rest, out):
+        # titik potong chunk dan awal overlap dicari dengan bisect atas offset:
+        # O(chunk * log n), bukan loop Python per potongan
+        P = self._bounds(text, start, end, sep)
+        n, size, overlap = len(P) - 1, self.chunk_size, self.chunk_overlap
+
+        h = 0
+        while h < n:
+            if P[h + 1] - P[h] >= size:
+                # potongan terlalu besar -> separator berikutnya (atau apa adanya)
+                if rest:
+                    self._split(text, P[h], P[h + 1], rest, out)
+                else:
+                    out.append((P[h], P[h + 1]))
+                h += 1
+                continue
+
+            # chunk baru mulai di potongan h
+            while True:
+                k = bisect_right(P, P[h] + size, h + 1, n + 1)
+                if k > n:
+                    self._emit(text, P[h], P[n], out)
+                    h = n
+                    break
+                j = k - 1                       # potongan j tidak muat lagi
+                self._emit(text, P[h], P[j], out)
+                if P[j + 1] - P[j] >= size:
+                    h = j                       # ditangani di atas, tanpa overlap
+                    break
+                h = min(j, max(bisect_left(P, P[j] - overlap, h, j),
+                               bisect_left(P, P[j + 1] - size, h, j)))
+
+    # ---------- MODE LENGTH_FUNCTION ----------
+    def _merge(self, text, pieces, out):
+        # potongan bersebelahan -> chunk = satu span kontinu [awal, akhir)
+        sep = self._sep_len
+        current, total = deque(), 0
+        for a, b, length in pieces:
+            if current and total + length + sep > self.chunk_size:
+                self._emit(text, current[0][0], current[-1][1], out)
+                # mundur sampai sisa chunk <= overlap (dan potongan baru muat)
+                while total > self.chunk_overlap or (
+                    total + length + (sep if current else 0) > self.chunk_size and total > 0
+                ):
+                    total -= current.popleft()[2] + (sep if current else 0)
+            current.append((a, b, length))
+            total += length + (sep if len(current) > 1 else 0)
+        if current:
+            self._emit(text, current[0][0], current[-1][1], out)
+
+    @staticmethod
+    def _emit(text, a, b, out):
+        while a < b and text[a].isspace():
+            a += 1
+        while b > a and text[b - 1].isspace():
+            b -= 1
+        if b > a:
+            out.append((a, b))
+
+    def split_spans(self, text):
+        """List offset karakter (start, end) tiap chunk."""
+        out = []
+        self._split(text, 0, len(text), self.separators, out)
+        return out
+
+    # ---------- API ala LangChain ----------
+    def split_text(self, text):
+        return [text[a:b] for a, b in self.split_spans(text)]
+
+    def create_documents(self, texts, metadatas=None):
+        docs = []
+        for i, text in enumerate(texts):
+            base = metadatas[i] if metadatas else {}
+            ascii_only = text.isascii()
+            prev_end, prev_end_byte = 0, 0
+
+            for a, b in self.split_spans(text):
+                chunk = text[a:b]
+                metadata = dict(base)
+                if self.add_start_index:
+                    if ascii_only:
+                        start_byte, end_byte = a, b
+                    else:
+                        # start chunk naik monoton -> offset byte dihitung dari chunk
+                        # sebelumnya (cukup encode bagian overlap / gap-nya saja)
+                        if a >= prev_end:
+                            start_byte = prev_end_byte + len(text[prev_end:a].encode("utf-8"))
+                        else:
+                            start_byte = prev_end_byte - len(text[a:prev_end].encode("utf-8"))
+                        end_byte = start_byte + len(chunk.encode("utf-8"))
+                        prev_end, prev_end_byte = b, end_byte
+                    metadata.update(start_index=a, start_byte=start_byte, end_byte=end_byte)
+                docs.append(Document(page_content=chunk, metadata=metadata))
+        return docs
+
+    def split_documents(self, documents):
+        texts, metadatas = [], []
+        for d in documents:
+            texts.append(d.page_content)
+            metadatas.append(d.metadata)
+        return self.create_documents(texts, metadatas)
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from baseSplit import load_pdf, load_text, split_docs
+from fastSplit import FastTextSplitter
+
+
+SUFFIXES = (".txt", ".md", ".log", ".pdf")
+
+
+@dataclass
+class FileResult:
+    path: str
+    chunks: list = field(default_factory=list)
+    seconds: float = 0.0
+    error: str | None = None
+
+
+# 1. WORKER: load + split di dalam proses worker
+def ingest_file(path, splitter_cls=FastTextSplitter):
+    start = time.perf_counter()
+    try:
+        docs = load_pdf(path) if path.lower().endswith(".pdf") else load_text(path)
+        return FileResult(path, split_docs(docs, splitter_cls), time.perf_counter() - start)
+    except Exception as e:
+        return FileResult(path, [], time.perf_counter() - start, repr(e))
+
+
+# 2. FAN-OUT ke process pool
+def ingest_directory(root, pattern="**/*", suffixes=SUFFIXES, max_workers=None,
+                     splitter_cls=FastTextSplitter):
+    paths = sorted(
+        str(p) for p in Path(root).glob(pattern)
+        if p.is_file() and p.suffix.lower() in suffixes
+    )
+    if not paths:
+        return [], []
+
+    max_workers = max_workers or os.cpu_count()
+    # chunksize > 1 mengurangi overhead IPC kalau file-nya ribuan
+    chunksize = max(1, len(paths) // (max_workers * 8))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # pool.map menjaga urutan input -> hasil deterministik
+        results = list(pool.map(partial(ingest_file, splitter_cls=splitter_cls), paths,
+                                chunksize=chunksize))
+
+    chunks = [c for r in results for c in r.chunks]
+    return chunks, results
+
+
+def print_report(results):
+    failed = [r for r in results if r.error]
+    for r in results:
+        status = "FAIL" if r.error else "ok"
+        print(f"{status:<5} {r.seconds * 1000:>8.1f} ms  {len(r.chunks):>5} chunks  {r.path}")
+        if r.error:
+            print(f"      {r.error}")
+
+    total = sum(r.seconds for r in results)
+    print(f"\n{len(results)} file, {len(failed)} gagal, total waktu worker {total:.2f}s")
+
+
+if __name__ == "__main__":
+    # --recursive -> RecursiveCharacterTextSplitter, sebanding dengan angka sebelum FastTextSplitter
+    args = [a for a in sys.argv[1:] if a != "--recursive"]
+    root = args[0] if args else "."
+    splitter_cls = RecursiveCharacterTextSplitter if "--recursive" in sys.argv else FastTextSplitter
+
+    start = time.perf_counter()
+    chunks, results = ingest_directory(root, splitter_cls=splitter_cls)
+    elapsed = time.perf_counter() - start
+
+    print_report(results)
+    print(f"Total chunks: {len(chunks)}  (wall time {elapsed:.2f}s, {os.cpu_count()} core)")
@@ -1,17 +1,22 @@
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
 from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
+from fastSplit import FastTextSplitter
+from bm25Index import build_index
 import re
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from chainRegistry import get_chain
+
 
 def load_doc(path):
     return TextLoader(path, encoding="utf-8").load()
 
 
 def split_docs(docs):
-    splitter = RecursiveCharacterTextSplitter(
+    splitter = FastTextSplitter(
         chunk_size=800,
         chunk_overlap=100
     )
@@ -34,11 +39,12 @@ def naive_retriever(chunks, query):
     return best
 
 
-def rag_answer(context, query):
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2)
+def bm25_retriever(index, query, k=3):
+    # index dibangun sekali lewat build_index(chunks), lalu dipakai ulang
+    return [doc.page_content for doc, _ in index.search(query, k=k)]
+
 
-    prompt = PromptTemplate.from_template(
-        """
+RAG_TEMPLATE = """
 Gunakan konteks di bawah ini untuk menjawab pertanyaan.
 Jangan gunakan pengetahuan di luar konteks.
 
@@ -50,9 +56,10 @@ Pertanyaan:
 
 Jawab singkat dan akurat.
 """
-    )
 
-    chain = prompt | llm
+
+def rag_answer(context, query):
+    chain = get_chain(RAG_TEMPLATE, model="gpt-4.1-mini", temperature=0.2)
     return chain.invoke({"context": context, "query": query}).content
 
 
@@ -64,13 +71,16 @@ if __name__ == "__main__":
 
     print("Chunks total:", len(chunks))
 
+    index = build_index(chunks)
+
     query = "bagaimana scalling di Kubernates"
-    best_chunk = naive_retriever(chunks, query)
+    top_chunks = bm25_retriever(index, query, k=3)
+    context = "\n\n".join(top_chunks)
 
-    print("\n=== Retrieved chunk ===")
-    print(best_chunk)
+    print("\n=== Retrieved chunks ===")
+    print(context)
 
-    answer = rag_answer(best_chunk, query)
+    answer = rag_answer(context, query)
 
     print("\n=== Final Answer ===")
     print(answer)
@@ -0,0 +1,71 @@
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from fastSplit import FastTextSplitter
+
+
+# 1. LOAD DOCUMENT (per block, bukan seluruh file)
+def iter_text_blocks(path, block_size=1 << 20, encoding="utf-8"):
+    # mode text -> decoder incremental, karakter multi-byte di batas block aman
+    with open(path, encoding=encoding) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+# 2. SPLIT DOCUMENTS (lazy)
+def stream_split(path, chunk_size=800, chunk_overlap=150, block_size=1 << 20,
+                 splitter_cls=FastTextSplitter):
+    splitter = splitter_cls(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        add_start_index=True,
+    )
+    source = str(path)
+    buffer, offset = "", 0   # offset = posisi buffer[0] di dalam file
+    byte_offset = 0          # idem, dalam byte (utf-8); hanya dari FastTextSplitter
+
+    for block in iter_text_blocks(path, block_size):
+        buffer += block
+        docs = splitter.create_documents([buffer])
+        if len(docs) < 2:
+            continue
+
+        # chunk terakhir bisa terpotong batas block -> jadikan carry untuk
+        # block berikutnya. Carry dimulai dari awal chunk itu (sudah termasuk
+        # overlap), jadi overlap antar chunk tetap benar lintas block.
+        for d in docs[:-1]:
+            yield _with_source(d, source, offset, byte_offset)
+
+        cut = docs[-1].metadata["start_index"]
+        byte_offset += docs[-1].metadata.get("start_byte", 0)
+        buffer = buffer[cut:]
+        offset += cut
+
+    if buffer:
+        for d in splitter.create_documents([buffer]):
+            yield _with_source(d, source, offset, byte_offset)
+
+
+def stream_split_pdf(path, chunk_size=800, chunk_overlap=150):
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+    )
+    # lazy_load -> hanya satu halaman di memori
+    for page in PyPDFLoader(path).lazy_load():
+        yield from splitter.split_documents([page])
+
+
+def _with_source(doc, source, offset, byte_offset):
+    m = doc.metadata
+    metadata = {"source": source, "start_index": offset + m["start_index"]}
+    if "start_byte" in m:
+        metadata["start_byte"] = byte_offset + m["start_byte"]
+        metadata["end_byte"] = byte_offset + m["end_byte"]
+    return Document(page_content=doc.page_content, metadata=metadata)
@@ -0,0 +1,135 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+
+# ====================================
+# Pilihan index FAISS: flat (exact) / IVF / HNSW, opsional + PQ
+# ====================================
+# flat  : O(N·d) per query, recall 1.0 -> cocok untuk corpus kecil
+# ivf   : cari hanya di `nprobe` dari `nlist` cluster
+# hnsw  : graph, `ef_search` = lebar pencarian (recall vs latency)
+# pq_m  : product quantization, vektor dikompres jadi pq_m byte (pq_bits=8)
+#
+# Catatan hapus: index HNSW FAISS tidak mendukung `remove_ids` (flat & ivf
+# bisa). Store dari preset "hnsw" / "hnswpq" tidak bisa dipakai untuk
+# IncrementalIndex.delete -> FAISS.delete akan error; rebuild index-nya, atau
+# pakai flat / ivf untuk corpus yang sering berubah.
+
+@dataclass
+class IndexSpec:
+    kind: str = "flat"              # flat | ivf | hnsw
+    nlist: Optional[int] = None     # ivf: default ~4·sqrt(N)
+    nprobe: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+    pq_m: Optional[int] = None      # None -> vektor disimpan utuh
+    pq_bits: int = 8
+
+    def factory_string(self, dim, n):
+        pq = f"PQ{self.pq_m}x{self.pq_bits}" if self.pq_m else None
+        if self.kind == "flat":
+            return "Flat" if pq is None else pq
+        if self.kind == "ivf":
+            return f"IVF{self.nlist or auto_nlist(n)},{pq or 'Flat'}"
+        if self.kind == "hnsw":
+            return f"HNSW{self.hnsw_m}" + (f"_PQ{self.pq_m}" if self.pq_m else "")
+        raise ValueError(f"Invalid index kind: {self.kind}")
+
+    def min_train_size(self, n):
+        # k-means butuh ~39 titik per centroid (cluster IVF / codebook PQ 2^bits)
+        need = 0
+        if self.kind == "ivf":
+            need = (self.nlist or auto_nlist(n)) * 39
+        if self.pq_m:
+            need = max(need, 2 ** self.pq_bits * 39)
+        return need
+
+
+MAX_TRAIN_POINTS = 100_000
+
+PRESETS = {
+    "flat": IndexSpec("flat"),
+    "ivf": IndexSpec("ivf", nprobe=16),
+    "hnsw": IndexSpec("hnsw", hnsw_m=32, ef_search=64),
+    "ivfpq": IndexSpec("ivf", nprobe=16, pq_m=16),
+    "hnswpq": IndexSpec("hnsw", hnsw_m=32, ef_search=64, pq_m=16),
+}
+
+
+def auto_nlist(n):
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def resolve_spec(index):
+    if index is None:
+        return PRESETS["flat"]
+    if isinstance(index, str):
+        if index not in PRESETS:
+            raise ValueError(f"Invalid index: {index}")
+        return PRESETS[index]
+    return index
+
+
+def set_search_params(index, spec):
+    """nprobe / efSearch bisa diubah kapan saja tanpa rebuild."""
+    params = faiss.ParameterSpace()
+    if spec.kind == "ivf":
+        params.set_index_parameter(index, "nprobe", spec.nprobe)
+    elif spec.kind == "hnsw":
+        params.set_index_parameter(index, "efSearch", spec.ef_search)
+
+
+def build_ann_index(vectors, spec):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    # corpus terlalu kecil untuk training (mis. sample_noise.txt) -> exact
+    if n < spec.min_train_size(n):
+        spec = IndexSpec("flat")
+
+    index = faiss.index_factory(dim, spec.factory_string(dim, n), faiss.METRIC_L2)
+    if spec.kind == "hnsw":
+        faiss.downcast_index(index).hnsw.efConstruction = spec.ef_construction
+    if not index.is_trained:
+        # training cukup dari sampel, tidak perlu seluruh corpus
+        sample = np.random.default_rng(0).permutation(n)[:MAX_TRAIN_POINTS]
+        index.train(vectors[np.sort(sample)])
+    index.add(vectors)
+    set_search_params(index, spec)
+    return index
+
+
+def index_memory_bytes(index):
+    return faiss.serialize_index(index).nbytes
+
+
+def faiss_from_documents(chunks, embeddings, spec):
+    """Pengganti FAISS.from_documents dengan index pilihan (metric L2 yang sama)."""
+    vectors = embeddings.embed_documents([c.page_content for c in chunks])
+    index = build_ann_index(np.asarray(vectors, dtype=np.float32), spec)
+
+    ids = [str(i) for i in range(len(chunks))]
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, chunks))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def chroma_hnsw_metadata(spec):
+    # Chroma selalu HNSW; parameter yang sama diteruskan lewat metadata collection
+    if spec.kind != "hnsw":
+        return None
+    return {
+        "hnsw:M": spec.hnsw_m,
+        "hnsw:construction_ef": spec.ef_construction,
+        "hnsw:search_ef": spec.ef_search,
+    }
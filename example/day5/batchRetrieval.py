@@ -0,0 +1,80 @@
+import numpy as np
+
+
+# ====================================
+# Batch retrieval: ribuan query -> beberapa call embedding + satu matrix search
+# ====================================
+# retrieve() per query = 1 call embedding + 1 search. Untuk replay ribuan
+# incident query, query di-embed per batch lalu dicari sekaligus
+# (FAISS batch search / NumPy Q @ M.T + argpartition), tanpa loop Python per doc.
+
+MAX_BLOCK_FLOATS = 32 * 1024 * 1024     # ~128MB matriks skor per block query
+
+
+def embed_queries(embeddings, queries, batch_size=256):
+    vectors = []
+    for i in range(0, len(queries), batch_size):
+        # embed_documents = satu request untuk banyak teks (embed_query = satu per teks)
+        vectors += embeddings.embed_documents(queries[i:i + batch_size])
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def doc_matrix(vectorstore):
+    """Semua vektor dari index FAISS (flat/HNSW-flat) sebagai matriks (N, d)."""
+    index = vectorstore.index
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def topk_numpy(query_vectors, matrix, k, metric="l2"):
+    """Top-k per baris: (scores, indices), urut terbaik dulu.
+
+    l2 -> jarak kuadrat kecil = dekat (sama dengan FAISS IndexFlatL2)
+    ip -> inner product besar = dekat
+    """
+    q = np.asarray(query_vectors, dtype=np.float32)
+    m = np.asarray(matrix, dtype=np.float32)
+    k = min(k, len(m))
+    m_norms = (m * m).sum(axis=1) if metric == "l2" else None
+
+    block = max(1, MAX_BLOCK_FLOATS // max(len(m), 1))
+    all_scores = np.empty((len(q), k), dtype=np.float32)
+    all_idx = np.empty((len(q), k), dtype=np.int64)
+
+    for start in range(0, len(q), block):
+        qb = q[start:start + block]
+        sims = qb @ m.T                                   # satu GEMM per block
+        if metric == "l2":
+            # |q-m|^2 = |q|^2 - 2q·m + |m|^2, dinegasikan supaya "besar = dekat"
+            sims = 2 * sims - m_norms - (qb * qb).sum(axis=1, keepdims=True)
+
+        # argpartition O(N) per baris, hanya k kandidat yang diurutkan
+        part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(sims, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+
+        all_idx[start:start + len(qb)] = np.take_along_axis(part, order, axis=1)
+        scores = np.take_along_axis(part_scores, order, axis=1)
+        all_scores[start:start + len(qb)] = -scores if metric == "l2" else scores
+
+    return all_scores, all_idx
+
+
+def _to_documents(vectorstore, indices):
+    id_map, store = vectorstore.index_to_docstore_id, vectorstore.docstore
+    return [[store.search(id_map[i]) for i in row if i != -1] for row in indices]
+
+
+def search_batch(vectorstore, query_vectors, k=3, matrix=None):
+    """matrix=None -> FAISS batch search (index apa pun);
+    matrix=doc_matrix(vs) -> NumPy GEMM + argpartition."""
+    if matrix is None:
+        _, indices = vectorstore.index.search(np.ascontiguousarray(query_vectors), k)
+    else:
+        _, indices = topk_numpy(query_vectors, matrix, k)
+    return _to_documents(vectorstore, indices)
+
+
+def retrieve_batch(vectorstore, queries, k=3, batch_size=256, matrix=None):
+    """Versi batch dari retrieve(): list query -> list hasil per query."""
+    vectors = embed_queries(vectorstore.embeddings, queries, batch_size)
+    return search_batch(vectorstore, vectors, k, matrix)
@@ -0,0 +1,78 @@
+import sys
+import time
+from dataclasses import replace
+
+import faiss
+import numpy as np
+
+from annIndex import IndexSpec, build_ann_index, index_memory_bytes, set_search_params
+
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+DIM = 256
+N_QUERIES = 500
+K = 10
+
+# (label, spec saat build, variasi parameter search)
+CONFIGS = [
+    ("flat", IndexSpec("flat"), [{}]),
+    ("ivf", IndexSpec("ivf"), [{"nprobe": p} for p in (1, 4, 16, 64)]),
+    ("hnsw M=32", IndexSpec("hnsw", hnsw_m=32), [{"ef_search": e} for e in (16, 32, 64, 128)]),
+    ("ivf+pq32", IndexSpec("ivf", pq_m=32), [{"nprobe": p} for p in (4, 16, 64)]),
+    ("ivf+pq64", IndexSpec("ivf", pq_m=64), [{"nprobe": p} for p in (16, 64)]),
+    ("hnsw+pq64", IndexSpec("hnsw", hnsw_m=32, pq_m=64), [{"ef_search": e} for e in (32, 128)]),
+]
+
+
+def make_data(n=N, dim=DIM, n_clusters=500, noise=1.2, decay=0.5, seed=0):
+    # embedding teks tidak uniform: mengelompok per topik, tapi cluster saling
+    # tumpang tindih dan variansnya terkumpul di beberapa arah saja (spektrum
+    # ~ i^-decay). Cluster yang terpisah rapi membuat IVF nprobe=1 sudah
+    # recall ~1.0, jadi trade-off nprobe / ef_search tidak terlihat.
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n + N_QUERIES)
+
+    scale = np.arange(1, dim + 1, dtype=np.float32) ** -decay
+    scale *= np.sqrt(dim / np.sum(scale ** 2))          # total varians noise tetap `dim`
+    data = centers[labels] + noise * scale * rng.normal(size=(n + N_QUERIES, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data[:n], data[n:]
+
+
+def recall_at_k(found, truth):
+    return np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)])
+
+
+def measure(index, queries):
+    # satu query per call, seperti retrieve() saat serving
+    found = np.empty((len(queries), K), dtype=np.int64)
+    start = time.perf_counter()
+    for i, q in enumerate(queries):
+        _, found[i] = index.search(q[None, :], K)
+    return found, len(queries) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    faiss.omp_set_num_threads(1)
+    data, queries = make_data()
+    print(f"N={N} dim={DIM}, {N_QUERIES} query, recall@{K} terhadap flat\n")
+
+    exact = faiss.IndexFlatL2(DIM)
+    exact.add(data)
+    _, truth = exact.search(queries, K)
+
+    print(f"{'index':<12} {'param':<14} {'build':>7} {'memory':>9} {'recall':>7} {'QPS':>8}")
+    for label, spec, variants in CONFIGS:
+        start = time.perf_counter()
+        index = build_ann_index(data, spec)
+        build_s = time.perf_counter() - start
+        memory_mb = index_memory_bytes(index) / 1e6
+
+        for params in variants:
+            tuned = replace(spec, **params)
+            set_search_params(index, tuned)
+            found, qps = measure(index, queries)
+            param = ",".join(f"{k}={v}" for k, v in params.items()) or "-"
+            print(f"{label:<12} {param:<14} {build_s:>6.1f}s {memory_mb:>7.1f}MB "
+                  f"{recall_at_k(found, truth):>7.3f} {qps:>8.0f}")
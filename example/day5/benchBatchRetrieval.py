@@ -0,0 +1,91 @@
+import time
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from batchRetrieval import doc_matrix, retrieve_batch, search_batch
+
+
+N_DOCS = 50000
+N_QUERIES = 2000
+DIM = 384
+K = 5
+CALL_LATENCY_S = 0.02      # round-trip per request embedding
+PER_TEXT_S = 0.0001
+
+
+class FakeEmbeddings(Embeddings):
+    """Vektor deterministik per teks; latency per request + per teks."""
+
+    def _vec(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        v = rng.normal(size=DIM).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+    def embed_documents(self, texts):
+        time.sleep(CALL_LATENCY_S + PER_TEXT_S * len(texts))
+        return [self._vec(t).tolist() for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def build_store():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(N_DOCS, DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = faiss.IndexFlatL2(DIM)
+    index.add(vectors)
+
+    ids = [str(i) for i in range(N_DOCS)]
+    docs = [Document(page_content=f"chunk {i}", metadata={"i": i}) for i in range(N_DOCS)]
+    return FAISS(
+        embedding_function=FakeEmbeddings(),
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def loop_retrieve(vs, queries):
+    # pola lama: retrieve() per query
+    return [vs.similarity_search(q, k=K) for q in queries]
+
+
+def ids(results):
+    return [[d.metadata["i"] for d in r] for r in results]
+
+
+def timed(name, fn, n):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:>7.2f}s {n / elapsed:>9.0f} query/s")
+    return result
+
+
+if __name__ == "__main__":
+    vs = build_store()
+    queries = [f"incident query {i}" for i in range(N_QUERIES)]
+    matrix = doc_matrix(vs)
+    print(f"{N_DOCS} docs x {DIM} dim, {N_QUERIES} query, k={K}, "
+          f"embedding {CALL_LATENCY_S * 1000:.0f} ms/request\n")
+
+    # loop lama diukur pada subset (terlalu lama untuk semua query)
+    subset = queries[:200]
+    baseline = timed("loop retrieve (200 query)", lambda: loop_retrieve(vs, subset), len(subset))
+    faiss_res = timed("batch FAISS search", lambda: retrieve_batch(vs, queries, k=K), N_QUERIES)
+    numpy_res = timed("batch NumPy argpartition",
+                      lambda: retrieve_batch(vs, queries, k=K, matrix=matrix), N_QUERIES)
+
+    assert ids(faiss_res) == ids(numpy_res)
+    assert ids(baseline) == ids(faiss_res[:200])
+
+    # search saja (tanpa embedding): batas atasnya kecepatan BLAS
+    q = np.asarray(FakeEmbeddings().embed_documents(queries), dtype=np.float32)
+    timed("search only, FAISS", lambda: search_batch(vs, q, K), N_QUERIES)
+    timed("search only, NumPy", lambda: search_batch(vs, q, K, matrix=matrix), N_QUERIES)
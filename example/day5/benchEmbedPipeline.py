@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_openai import OpenAIEmbeddings
+
+from embedPipeline import ingest_to_faiss
+from fakeEmbeddingServer import start_server
+
+
+N_CHUNKS = 5000
+
+
+def make_chunks(path="sample_noise.txt", n=N_CHUNKS):
+    with open(path, encoding="utf-8") as f:
+        paragraphs = [p for p in f.read().split("\n\n") if p.strip()]
+    return [
+        Document(page_content=f"[{i}] {paragraphs[i % len(paragraphs)]}", metadata={"i": i})
+        for i in range(n)
+    ]
+
+
+def make_embeddings(base_url):
+    return OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        base_url=base_url,
+        api_key="fake",
+        max_retries=0,                     # retry dipegang pipeline
+        check_embedding_ctx_length=False,  # tanpa download tokenizer
+    )
+
+
+def run_baseline(chunks, base_url):
+    start = time.perf_counter()
+    FAISS.from_documents(chunks, make_embeddings(base_url))
+    return time.perf_counter() - start
+
+
+async def run_pipeline(chunks, base_url, **kwargs):
+    store, stats = await ingest_to_faiss(chunks, make_embeddings(base_url), **kwargs)
+    assert store.index.ntotal == len(chunks)
+    return stats
+
+
+async def bench_pipeline(chunks, url, limited_url):
+    for concurrency in (1, 4, 8, 16):
+        s = await run_pipeline(chunks, url, concurrency=concurrency, max_tokens_per_batch=4000)
+        print(f"{f'pipeline concurrency={concurrency}':<40} {s['elapsed_s']:>7.2f}s "
+              f"{s['texts'] / s['elapsed_s']:>9.0f} chunks/s  batches={s['batches']}")
+
+    # 30% request kena 429: pipeline harus retry dengan backoff tanpa gagal
+    s = await run_pipeline(chunks, limited_url, concurrency=8, max_tokens_per_batch=4000,
+                           base_backoff=0.05, max_backoff=1.0)
+    print(f"{'pipeline concurrency=8, 30% 429':<40} {s['elapsed_s']:>7.2f}s "
+          f"{s['texts'] / s['elapsed_s']:>9.0f} chunks/s  retries={s['retries']}")
+
+
+if __name__ == "__main__":
+    chunks = make_chunks()
+    server, url = start_server(latency_ms=80, per_1k_tokens_ms=20)
+    limited_server, limited_url = start_server(latency_ms=80, per_1k_tokens_ms=20, throttle_prob=0.3)
+
+    print(f"{N_CHUNKS} chunks -> fake server {url}\n")
+
+    t = run_baseline(chunks, url)
+    print(f"{'FAISS.from_documents (serial)':<40} {t:>7.2f}s {N_CHUNKS / t:>9.0f} chunks/s")
+
+    asyncio.run(bench_pipeline(chunks, url, limited_url))
+
+    server.shutdown()
+    limited_server.shutdown()
@@ -0,0 +1,141 @@
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from hybridRetriever import HybridRetriever
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "day4"))
+from bm25Index import build_index
+
+
+N_DOCS = 20000
+N_QUERIES = 200
+K = 5
+QUERY_LATENCY_S = 0.03     # simulasi round-trip embed query ke API
+DIM = 256
+
+SERVICES = ["checkout-svc", "payment-svc", "api-gateway", "auth-svc", "search-svc", "worker"]
+SYMPTOMS = [
+    "pod restart terus karena memory limit",
+    "scaling HPA tidak jalan walau CPU tinggi",
+    "latency p95 naik setelah deploy",
+    "koneksi database timeout saat trafik puncak",
+    "image pull gagal karena secret registry",
+    "disk node penuh oleh log aplikasi",
+    "sertifikat TLS kedaluwarsa di ingress",
+    "queue consumer lambat dan backlog menumpuk",
+]
+ACTIONS = ["naikkan limit", "tambah replica", "rollback deploy", "rotasi secret", "bersihkan log"]
+
+
+class NgramEmbeddings(Embeddings):
+    """Hash character trigram -> vektor; toleran typo seperti embedding semantik,
+    tapi lemah di identifier angka. Query diberi delay seperti call API."""
+
+    def _embed(self, text):
+        v = np.zeros(DIM, dtype=np.float32)
+        t = f"  {text.lower()}  "
+        for i in range(len(t) - 2):
+            v[zlib.crc32(t[i:i + 3].encode()) % DIM] += 1.0
+        return (v / (np.linalg.norm(v) or 1.0)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        time.sleep(QUERY_LATENCY_S)
+        return self._embed(text)
+
+
+VOCAB = ("redis kafka nginx postgres mongodb rabbitmq elastic grafana prometheus "
+         "ingress coredns etcd kubelet containerd calico istio envoy vault consul "
+         "jenkins argocd helm terraform ansible minio keycloak sentry jaeger loki "
+         "fluentd logstash memcached cassandra clickhouse zookeeper traefik haproxy").split()
+
+
+def make_corpus(n=N_DOCS, seed=0):
+    rnd = random.Random(seed)
+    docs = []
+    for i in range(n):
+        svc, symptom = rnd.choice(SERVICES), rnd.choice(SYMPTOMS)
+        code = rnd.choice([0, 1, 2, 127, 137, 139, 143, 255])
+        pod = f"{svc}-{rnd.getrandbits(24):06x}"
+        components = rnd.sample(VOCAB, 4)
+        text = (f"{pod}: {symptom}, exit code {code}. "
+                f"Komponen terkait: {' '.join(components)}. "
+                f"Tindakan: {rnd.choice(ACTIONS)}.")
+        docs.append(Document(page_content=text, metadata={
+            "source": "incidents", "start_index": i,
+            "pod": pod, "code": code, "components": components,
+        }))
+    return docs
+
+
+def typo(word, rnd):
+    i = rnd.randrange(1, len(word) - 1)
+    return rnd.choice([word[:i] + word[i] + word[i:],                     # huruf dobel: scalling
+                       word[:i] + word[i + 1] + word[i] + word[i + 2:]])   # tukar huruf
+
+
+def make_queries(docs, n=N_QUERIES, seed=1):
+    """Setengah query berisi identifier persis (nama pod + exit code),
+    setengah lagi nama komponen yang salah ketik. Target = satu doc."""
+    rnd = random.Random(seed)
+    queries = []
+    for j in range(n):
+        doc = rnd.choice(docs)
+        m = doc.metadata
+        if j % 2 == 0:
+            q, kind = f"exit code {m['code']} {m['pod']}", "identifier"
+        else:
+            q, kind = " ".join(typo(w, rnd) for w in m["components"]), "typo"
+        queries.append((q, m["start_index"], kind))
+    return queries
+
+
+def recall(results, target):
+    return float(any(d.metadata["start_index"] == target for d in results))
+
+
+def run(name, fn, queries):
+    hits, per_kind = 0.0, {}
+    start = time.perf_counter()
+    for q, target, kind in queries:
+        r = recall(fn(q), target)
+        hits += r
+        per_kind.setdefault(kind, []).append(r)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    kinds = "  ".join(f"{k}={np.mean(v):.2f}" for k, v in sorted(per_kind.items()))
+    print(f"{name:<22} recall@{K}={hits / len(queries):.2f}  ({kinds})  {elapsed * 1000:>6.1f} ms/query")
+
+
+if __name__ == "__main__":
+    docs = make_corpus()
+    queries = make_queries(docs)
+
+    start = time.perf_counter()
+    index = build_index(docs)
+    vs = FAISS.from_documents(docs, NgramEmbeddings())
+    print(f"{len(docs)} docs, {len(queries)} query, build {time.perf_counter() - start:.1f}s, "
+          f"embed query {QUERY_LATENCY_S * 1000:.0f} ms\n")
+
+    hybrid = HybridRetriever(index, vs, k_bm25=20, k_vector=20)
+
+    run("bm25", lambda q: [d for d, _ in index.search(q, k=K)], queries)
+    run("vector", lambda q: vs.similarity_search(q, k=K), queries)
+    run("hybrid serial", lambda q: [d for d, _ in hybrid.search_serial(q, k=K)], queries)
+    run("hybrid concurrent", lambda q: [d for d, _ in hybrid.search(q, k=K)], queries)
+
+    # bobot per sumber
+    for w_bm25, w_vector in ((2.0, 1.0), (1.0, 2.0)):
+        h = HybridRetriever(index, vs, k_bm25=20, k_vector=20, w_bm25=w_bm25, w_vector=w_vector)
+        run(f"hybrid w={w_bm25:g}/{w_vector:g}", lambda q: [d for d, _ in h.search(q, k=K)], queries)
+        h.close()
+    hybrid.close()
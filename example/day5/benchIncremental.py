@@ -0,0 +1,104 @@
+import random
+import shutil
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from incrementalIndex import IncrementalIndex
+from ragSemantic import load_and_split
+
+
+N_CHUNKS = 10000
+DIM = 64
+
+
+class CountingEmbeddings(Embeddings):
+    """Vektor dari hash teks; menghitung berapa teks yang benar-benar di-embed."""
+
+    def __init__(self):
+        self.calls = 0
+        self.texts = 0
+
+    def _vec(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        return rng.normal(size=DIM).astype(np.float32).tolist()
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        self.texts += len(texts)
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vec(text)
+
+
+def make_corpus(path, n_chunks=N_CHUNKS, seed=0):
+    # paragraf ~350 karakter -> ~2 paragraf per chunk 800
+    rnd = random.Random(seed)
+    words = "pod node deploy latency scaling hpa cpu memory error timeout retry queue".split()
+    paragraphs = [
+        f"[{i}] " + " ".join(rnd.choice(words) for _ in range(50))
+        for i in range(n_chunks * 2)
+    ]
+    path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+
+def edit_one_line(path):
+    text = path.read_text(encoding="utf-8")
+    pos = len(text) // 2
+    pos = text.index("\n\n", pos) + 2
+    path.write_text(text[:pos] + "[EDIT] node pool diganti ke n2-standard-8. " + text[pos:], encoding="utf-8")
+
+
+def check_offsets(index, paths):
+    # setiap start_index di store harus menunjuk ke page_content-nya di file terbaru
+    texts = {str(p): Path(p).read_text(encoding="utf-8") for p in paths}
+    bad = [
+        doc_id for doc_id, d in index.store.docstore._dict.items()
+        if not texts[d.metadata["source"]][d.metadata["start_index"]:].startswith(d.page_content)
+    ]
+    assert not bad, f"{len(bad)} chunk dengan start_index basi, mis. {bad[:3]}"
+
+
+def step(name, index, emb, paths):
+    calls, texts = emb.calls, emb.texts
+    start = time.perf_counter()
+    stats = index.update(paths)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {elapsed:>7.2f}s  embed calls={emb.calls - calls:<3} "
+          f"texts={emb.texts - texts:<6} +{stats['chunks_added']} -{stats['chunks_deleted']} "
+          f"kept={stats['chunks_kept']} moved={stats['chunks_moved']}")
+    check_offsets(index, paths)
+
+
+if __name__ == "__main__":
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        corpus, extra = workdir / "corpus.txt", workdir / "extra.txt"
+        make_corpus(corpus)
+        make_corpus(extra, n_chunks=200, seed=1)
+        store_dir = workdir / "store"
+
+        emb = CountingEmbeddings()
+        index = IncrementalIndex(store_dir, emb, load_and_split)
+        step("build awal", index, emb, [corpus, extra])
+        print(f"  -> {index.store.index.ntotal} vektor\n")
+
+        # proses baru (restart): load store + manifest dari disk
+        index = IncrementalIndex(store_dir, emb, load_and_split)
+        step("tanpa perubahan", index, emb, [corpus, extra])
+
+        corpus.touch()
+        step("touch (mtime saja)", index, emb, [corpus, extra])
+
+        edit_one_line(corpus)
+        step("edit satu baris", index, emb, [corpus, extra])
+
+        step("hapus extra.txt", index, emb, [corpus])
+        print(f"  -> {index.store.index.ntotal} vektor")
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,183 @@
+import re
+import zlib
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from embedPipeline import get_token_counter
+
+
+WORD_RE = re.compile(r"\w+")
+ADJACENT_GAP = 2         # splitter men-strip separator "\n\n" di antara chunk
+MAX_PRIME = (1 << 61) - 1
+
+
+# ====================================
+# Context packer: merge overlap -> buang near-duplicate -> isi token budget
+# ====================================
+
+@dataclass
+class Span:
+    source: str
+    start: int | None
+    text: str
+    rank: int                                  # ranking terbaik dari chunk penyusunnya
+    ranks: list = field(default_factory=list)
+
+    @property
+    def end(self):
+        return None if self.start is None else self.start + len(self.text)
+
+
+@dataclass
+class PackResult:
+    text: str
+    spans: list
+    naive_tokens: int        # "\n\n".join(top-k) seperti sebelumnya
+    packed_tokens: int
+    merged: int              # chunk yang digabung ke chunk tetangganya
+    duplicates: int          # span yang dibuang karena near-duplicate
+    dropped: int             # span yang tidak muat di budget
+
+    @property
+    def saved_tokens(self):
+        return self.naive_tokens - self.packed_tokens
+
+
+# ========== 1. MERGE CHUNK BERTETANGGA / OVERLAP ==========
+def _text_overlap(a, b, max_overlap=400, min_overlap=20):
+    """Panjang suffix `a` yang sama dengan prefix `b` (chunk tanpa start_index)."""
+    for size in range(min(max_overlap, len(a), len(b)), min_overlap - 1, -1):
+        if a.endswith(b[:size]):
+            return size
+    return 0
+
+
+def merge_spans(docs):
+    """docs urut relevansi. Chunk dari source yang sama yang overlap/bersebelahan
+    digabung kembali jadi satu span kontinu (overlap hanya ditulis sekali)."""
+    spans = [
+        Span(d.metadata.get("source", ""), d.metadata.get("start_index"), d.page_content, rank, [rank])
+        for rank, d in enumerate(docs)
+    ]
+    by_source = {}
+    for s in spans:
+        by_source.setdefault(s.source, []).append(s)
+
+    merged_spans, merged = [], 0
+    for group in by_source.values():
+        with_offset = sorted((s for s in group if s.start is not None), key=lambda s: s.start)
+        without_offset = [s for s in group if s.start is None]
+
+        current = None
+        for s in with_offset:
+            if current is not None and s.start <= current.end + ADJACENT_GAP:
+                if s.start > current.end:
+                    current.text += "\n" * (s.start - current.end) + s.text
+                elif s.end > current.end:
+                    current.text += s.text[current.end - s.start:]
+                current.rank = min(current.rank, s.rank)
+                current.ranks += s.ranks
+                merged += 1
+                continue
+            if current is not None:
+                merged_spans.append(current)
+            current = s
+        if current is not None:
+            merged_spans.append(current)
+
+        # tanpa offset: sambung kalau ujung chunk A == awal chunk B
+        pending = list(without_offset)
+        while pending:
+            current = pending.pop(0)
+            joined = True
+            while joined:
+                joined = False
+                for other in pending:
+                    size = _text_overlap(current.text, other.text)
+                    if size:
+                        current.text += other.text[size:]
+                        current.rank = min(current.rank, other.rank)
+                        current.ranks += other.ranks
+                        pending.remove(other)
+                        merged += 1
+                        joined = True
+                        break
+            merged_spans.append(current)
+
+    merged_spans.sort(key=lambda s: s.rank)
+    return merged_spans, merged
+
+
+# ========== 2. NEAR-DUPLICATE (MinHash atas shingle kata) ==========
+def shingles(text, n=5):
+    words = WORD_RE.findall(text.lower())
+    if len(words) < n:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {zlib.crc32(" ".join(words[i:i + n]).encode()) for i in range(len(words) - n + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=64, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MAX_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MAX_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        x = np.fromiter(shingle_set, dtype=np.uint64)
+        # (a·x + b) mod p untuk semua permutasi sekaligus -> min per permutasi
+        hashes = (np.outer(self.a, x) + self.b[:, None]) % MAX_PRIME
+        return hashes.min(axis=1)
+
+
+def drop_near_duplicates(spans, threshold=0.8, hasher=None):
+    """Span urut relevansi; span yang mirip (estimasi Jaccard >= threshold)
+    dengan span yang lebih relevan dibuang."""
+    hasher = hasher or MinHasher()
+    kept, signatures, duplicates = [], [], 0
+    for s in spans:
+        sig = hasher.signature(shingles(s.text))
+        if any(np.mean(sig == other) >= threshold for other in signatures):
+            duplicates += 1
+            continue
+        kept.append(s)
+        signatures.append(sig)
+    return kept, duplicates
+
+
+# ========== 3. ISI TOKEN BUDGET ==========
+def pack_context(docs, max_tokens=1500, separator="\n\n", dedup_threshold=0.8,
+                 count_tokens=None):
+    count_tokens = count_tokens or get_token_counter()
+    naive_tokens = count_tokens(separator.join(d.page_content for d in docs))
+
+    spans, merged = merge_spans(docs)
+    spans, duplicates = drop_near_duplicates(spans, dedup_threshold)
+
+    packed, used, dropped = [], 0, 0
+    sep_tokens = count_tokens(separator)
+    for s in spans:
+        cost = count_tokens(s.text) + (sep_tokens if packed else 0)
+        if used + cost > max_tokens:
+            dropped += 1          # span yang lebih kecil di bawahnya mungkin masih muat
+            continue
+        packed.append(s)
+        used += cost
+
+    text = separator.join(s.text for s in packed)
+    return PackResult(
+        text=text,
+        spans=packed,
+        naive_tokens=naive_tokens,
+        packed_tokens=count_tokens(text),
+        merged=merged,
+        duplicates=duplicates,
+        dropped=dropped,
+    )
+
+
+def print_pack_report(result, query=None):
+    label = f" [{query}]" if query else ""
+    print(f"Context{label}: {result.naive_tokens} -> {result.packed_tokens} token "
+          f"(hemat {result.saved_tokens}; merged={result.merged}, "
+          f"duplicate={result.duplicates}, over budget={result.dropped})")
@@ -0,0 +1,162 @@
+import asyncio
+import random
+import time
+from functools import lru_cache
+
+from langchain_community.vectorstores import FAISS
+
+
+# ====================================
+# Token counting
+# ====================================
+
+@lru_cache(maxsize=None)
+def get_token_counter(encoding="cl100k_base"):
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding(encoding)
+        return lambda text: len(enc.encode(text, disallowed_special=()))
+    except Exception:
+        # offline / tiktoken tidak ada: estimasi kasar ~4 karakter per token
+        return lambda text: max(1, len(text) // 4)
+
+
+def pack_batches(chunks, max_tokens=8000, max_items=256, count_tokens=None):
+    count_tokens = count_tokens or get_token_counter()
+    batch, batch_tokens = [], 0
+
+    for c in chunks:
+        n = count_tokens(c.page_content)
+        if batch and (batch_tokens + n > max_tokens or len(batch) >= max_items):
+            yield batch, batch_tokens
+            batch, batch_tokens = [], 0
+        batch.append(c)
+        batch_tokens += n
+
+    if batch:
+        yield batch, batch_tokens
+
+
+# ====================================
+# Rate limiting
+# ====================================
+
+class TokenBucket:
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                await asyncio.sleep((amount - self.available) / self.rate)
+
+
+def is_rate_limited(exc):
+    return getattr(exc, "status_code", None) == 429
+
+
+def retry_after(exc):
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# ====================================
+# Pipeline
+# ====================================
+
+async def embed_batches(chunks, embeddings, on_batch, concurrency=4,
+                        requests_per_minute=3000, tokens_per_minute=1_000_000,
+                        max_tokens_per_batch=8000, max_retries=6,
+                        base_backoff=0.5, max_backoff=30.0):
+    """Embed `chunks` secara konkuren; `on_batch(chunks, vectors)` dipanggil
+    untuk setiap batch begitu selesai (urutan batch tidak dijamin)."""
+    rpm = TokenBucket(requests_per_minute)
+    tpm = TokenBucket(tokens_per_minute)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    stats = {"batches": 0, "texts": 0, "tokens": 0, "retries": 0}
+
+    async def embed_with_retry(texts, n_tokens):
+        for attempt in range(max_retries + 1):
+            await rpm.acquire(1)
+            await tpm.acquire(n_tokens)
+            try:
+                return await embeddings.aembed_documents(texts)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == max_retries:
+                    raise
+                stats["retries"] += 1
+                # full jitter backoff, hormati Retry-After kalau ada
+                delay = random.uniform(0, min(max_backoff, base_backoff * 2 ** attempt))
+                await asyncio.sleep(max(delay, retry_after(e) or 0))
+
+    errors = []
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            # setelah ada error, sisa antrian cukup di-drain supaya producer tidak hang
+            if errors:
+                continue
+            batch, n_tokens = item
+            try:
+                vectors = await embed_with_retry([c.page_content for c in batch], n_tokens)
+                # error dari on_batch (mis. dimensi vektor beda) juga tidak boleh
+                # mematikan worker: antrian harus tetap di-drain
+                on_batch(batch, vectors)
+            except Exception as e:
+                errors.append(e)
+                continue
+            stats["batches"] += 1
+            stats["texts"] += len(batch)
+            stats["tokens"] += n_tokens
+
+    start = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    # producer: chunks bisa berupa generator, jadi batch dibentuk sambil jalan
+    for item in pack_batches(chunks, max_tokens=max_tokens_per_batch):
+        await queue.put(item)
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+    if errors:
+        raise errors[0]
+
+    stats["elapsed_s"] = time.perf_counter() - start
+    return stats
+
+
+async def ingest_to_faiss(chunks, embeddings, **kwargs):
+    """Bangun FAISS secara streaming: setiap batch langsung di-add ke index."""
+    store = None
+
+    def on_batch(batch, vectors):
+        nonlocal store
+        text_embeddings = [(c.page_content, v) for c, v in zip(batch, vectors)]
+        metadatas = [c.metadata for c in batch]
+        if store is None:
+            store = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas)
+        else:
+            store.add_embeddings(text_embeddings, metadatas=metadatas)
+
+    stats = await embed_batches(chunks, embeddings, on_batch, **kwargs)
+    return store, stats
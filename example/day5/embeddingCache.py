@@ -0,0 +1,192 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """Cache content-addressed di depan embeddings apapun.
+
+    Key = (model, sha256(text)). Tier 1: LRU in-memory, tier 2: SQLite di disk.
+    Kedua tier dibatasi byte budget dan evict entry yang paling lama tidak dipakai.
+    Budget disk (`disk_bytes`) hanya menghitung byte blob vektor; overhead row,
+    key, dan index SQLite tidak ikut, jadi ukuran file di disk bisa lebih besar.
+    """
+
+    def __init__(self, base, model=None, memory_bytes=64 * 1024**2,
+                 disk_path=None, disk_bytes=1024**3):
+        self.base = base
+        self.model = model or getattr(base, "model", type(base).__name__)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lru = OrderedDict()
+        self._lru_size = 0
+        self._touched = {}          # key -> last_used, ditulis sekaligus per transaksi
+        self._lock = threading.Lock()
+
+        self._db = None
+        if disk_path is not None:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vec BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)"
+            )
+            self._disk_size = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings"
+            ).fetchone()[0]
+
+    def key(self, text):
+        return f"{self.model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    # ---------- MEMORY TIER ----------
+    def _memory_get(self, key):
+        blob = self._lru.get(key)
+        if blob is not None:
+            self._lru.move_to_end(key)
+        return blob
+
+    def _memory_put(self, key, blob):
+        if len(blob) > self.memory_bytes:
+            return
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._lru_size -= len(old)
+
+        self._lru[key] = blob
+        self._lru_size += len(blob)
+        while self._lru_size > self.memory_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._lru_size -= len(evicted)
+            self.evictions += 1
+
+    # ---------- DISK TIER ----------
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT vec FROM embeddings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._touched[key] = time.time()
+        return row[0]
+
+    def _write_touches(self):
+        # dipanggil di dalam `with self._db:` -> ikut commit transaksi yang sama
+        if self._touched:
+            self._db.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(ts, k) for k, ts in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _disk_flush(self):
+        if self._db is None or not self._touched:
+            return
+        with self._db:
+            self._write_touches()
+
+    def _disk_put(self, items):
+        if self._db is None or not items:
+            return
+        now = time.time()
+        with self._db:
+            self._write_touches()      # sebelum evict, supaya urutan LRU akurat
+            for key, blob in items:
+                cur = self._db.execute(
+                    "INSERT OR IGNORE INTO embeddings (key, vec, last_used) VALUES (?, ?, ?)",
+                    (key, blob, now),
+                )
+                self._disk_size += len(blob) * cur.rowcount
+
+            while self._disk_size > self.disk_bytes:
+                victims = self._db.execute(
+                    "SELECT key, LENGTH(vec) FROM embeddings ORDER BY last_used LIMIT 256"
+                ).fetchall()
+                if not victims:
+                    break
+
+                # buang dari yang paling lama, berhenti begitu masuk budget
+                evicted = []
+                for k, size in victims:
+                    if self._disk_size <= self.disk_bytes:
+                        break
+                    evicted.append((k,))
+                    self._disk_size -= size
+                self._db.executemany("DELETE FROM embeddings WHERE key = ?", evicted)
+                self.evictions += len(evicted)
+
+    # ---------- EMBEDDINGS API ----------
+    def _lookup(self, key):
+        blob = self._memory_get(key)
+        if blob is not None:
+            self.hits_memory += 1
+            return blob
+
+        blob = self._disk_get(key)
+        if blob is not None:
+            self.hits_disk += 1
+            self._memory_put(key, blob)
+            return blob
+
+        self.misses += 1
+        return None
+
+    def embed_documents(self, texts):
+        keys = [self.key(t) for t in texts]
+        found = {}
+        with self._lock:
+            for k in dict.fromkeys(keys):
+                blob = self._lookup(k)
+                if blob is not None:
+                    found[k] = blob
+            self._disk_flush()
+
+        missing = {k: t for k, t in zip(keys, texts) if k not in found}
+        if missing:
+            vectors = self.base.embed_documents(list(missing.values()))
+            fresh = [(k, np.asarray(v, dtype=np.float32).tobytes()) for k, v in zip(missing, vectors)]
+            with self._lock:
+                for k, blob in fresh:
+                    self._memory_put(k, blob)
+                self._disk_put(fresh)
+            found.update(fresh)
+
+        return [np.frombuffer(found[k], dtype=np.float32).tolist() for k in keys]
+
+    def embed_query(self, text):
+        key = self.key(text)
+        with self._lock:
+            blob = self._lookup(key)
+            self._disk_flush()
+
+        if blob is None:
+            blob = np.asarray(self.base.embed_query(text), dtype=np.float32).tobytes()
+            with self._lock:
+                self._memory_put(key, blob)
+                self._disk_put([(key, blob)])
+
+        return np.frombuffer(blob, dtype=np.float32).tolist()
+
+    def stats(self):
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_bytes": self._lru_size,
+            "disk_bytes": self._disk_size if self._db is not None else 0,
+        }
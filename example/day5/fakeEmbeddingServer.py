@@ -0,0 +1,121 @@
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+# ====================================
+# Fake OpenAI /v1/embeddings
+# ====================================
+# Vektor deterministik dari hash teks, latency = base + per 1k token,
+# dan 429 kalau melewati limit requests/menit (atau acak dengan probabilitas
+# `throttle_prob`) -> bisa benchmark offline.
+
+def fake_vector(item, dim):
+    key = item if isinstance(item, str) else ",".join(map(str, item))
+    seed = int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "little")
+    v = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+def make_handler(dim, latency_ms, per_1k_tokens_ms, rpm_limit, throttle_prob):
+    window = deque()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, body, headers=()):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in headers:
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+            if throttle_prob and random.random() < throttle_prob:
+                return self._reply(429, {"error": {"message": "Rate limit reached", "type": "tokens"}})
+
+            if rpm_limit:
+                now = time.monotonic()
+                with lock:
+                    while window and now - window[0] > 60:
+                        window.popleft()
+                    limited = len(window) >= rpm_limit
+                    if not limited:
+                        window.append(now)
+                if limited:
+                    retry = 60 - (now - window[0])
+                    return self._reply(
+                        429,
+                        {"error": {"message": "Rate limit reached", "type": "requests"}},
+                        headers=[("retry-after", f"{retry:.2f}")],
+                    )
+
+            inputs = payload["input"]
+            if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+                inputs = [inputs]
+
+            n_tokens = sum(len(x) // 4 if isinstance(x, str) else len(x) for x in inputs)
+            time.sleep((latency_ms + per_1k_tokens_ms * n_tokens / 1000) / 1000)
+
+            data = []
+            for i, item in enumerate(inputs):
+                v = fake_vector(item, dim)
+                if payload.get("encoding_format") == "base64":
+                    emb = base64.b64encode(v.tobytes()).decode("ascii")
+                else:
+                    emb = v.tolist()
+                data.append({"object": "embedding", "index": i, "embedding": emb})
+
+            self._reply(200, {
+                "object": "list",
+                "data": data,
+                "model": payload.get("model", "fake"),
+                "usage": {"prompt_tokens": n_tokens, "total_tokens": n_tokens},
+            })
+
+    return Handler
+
+
+def start_server(port=0, dim=1536, latency_ms=50, per_1k_tokens_ms=5,
+                 rpm_limit=0, throttle_prob=0.0):
+    handler = make_handler(dim, latency_ms, per_1k_tokens_ms, rpm_limit, throttle_prob)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Fake OpenAI embeddings server")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--dim", type=int, default=1536)
+    ap.add_argument("--latency-ms", type=float, default=50)
+    ap.add_argument("--per-1k-tokens-ms", type=float, default=5)
+    ap.add_argument("--rpm-limit", type=int, default=0)
+    ap.add_argument("--throttle-prob", type=float, default=0.0)
+    args = ap.parse_args()
+
+    server, url = start_server(args.port, args.dim, args.latency_ms,
+                               args.per_1k_tokens_ms, args.rpm_limit, args.throttle_prob)
+    print(f"Fake embeddings server di {url}  (OPENAI_BASE_URL={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
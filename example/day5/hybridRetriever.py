@@ -0,0 +1,74 @@
+import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ====================================
+# Hybrid retrieval: BM25 + vector, digabung dengan Reciprocal Rank Fusion
+# ====================================
+# BM25 kuat di identifier persis ("HPA", "exit code 137"),
+# vector kuat di typo / parafrase ("scalling di Kubernates").
+# RRF hanya memakai ranking, jadi skala score BM25 vs cosine tidak perlu disamakan:
+#   score(doc) = sum_i weight_i / (rrf_k + rank_i(doc))
+
+def doc_key(doc):
+    return (doc.metadata.get("source"), doc.metadata.get("start_index"), doc.page_content)
+
+
+def rrf_fuse(ranked_lists, weights=None, rrf_k=60, k=None):
+    """ranked_lists: list of [Document] (urut terbaik dulu) -> [(Document, score)]."""
+    weights = weights or [1.0] * len(ranked_lists)
+    scores, docs = {}, {}
+
+    for ranked, weight in zip(ranked_lists, weights):
+        for rank, doc in enumerate(ranked, start=1):
+            key = doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + weight / (rrf_k + rank)
+
+    top = heapq.nlargest(k or len(scores), scores.items(), key=lambda item: item[1])
+    return [(docs[key], score) for key, score in top]
+
+
+class HybridRetriever:
+    def __init__(self, bm25_index, vectorstore, k_bm25=10, k_vector=10,
+                 w_bm25=1.0, w_vector=1.0, rrf_k=60):
+        self.bm25_index = bm25_index
+        self.vectorstore = vectorstore
+        self.k_bm25 = k_bm25
+        self.k_vector = k_vector
+        self.w_bm25 = w_bm25
+        self.w_vector = w_vector
+        self.rrf_k = rrf_k
+        # satu thread dipakai ulang untuk vector search (embed query = network I/O)
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+    def _lexical(self, query):
+        return [doc for doc, _ in self.bm25_index.search(query, k=self.k_bm25)]
+
+    def _semantic(self, query):
+        return self.vectorstore.similarity_search(query, k=self.k_vector)
+
+    def _fuse(self, lexical, semantic, k):
+        return rrf_fuse([lexical, semantic], [self.w_bm25, self.w_vector], self.rrf_k, k)
+
+    def search(self, query, k=3):
+        # vector search jalan di background selama BM25 dihitung,
+        # latency ~ max(bm25, vector), bukan jumlah keduanya
+        semantic = self._pool.submit(self._semantic, query)
+        lexical = self._lexical(query)
+        return self._fuse(lexical, semantic.result(), k)
+
+    async def asearch(self, query, k=3):
+        lexical, semantic = await asyncio.gather(
+            asyncio.to_thread(self._lexical, query),
+            self.vectorstore.asimilarity_search(query, k=self.k_vector),
+        )
+        return self._fuse(lexical, semantic, k)
+
+    def search_serial(self, query, k=3):
+        # pembanding untuk benchmark
+        return self._fuse(self._lexical(query), self._semantic(query), k)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from langchain_community.vectorstores import FAISS, Chroma
+
+from vectorIndex import content_hash
+
+
+MANIFEST_FILE = "manifest.json"
+
+
+# ====================================
+# Re-index inkremental: file berubah -> chunk berubah -> update store in place
+# ====================================
+# 1. file: (mtime, size) sama -> skip tanpa dibaca; isi (sha256) sama -> skip
+# 2. chunk: id stabil = source + hash isi (+ urutan kalau ada teks kembar),
+#    jadi chunk yang hanya bergeser posisinya tetap punya id yang sama
+# 3. store: add_documents(id baru) + delete(id hilang), tanpa rebuild;
+#    chunk yang dipertahankan tetap di-refresh metadata-nya (start_index dll.
+#    ikut bergeser) tanpa embed ulang
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+def chunk_ids(chunks):
+    seen = {}
+    ids = []
+    for c in chunks:
+        key = f"{c.metadata.get('source', '')}:{content_hash(c.page_content)[:16]}"
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        ids.append(key if n == 0 else f"{key}:{n}")
+    return ids
+
+
+class IncrementalIndex:
+    def __init__(self, path, embeddings, split_fn, db_type="faiss"):
+        self.path = Path(path)
+        self.embeddings = embeddings
+        self.split_fn = split_fn          # path -> list[Document]
+        self.db_type = db_type
+        self.manifest = {}
+        self.store = None
+
+        if (self.path / MANIFEST_FILE).exists():
+            with open(self.path / MANIFEST_FILE, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self._open_store()
+
+    # ---------- STORE ----------
+    def _open_store(self):
+        if self.db_type == "chroma":
+            self.store = Chroma(
+                collection_name="chunks",
+                embedding_function=self.embeddings,
+                persist_directory=str(self.path / "chroma"),
+            )
+        elif self.db_type == "faiss":
+            if (self.path / "index.faiss").exists():
+                self.store = FAISS.load_local(
+                    str(self.path), self.embeddings, allow_dangerous_deserialization=True
+                )
+        else:
+            raise ValueError("Invalid db_type")
+
+    def _add(self, docs, ids):
+        if not docs:
+            return
+        # hanya chunk ini yang dikirim ke embedding
+        if self.store is None:
+            self.store = FAISS.from_documents(docs, self.embeddings, ids=ids)
+        else:
+            self.store.add_documents(docs, ids=ids)
+
+    def _refresh(self, docs, ids):
+        # metadata posisi (start_index, ...) dari split terbaru; vektor tetap
+        if not docs or self.store is None:
+            return 0
+        if self.db_type == "chroma":
+            self.store._collection.update(ids=ids, metadatas=[d.metadata for d in docs])
+            return len(ids)
+
+        docstore = self.store.docstore
+        stale = {}
+        for i, d in zip(ids, docs):
+            stored = docstore.search(i)
+            if not isinstance(stored, str) and stored.metadata != d.metadata:
+                d.id = i
+                stale[i] = d
+        if stale:
+            docstore.delete(list(stale))
+            docstore.add(stale)
+        return len(stale)
+
+    def _delete(self, ids):
+        # butuh index yang mendukung remove_ids: flat / IVF ya, HNSW tidak
+        # (lihat annIndex.py) -> store HNSW harus di-rebuild, bukan delete
+        if ids and self.store is not None:
+            self.store.delete(ids=ids)
+
+    def _save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self.db_type == "faiss" and self.store is not None:
+            self.store.save_local(str(self.path))
+
+        tmp = self.path / (MANIFEST_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self.path / MANIFEST_FILE)
+
+    # ---------- UPDATE ----------
+    def update(self, paths):
+        """Samakan store dengan `paths`. Return statistik perubahan."""
+        start = time.perf_counter()
+        stats = {"files_skipped": 0, "files_changed": 0, "files_removed": 0,
+                 "chunks_added": 0, "chunks_deleted": 0, "chunks_kept": 0,
+                 "chunks_moved": 0}
+        sources = {str(p) for p in paths}
+
+        for source in sources:
+            st = os.stat(source)
+            old = self.manifest.get(source)
+            if old and old["mtime"] == st.st_mtime_ns and old["size"] == st.st_size:
+                stats["files_skipped"] += 1
+                continue
+
+            digest = file_sha256(source)
+            if old and old["sha256"] == digest:
+                # cuma di-touch: catat mtime baru, isi tidak dibaca ulang lagi nanti
+                old.update(mtime=st.st_mtime_ns, size=st.st_size)
+                stats["files_skipped"] += 1
+                continue
+
+            chunks = self.split_fn(source)
+            for c in chunks:
+                c.metadata["source"] = source
+            ids = chunk_ids(chunks)
+
+            old_ids = set(old["chunk_ids"]) if old else set()
+            new = [(i, c) for i, c in zip(ids, chunks) if i not in old_ids]
+            kept = [(i, c) for i, c in zip(ids, chunks) if i in old_ids]
+            removed = list(old_ids - set(ids))
+
+            self._delete(removed)
+            self._add([c for _, c in new], [i for i, _ in new])
+            stats["chunks_moved"] += self._refresh([c for _, c in kept], [i for i, _ in kept])
+
+            self.manifest[source] = {
+                "mtime": st.st_mtime_ns, "size": st.st_size,
+                "sha256": digest, "chunk_ids": ids,
+            }
+            stats["files_changed"] += 1
+            stats["chunks_added"] += len(new)
+            stats["chunks_deleted"] += len(removed)
+            stats["chunks_kept"] += len(ids) - len(new)
+
+        # file yang sudah tidak ada -> semua chunk-nya dihapus dari store
+        for source in set(self.manifest) - sources:
+            removed = self.manifest.pop(source)["chunk_ids"]
+            self._delete(removed)
+            stats["files_removed"] += 1
+            stats["chunks_deleted"] += len(removed)
+
+        self._save()
+        stats["elapsed_s"] = time.perf_counter() - start
+        return stats
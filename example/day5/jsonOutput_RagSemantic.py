@@ -1,11 +1,22 @@
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS, Chroma
 from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_core.prompts import PromptTemplate
+from vectorIndex import PersistentVectorIndex
+from embeddingCache import CachedEmbeddings
+from contextPacker import pack_context, print_pack_report
+from annIndex import chroma_hnsw_metadata, faiss_from_documents, resolve_spec
 from pydantic import BaseModel, Field, ValidationError
-from langchain_core.output_parsers import JsonOutputParser
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "day4"))
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from fastSplit import FastTextSplitter
+from chainRegistry import get_chain
+from instrumentation import instrument, print_stage_report, stage
+from toonCompact import docs_to_toon
 
 
 # ====================================
@@ -22,9 +33,10 @@ def load_and_split(path):
     loader = TextLoader(path, encoding="utf-8")
     docs = loader.load()
 
-    splitter = RecursiveCharacterTextSplitter(
+    splitter = FastTextSplitter(
         chunk_size=800,
-        chunk_overlap=150
+        chunk_overlap=150,
+        add_start_index=True,   # offset dipakai context packer untuk merge overlap
     )
 
     chunks = splitter.split_documents(docs)
@@ -35,16 +47,36 @@ def load_and_split(path):
 # STEP 2 — Build Embeddings
 # ====================================
 
-def create_vectorstore(chunks, db_type="faiss"):
+def build_embeddings(cache_path=".embedding_cache.sqlite"):
     embeddings = OpenAIEmbeddings(
         model="text-embedding-3-small"   # murah, efisien
     )
 
+    # chunk & query yang sama tidak di-embed ulang
+    return CachedEmbeddings(embeddings, disk_path=cache_path)
+
+
+def create_vectorstore(chunks, db_type="faiss", persist_dir=None, index=None):
+    """index: None/"flat" (exact), "ivf", "hnsw", "ivfpq", "hnswpq" atau IndexSpec."""
+    embeddings = build_embeddings()
+    spec = resolve_spec(index)
+
+    # index di disk: restart cukup mmap vektor lama,
+    # hanya chunk baru/berubah yang dikirim ke OpenAIEmbeddings
+    if persist_dir is not None:
+        persistent = PersistentVectorIndex(persist_dir, model=embeddings.model)
+        persistent.sync(chunks, embeddings)
+        embeddings = persistent.as_embeddings(embeddings)
+
     if db_type == "faiss":
-        return FAISS.from_documents(chunks, embeddings)
+        if spec.kind == "flat" and spec.pq_m is None:
+            return FAISS.from_documents(chunks, embeddings)
+        return faiss_from_documents(chunks, embeddings, spec)
 
     if db_type == "chroma":
-        return Chroma.from_documents(chunks, embeddings)
+        return Chroma.from_documents(
+            chunks, embeddings, collection_metadata=chroma_hnsw_metadata(spec)
+        )
 
     raise ValueError("Invalid db_type")
 
@@ -64,12 +96,7 @@ def retrieve(vectorstore, query, k=3):
 # STEP 4 — Ask LLM with context
 # ====================================
 
-def ask_llm(context, query):
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2)
-    parser = JsonOutputParser(pydantic_object=HPADiagnosis)
-
-    prompt = PromptTemplate.from_template(
-        template="""
+ASK_TEMPLATE = """
 Gunakan konteks berikut untuk menjawab pertanyaan.
 Jawab HANYA berdasarkan konteks.
 
@@ -79,12 +106,14 @@ Konteks:
 Pertanyaan:
 {query}
 
-Analisa issue berikut dan jawab dengan format JSON VALID sesuai schema.\n\n
-{format_instructions}\n\n""",
-        partial_variables={"format_instructions": parser.get_format_instructions()},
-    )
+Analisa issue berikut dan jawab PERSIS dengan format output di bawah (sesuai schema).\n\n
+{format_instructions}\n\n"""
+
 
-    chain = prompt | llm | parser
+def ask_llm(context, query, structured=False, toon=False):
+    # toon=True -> schema ringkas di prompt, jawaban TOON di-decode ke HPADiagnosis
+    chain = get_chain(ASK_TEMPLATE, schema=HPADiagnosis, model="gpt-4.1-mini",
+                      temperature=0.2, structured=structured, toon=toon)
     return chain.invoke({"context": context, "query": query})
 
 
@@ -98,19 +127,33 @@ if __name__ == "__main__":
     chunks = load_and_split("sample_noise.txt")
 
     # Vectorstore berbasis semantic
-    vs = create_vectorstore(chunks, db_type="faiss")
+    vs = create_vectorstore(chunks, db_type="faiss", persist_dir=".vector_index")
 
     query = "apa penyebab HPA tidak melakukan scaling"
 
-    top_chunks = retrieve(vs, query, k=3)
-
-    print("=== RELEVANT CHUNKS ===")
-    for i, c in enumerate(top_chunks):
-        print(f"\nChunk {i+1}:")
-        print(c.page_content)
-
-    merged_context = "\n\n".join(c.page_content for c in top_chunks)
-
-    print("\n=== FINAL ANSWER ===")
-    answer = ask_llm(merged_context, query)
-    print(answer)
+    # retrieval / pack / prompt / llm / parse per stage; --trace -> traces.jsonl
+    with instrument(trace_path="traces.jsonl" if "--trace" in sys.argv else None):
+        top_chunks = retrieve(vs, query, k=3)
+
+        print("=== RELEVANT CHUNKS ===")
+        for i, c in enumerate(top_chunks):
+            print(f"\nChunk {i+1}:")
+            print(c.page_content)
+
+        toon = "--toon" in sys.argv
+        with stage("pack", "toon" if toon else "context"):
+            if toon:
+                # chunk + metadata sebagai satu tabel TOON
+                merged_context = docs_to_toon(top_chunks)
+            else:
+                packed = pack_context(top_chunks, max_tokens=1500)
+                merged_context = packed.text
+        if not toon:
+            print_pack_report(packed, query)
+
+        print("\n=== FINAL ANSWER ===")
+        answer = ask_llm(merged_context, query, structured="--structured" in sys.argv, toon=toon)
+        print(answer)
+
+    print()
+    print_stage_report()
@@ -1,9 +1,28 @@
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS, Chroma
 from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_core.prompts import PromptTemplate
+from vectorIndex import PersistentVectorIndex
+from embeddingCache import CachedEmbeddings
+from contextPacker import pack_context, print_pack_report
+from incrementalIndex import IncrementalIndex
+from annIndex import chroma_hnsw_metadata, faiss_from_documents, resolve_spec
+from embedPipeline import ingest_to_faiss
+from hybridRetriever import HybridRetriever
+from batchRetrieval import retrieve_batch
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "day4"))
+sys.path.append(str(Path(__file__).resolve().parents[2] / "shared"))
+from streamSplit import stream_split
+from fastSplit import FastTextSplitter
+from bm25Index import build_index
+from chainRegistry import get_chain
+from instrumentation import instrument, print_stage_report, stage
+from modelCascade import CascadeRouter, print_cascade_report
 
 
 # ====================================
@@ -14,33 +33,83 @@ def load_and_split(path):
     loader = TextLoader(path, encoding="utf-8")
     docs = loader.load()
 
-    splitter = RecursiveCharacterTextSplitter(
+    splitter = FastTextSplitter(
         chunk_size=800,
-        chunk_overlap=150
+        chunk_overlap=150,
+        add_start_index=True,   # offset dipakai context packer untuk merge overlap
     )
 
     chunks = splitter.split_documents(docs)
     return chunks
 
 
+def iter_load_and_split(path):
+    # versi streaming untuk file besar: dibaca per block, chunk di-yield satu
+    # per satu -> bisa langsung dikonsumsi acreate_vectorstore
+    return stream_split(path, chunk_size=800, chunk_overlap=150)
+
+
 # ====================================
 # STEP 2 — Build Embeddings
 # ====================================
 
-def create_vectorstore(chunks, db_type="faiss"):
+def build_embeddings(cache_path=".embedding_cache.sqlite"):
     embeddings = OpenAIEmbeddings(
         model="text-embedding-3-small"   # murah, efisien
     )
 
+    # chunk & query yang sama tidak di-embed ulang
+    return CachedEmbeddings(embeddings, disk_path=cache_path)
+
+
+def create_vectorstore(chunks, db_type="faiss", persist_dir=None, index=None, embeddings=None):
+    """index: None/"flat" (exact), "ivf", "hnsw", "ivfpq", "hnswpq" atau IndexSpec.
+    embeddings: default OpenAI + cache (mis. HashEmbeddings untuk benchmark offline)."""
+    embeddings = embeddings or build_embeddings()
+    spec = resolve_spec(index)
+
+    # index di disk: restart cukup mmap vektor lama,
+    # hanya chunk baru/berubah yang dikirim ke OpenAIEmbeddings
+    if persist_dir is not None:
+        persistent = PersistentVectorIndex(persist_dir, model=embeddings.model)
+        persistent.sync(chunks, embeddings)
+        embeddings = persistent.as_embeddings(embeddings)
+
     if db_type == "faiss":
-        return FAISS.from_documents(chunks, embeddings)
+        if spec.kind == "flat" and spec.pq_m is None:
+            return FAISS.from_documents(chunks, embeddings)
+        return faiss_from_documents(chunks, embeddings, spec)
 
     if db_type == "chroma":
-        return Chroma.from_documents(chunks, embeddings)
+        return Chroma.from_documents(
+            chunks, embeddings, collection_metadata=chroma_hnsw_metadata(spec)
+        )
 
     raise ValueError("Invalid db_type")
 
 
+def update_vectorstore(paths, store_dir=".vector_store", db_type="faiss"):
+    # store dipakai ulang antar run: hanya chunk baru/berubah yang di-embed,
+    # chunk yang hilang dihapus dari store (tanpa rebuild)
+    index = IncrementalIndex(store_dir, build_embeddings(), load_and_split, db_type=db_type)
+    stats = index.update(paths)
+    print(f"Re-index: +{stats['chunks_added']} / -{stats['chunks_deleted']} chunk, "
+          f"{stats['chunks_kept']} tetap, {stats['files_skipped']} file tidak berubah "
+          f"({stats['elapsed_s']:.2f}s)")
+    return index.store
+
+
+async def acreate_vectorstore(chunks, concurrency=4, **pipeline_kwargs):
+    # batch per token budget, N batch paralel di belakang rate limiter,
+    # vektor langsung masuk FAISS begitu batch selesai
+    store, stats = await ingest_to_faiss(
+        chunks, build_embeddings(), concurrency=concurrency, **pipeline_kwargs
+    )
+    print(f"Embedded {stats['texts']} chunks dalam {stats['batches']} batch "
+          f"({stats['retries']} retry, {stats['elapsed_s']:.2f}s)")
+    return store
+
+
 # ====================================
 # STEP 3 — Retrieval
 # ====================================
@@ -52,15 +121,33 @@ def retrieve(vectorstore, query, k=3):
     return retriever.get_relevant_documents(query)
 
 
+def top_relevance(vectorstore, query):
+    # skor 0..1 chunk paling relevan -> dipakai router untuk memilih tier awal
+    hits = vectorstore.similarity_search_with_relevance_scores(query, k=1)
+    return hits[0][1] if hits else 0.0
+
+
+def retrieve_many(vectorstore, queries, k=3, batch_size=256):
+    # replay ribuan query (job malam): embedding per batch + satu batch search
+    return retrieve_batch(vectorstore, queries, k=k, batch_size=batch_size)
+
+
+def build_hybrid(chunks, vectorstore, **kwargs):
+    # BM25 dari chunk yang sama dengan vectorstore; k & bobot per sumber via kwargs
+    return HybridRetriever(build_index(chunks), vectorstore, **kwargs)
+
+
+def retrieve_hybrid(hybrid, query, k=3):
+    # bukan BaseRetriever -> timing manual (retriever LangChain tercatat otomatis)
+    with stage("retrieval", "hybrid"):
+        return [doc for doc, _ in hybrid.search(query, k=k)]
+
+
 # ====================================
 # STEP 4 — Ask LLM with context
 # ====================================
 
-def ask_llm(context, query):
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2)
-
-    prompt = PromptTemplate.from_template(
-        """
+ASK_TEMPLATE = """
 Gunakan konteks berikut untuk menjawab pertanyaan.
 Jawab HANYA berdasarkan konteks.
 
@@ -72,12 +159,24 @@ Pertanyaan:
 
 Jawab singkat dan akurat.
 """
-    )
 
-    chain = prompt | llm
+
+def ask_llm(context, query):
+    chain = get_chain(ASK_TEMPLATE, model="gpt-4.1-mini", temperature=0.2)
     return chain.invoke({"context": context, "query": query}).content
 
 
+ASK_PROMPT = PromptTemplate.from_template(ASK_TEMPLATE)
+
+
+def ask_llm_routed(router, context, query, retrieval_score=None):
+    # nano dulu; skor retrieval rendah -> langsung mulai dari tier berikutnya
+    return router.run(
+        lambda llm: (ASK_PROMPT | llm).invoke({"context": context, "query": query}).content,
+        retrieval_score=retrieval_score,
+    )
+
+
 # ====================================
 # MAIN
 # ====================================
@@ -88,19 +187,38 @@ if __name__ == "__main__":
     chunks = load_and_split("sample_noise.txt")
 
     # Vectorstore berbasis semantic
-    vs = create_vectorstore(chunks, db_type="faiss")
+    vs = update_vectorstore(["sample_noise.txt"], store_dir=".vector_store")
 
     query = "apa penyebab HPA tidak melakukan scaling"
 
-    top_chunks = retrieve(vs, query, k=3)
-
-    print("=== RELEVANT CHUNKS ===")
-    for i, c in enumerate(top_chunks):
-        print(f"\nChunk {i+1}:")
-        print(c.page_content)
-
-    merged_context = "\n\n".join(c.page_content for c in top_chunks)
-
-    print("\n=== FINAL ANSWER ===")
-    answer = ask_llm(merged_context, query)
-    print(answer)
+    # BM25 + vector paralel, digabung dengan RRF
+    hybrid = build_hybrid(chunks, vs, k_bm25=10, k_vector=10)
+
+    # retrieval / pack / prompt / llm per stage; --trace -> traces.jsonl
+    with instrument(trace_path="traces.jsonl" if "--trace" in sys.argv else None):
+        top_chunks = retrieve_hybrid(hybrid, query, k=3)
+
+        print("=== RELEVANT CHUNKS ===")
+        for i, c in enumerate(top_chunks):
+            print(f"\nChunk {i+1}:")
+            print(c.page_content)
+
+        # overlap antar chunk ditulis sekali, near-duplicate dibuang, maks 1500 token
+        with stage("pack", "context"):
+            packed = pack_context(top_chunks, max_tokens=1500)
+        print_pack_report(packed, query)
+        merged_context = packed.text
+
+        print("\n=== FINAL ANSWER ===")
+        router = CascadeRouter(temperature=0.2) if "--route" in sys.argv else None
+        if router is not None:
+            answer = ask_llm_routed(router, merged_context, query, top_relevance(vs, query))
+        else:
+            answer = ask_llm(merged_context, query)
+        print(answer)
+
+    print()
+    print_stage_report()
+    if router is not None:
+        print()
+        print_cascade_report(router)
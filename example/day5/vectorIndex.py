@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+VECTORS_FILE = "vectors.npy"
+META_FILE = "meta.json"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PersistentVectorIndex:
+    """Matrix embedding float32 di disk (di-mmap saat load) + sidecar metadata.
+
+    Layout direktori:
+        vectors.npy  -> float32 [n_chunks, dim], dibuka dengan mmap_mode="r"
+        meta.json    -> model, dim, dan per baris: hash, text, metadata
+    """
+
+    def __init__(self, path, model=None):
+        self.path = Path(path)
+        self.model = model
+        self.dim = None
+        self.entries = []
+        self.vectors = None
+        self._row_by_hash = {}
+
+        if (self.path / META_FILE).exists():
+            self._load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ---------- LOAD / SAVE ----------
+    def _load(self):
+        with open(self.path / META_FILE, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        # model embedding berubah -> vektor lama tidak bisa dipakai lagi
+        if self.model is not None and meta["model"] != self.model:
+            return
+
+        self.model = meta["model"]
+        self.dim = meta["dim"]
+        self.entries = meta["entries"]
+        self.vectors = np.load(self.path / VECTORS_FILE, mmap_mode="r")
+        self._row_by_hash = {e["hash"]: i for i, e in enumerate(self.entries)}
+
+    def _save(self, entries, new_vectors):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = self.path / (VECTORS_FILE + ".tmp")
+        tmp_meta = self.path / (META_FILE + ".tmp")
+
+        # tulis langsung ke file (open_memmap) supaya matrix tidak perlu
+        # dimaterialisasi penuh di RAM
+        out = np.lib.format.open_memmap(
+            tmp_vectors, mode="w+", dtype=np.float32, shape=(len(entries), self.dim)
+        )
+        for i, e in enumerate(entries):
+            row = self._row_by_hash.get(e["hash"])
+            out[i] = self.vectors[row] if row is not None else new_vectors[e["hash"]]
+        out.flush()
+        del out
+
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim, "entries": entries}, f)
+
+        os.replace(tmp_vectors, self.path / VECTORS_FILE)
+        os.replace(tmp_meta, self.path / META_FILE)
+        self._load()
+
+    # ---------- SYNC ----------
+    def sync(self, chunks, embeddings):
+        """Samakan index dengan `chunks`; hanya chunk baru/berubah yang di-embed."""
+        entries = [
+            {"hash": content_hash(c.page_content), "text": c.page_content, "metadata": c.metadata}
+            for c in chunks
+        ]
+        if [e["hash"] for e in entries] == [e["hash"] for e in self.entries]:
+            return 0
+
+        missing = {}
+        for e in entries:
+            if e["hash"] not in self._row_by_hash:
+                missing[e["hash"]] = e["text"]
+
+        new_vectors = {}
+        if missing:
+            vectors = embeddings.embed_documents(list(missing.values()))
+            new_vectors = dict(zip(missing, vectors))
+            if self.dim is None:
+                self.dim = len(vectors[0])
+
+        self._save(entries, new_vectors)
+        return len(missing)
+
+    # ---------- ACCESS ----------
+    def vector_for(self, text):
+        row = self._row_by_hash.get(content_hash(text))
+        return None if row is None else self.vectors[row]
+
+    def as_embeddings(self, base):
+        return PrecomputedEmbeddings(self, base)
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Ambil vektor dokumen dari index; hanya teks yang belum ada yang ke `base`."""
+
+    def __init__(self, index, base):
+        self.index = index
+        self.base = base
+
+    def embed_documents(self, texts):
+        vectors = [self.index.vector_for(t) for t in texts]
+        missing = [t for t, v in zip(texts, vectors) if v is None]
+        fresh = iter(self.base.embed_documents(missing) if missing else [])
+        return [v.tolist() if v is not None else next(fresh) for v in vectors]
+
+    def embed_query(self, text):
+        return self.base.embed_query(text)
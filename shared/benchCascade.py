@@ -0,0 +1,110 @@
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from fakeModels import FakeChatOpenAI, LatencyModel, json_response, json_schema_of, sample_from_schema
+from instrumentation import Metrics, instrument
+from modelCascade import CascadeRouter, print_cascade_report
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "example" / "day2"))
+from schemaStrict import DevOpsReport, build_chain
+
+
+# ====================================
+# Cascade nano -> mini -> gpt-4.1 vs selalu satu model
+# ====================================
+# 80% issue "mudah", 20% "sulit" (ditandai di teks issue). Peluang jawaban
+# gagal schema / jawaban ragu per tier & tingkat kesulitan di bawah; latency
+# relatif antar tier mengikuti model sungguhan (diperkecil supaya bench cepat).
+
+RUNS = 300
+HARD_RATE = 0.2
+
+# model -> (median latency s, p(gagal) issue mudah, p(gagal) issue sulit)
+TIERS = {
+    "gpt-4.1-nano": (0.015, 0.04, 0.55),
+    "gpt-4.1-mini": (0.035, 0.02, 0.15),
+    "gpt-4.1": (0.08, 0.0, 0.03),
+}
+
+
+def tier_llm(model, seed=0):
+    median_s, p_easy, p_hard = TIERS[model]
+    rng = random.Random(seed)
+    schema = json_schema_of(DevOpsReport)
+
+    def reply(prompt):
+        p_fail = p_hard if "[sulit]" in prompt else p_easy
+        r = rng.random()
+        if r < p_fail / 2:
+            # gagal schema: field wajib hilang
+            return json_response(DevOpsReport, rng, 1.0, ["missing_field"])
+        data = sample_from_schema(schema)
+        data["root_cause"] = "container kena OOMKilled karena limit memory 256Mi terlalu kecil"
+        if r < p_fail:
+            data["root_cause"] = "tidak yakin, butuh log tambahan"     # jawaban ragu
+        return json.dumps(data)
+
+    return FakeChatOpenAI(model=model, responses=reply, seed=seed,
+                          latency=LatencyModel("lognormal", median_s, 0.3))
+
+
+def make_issues(n=RUNS, seed=1):
+    rng = random.Random(seed)
+    return [f"{'[sulit] ' if rng.random() < HARD_RATE else ''}Pod restart loop #{i}" for i in range(n)]
+
+
+def run(chain, issues):
+    latencies, failures = [], 0
+    for issue in issues:
+        t0 = time.perf_counter()
+        try:
+            chain.invoke({"issue": issue})
+        except Exception:
+            failures += 1
+        latencies.append(time.perf_counter() - t0)
+    return np.array(latencies) * 1000, failures
+
+
+def total_cost(metrics):
+    return sum(v for (name, _), v in metrics.counters.items() if name == "cost_usd_total")
+
+
+def report(label, lat, failures, router, metrics):
+    # jawaban ragu dari tier terakhir tetap dikembalikan (tidak ada tier lagi)
+    hedged = router.tier_stats()[router.tiers[-1]]["escalated"].get("low_confidence", 0)
+    print(f"{label:<22} {np.mean(lat):>8.1f} {np.percentile(lat, 50):>8.1f} {np.percentile(lat, 99):>8.1f} "
+          f"{failures:>6} {hedged:>5} {total_cost(metrics) / RUNS * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    issues = make_issues()
+    llms = {model: tier_llm(model) for model in TIERS}
+
+    print(f"{RUNS} request, {HARD_RATE:.0%} sulit\n")
+    print(f"{'mode':<22} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'gagal':>6} {'ragu':>5} {'USD/1M req':>12}")
+
+    for model, llm in llms.items():
+        metrics = Metrics()
+        router = CascadeRouter(tiers=[model], llm_factory=lambda model, temperature: llms[model],
+                               metrics=metrics)
+        chain = router.as_chain(lambda llm: build_chain(llm=llm), schema=DevOpsReport)
+        with instrument(metrics=metrics):
+            lat, failures = run(chain, issues)
+        report(f"selalu {model}", lat, failures, router, metrics)
+
+    metrics = Metrics()
+    router = CascadeRouter(tiers=list(TIERS), llm_factory=lambda model, temperature: llms[model],
+                           metrics=metrics)
+    chain = router.as_chain(lambda llm: build_chain(llm=llm), schema=DevOpsReport)
+    with instrument(metrics=metrics):
+        lat, failures = run(chain, issues)
+    report("cascade", lat, failures, router, metrics)
+
+    print()
+    print_cascade_report(router)
@@ -0,0 +1,83 @@
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchStructured import sample_value
+from chainRegistry import make_chain
+from instrumentation import Metrics, instrument, print_stage_report
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "task"))
+from taskD1 import DevOpsTroubleshoot, TEMPLATE
+
+
+# ====================================
+# Instrumentation: overhead handler + contoh laporan p50/p99 per stage
+# ====================================
+
+RUNS = 300
+MEDIAN_LATENCY_S = 0.004      # latency LLM lognormal -> ekor p99 jauh dari median
+SIGMA = 0.6
+
+
+class FakeUsageLLM(BaseChatModel):
+    """Jawaban valid + token_usage seperti ChatOpenAI."""
+
+    model_name: str = "gpt-4.1-mini"
+    seed: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake-usage"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(random.lognormvariate(0, SIGMA) * MEDIAN_LATENCY_S)
+        content = DevOpsTroubleshoot.model_validate(sample_value(DevOpsTroubleshoot)).model_dump_json()
+        # estimasi ~4 karakter/token (tanpa download encoding tiktoken)
+        usage = {
+            "prompt_tokens": sum(len(m.content) for m in messages) // 4,
+            "completion_tokens": len(content) // 4,
+        }
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=content))],
+            llm_output={"token_usage": usage, "model_name": self.model_name},
+        )
+
+
+def run(chain, runs):
+    start = time.perf_counter()
+    for i in range(runs):
+        chain.invoke({"issue": f"Pod CrashLoopBackOff #{i}"})
+    return (time.perf_counter() - start) / runs
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    chain = make_chain(TEMPLATE, schema=DevOpsTroubleshoot, llm=FakeUsageLLM())
+    run(chain, 20)                                         # warm-up
+
+    random.seed(1)
+    plain = run(chain, RUNS)
+
+    metrics = Metrics()
+    trace_path = Path(tempfile.mkdtemp()) / "traces.jsonl"
+    random.seed(1)
+    with instrument(metrics=metrics, trace_path=trace_path):
+        traced = run(chain, RUNS)
+
+    print(f"{RUNS} invoke, LLM palsu median {MEDIAN_LATENCY_S * 1000:.0f} ms\n")
+    print(f"tanpa instrument : {plain * 1000:7.3f} ms/invoke")
+    print(f"dengan instrument: {traced * 1000:7.3f} ms/invoke "
+          f"(overhead {(traced - plain) * 1e6:.0f} us, termasuk tulis JSONL)\n")
+
+    print_stage_report(metrics)
+
+    lines = trace_path.read_text(encoding="utf-8").splitlines()
+    print(f"\n{len(lines)} span di {trace_path}, contoh:\n{lines[1]}\n")
+    print("\n".join(l for l in metrics.to_prometheus().splitlines() if 'stage="llm"' in l))
@@ -0,0 +1,67 @@
+import os
+import time
+from typing import Literal
+
+from pydantic import BaseModel, Field
+from langchain_openai import ChatOpenAI
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
+
+from chainRegistry import get_chain
+
+# tidak ada request ke API: yang diukur hanya overhead konstruksi per call
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+
+N_CALLS = 2000
+
+TEMPLATE = (
+    "Kamu adalah DevOps senior.\n"
+    "Analisa issue berikut dan berikan output dalam format JSON sesuai schema.\n\n"
+    "{format_instructions}\n\n"
+    "Issue: {issue}\n"
+)
+
+
+class DevOpsTroubleshoot(BaseModel):
+    issue: str = Field(description="Deskripsi singkat masalah yang terjadi")
+    root_cause: str = Field(description="Analisis penyebab utama masalah")
+    possible_fixes: list[str] = Field(description="Langkah-langkah perbaikan yang bisa dilakukan")
+    risk_level: Literal["low", "medium", "high"] = Field(description="Tingkat risiko jika tidak segera ditangani")
+    estimated_fix_time_minutes: int = Field(description="Perkiraan waktu perbaikan dalam menit")
+
+
+def build_per_call():
+    # pola lama taskD1.jsonOutput: semua dibuat ulang tiap panggilan
+    parser = JsonOutputParser(pydantic_object=DevOpsTroubleshoot)
+    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2)
+    prompt = PromptTemplate(
+        template=TEMPLATE,
+        input_variables=["issue"],
+        partial_variables={"format_instructions": parser.get_format_instructions()},
+    )
+    return prompt | llm | parser
+
+
+def build_cached():
+    return get_chain(TEMPLATE, schema=DevOpsTroubleshoot, model="gpt-4.1-mini", temperature=0.2)
+
+
+def bench(build):
+    start = time.perf_counter()
+    for i in range(N_CALLS):
+        chain = build()
+        chain.first.invoke({"issue": f"issue {i}"})   # render prompt saja
+    return (time.perf_counter() - start) / N_CALLS * 1e6
+
+
+if __name__ == "__main__":
+    build_cached()  # warm-up registry
+
+    before = bench(build_per_call)
+    after = bench(build_cached)
+
+    print(f"{'per-call construction':<28} {before:>10.1f} us/call")
+    print(f"{'registry (memoized)':<28} {after:>10.1f} us/call")
+    print(f"{'speedup':<28} {before / after:>10.1f}x")
+    print("\nCatatan: angka di atas belum termasuk TLS handshake baru per call;"
+          "\nregistry memakai satu httpx pool per model sehingga koneksi di-reuse.")
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+from typing import Literal
+
+from pydantic import BaseModel, Field
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from chainRegistry import make_chain
+
+
+TOKEN_DELAY_S = 0.01     # ~100 token/detik
+CHARS_PER_TOKEN = 4
+
+TEMPLATE = "{format_instructions}\n\nIssue: {issue}\n"
+
+
+class DevOpsTroubleshoot(BaseModel):
+    issue: str = Field(description="Deskripsi singkat masalah yang terjadi")
+    root_cause: str = Field(description="Analisis penyebab utama masalah")
+    risk_level: Literal["low", "medium", "high"] = Field(description="Tingkat risiko jika tidak segera ditangani")
+    possible_fixes: list[str] = Field(description="Langkah-langkah perbaikan yang bisa dilakukan")
+    estimated_fix_time_minutes: int = Field(description="Perkiraan waktu perbaikan dalam menit")
+
+
+COMPLETION = "```json\n" + json.dumps({
+    "issue": "Pod Kubernetes CrashLoopBackOff karena ImagePullBackOff",
+    "root_cause": "Image tag tidak ada di registry dan imagePullSecret salah namespace.",
+    "risk_level": "high",
+    "possible_fixes": [
+        f"Langkah {i}: periksa konfigurasi deployment, registry, dan secret terkait"
+        for i in range(1, 13)
+    ],
+    "estimated_fix_time_minutes": 30,
+}, indent=2) + "\n```"
+
+
+class FakeStreamingLLM(BaseChatModel):
+    """Stream COMPLETION per ~token dengan delay tetap."""
+
+    @property
+    def _llm_type(self):
+        return "fake-streaming"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(TOKEN_DELAY_S * len(COMPLETION) / CHARS_PER_TOKEN)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=COMPLETION))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(TOKEN_DELAY_S * len(COMPLETION) / CHARS_PER_TOKEN)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=COMPLETION))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for i in range(0, len(COMPLETION), CHARS_PER_TOKEN):
+            await asyncio.sleep(TOKEN_DELAY_S)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=COMPLETION[i:i + CHARS_PER_TOKEN]))
+
+
+async def bench_invoke():
+    chain = make_chain(TEMPLATE, schema=DevOpsTroubleshoot, llm=FakeStreamingLLM())
+    start = time.perf_counter()
+    result = await chain.ainvoke({"issue": "x"})
+    elapsed = time.perf_counter() - start
+    assert result["risk_level"] == "high"
+    return {"first_token": elapsed, "risk_level": elapsed, "complete": elapsed}
+
+
+async def bench_stream():
+    chain = make_chain(TEMPLATE, schema=DevOpsTroubleshoot, llm=FakeStreamingLLM(), streaming=True)
+    marks = {}
+    start = time.perf_counter()
+
+    # time-to-first-token diukur di level LLM, field di level parser
+    async for _ in (chain.first | chain.middle[0]).astream({"issue": "x"}):
+        marks["first_token"] = time.perf_counter() - start
+        break
+
+    start = time.perf_counter()
+    async for partial in chain.astream({"issue": "x"}):
+        if "risk_level" in partial and "risk_level" not in marks:
+            marks["risk_level"] = time.perf_counter() - start
+    marks["complete"] = time.perf_counter() - start
+    assert partial["estimated_fix_time_minutes"] == 30
+    return marks
+
+
+if __name__ == "__main__":
+    n_tokens = len(COMPLETION) // CHARS_PER_TOKEN
+    print(f"Fake LLM: {n_tokens} token, {TOKEN_DELAY_S * 1000:.0f} ms/token\n")
+
+    print(f"{'mode':<10} {'first token':>12} {'risk_level':>12} {'complete':>10}")
+    for name, fn in (("invoke", bench_invoke), ("astream", bench_stream)):
+        m = asyncio.run(fn())
+        print(f"{name:<10} {m['first_token'] * 1000:>10.0f}ms {m['risk_level'] * 1000:>10.0f}ms "
+              f"{m['complete'] * 1000:>8.0f}ms")
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import sys
+import time
+import typing
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from structuredOutput import parser_chain, structured_chain
+
+ROOT = Path(__file__).resolve().parent.parent
+for sub in ("example/day1", "example/day2", "example/day3", "example/day5", "task"):
+    sys.path.append(str(ROOT / sub))
+
+from jsonOutput import Explanation
+from schemaStrict import DevOpsReport
+from multiStepPipeline import FinalDevOpsReport, STEP4_PROMPT
+from taskD1 import DevOpsTroubleshoot, TEMPLATE as TASK_TEMPLATE
+from jsonOutput_RagSemantic import HPADiagnosis, ASK_TEMPLATE
+import selfHealing
+
+
+# ====================================
+# Perbandingan: format_instructions di prompt vs schema lewat API
+# ====================================
+# Offline: fake LLM dengan latency = prefill (per token input) + decode tetap.
+#          Token "native" = prompt + JSON schema yang disisipkan provider
+#          (perkiraan: schema di-serialize apa adanya, format internal provider
+#          tidak diketahui).
+# --live : ChatOpenAI sungguhan, token input dari usage API.
+
+PREFILL_S_PER_TOKEN = 0.0002    # ~5k token/detik prefill
+DECODE_S = 0.3
+RUNS = 5
+
+GENERIC_TEMPLATE = "{format_instructions}\n\nInput: {input}\n"
+
+CASES = [
+    ("jsonOutput", Explanation, GENERIC_TEMPLATE),
+    ("schemaStrict/selfHealing", DevOpsReport, GENERIC_TEMPLATE),
+    ("multiStep.step4", FinalDevOpsReport, STEP4_PROMPT.template),
+    ("taskD1", DevOpsTroubleshoot, TASK_TEMPLATE),
+    ("ragSemantic.ask_llm", HPADiagnosis, ASK_TEMPLATE),
+]
+
+
+def count_tokens(text):
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        return len(text) // 4
+
+
+def schema_tokens(schema):
+    """Perkiraan token schema yang disisipkan provider untuk response_format."""
+    return count_tokens(json.dumps(schema.model_json_schema(), ensure_ascii=False))
+
+
+def sample_value(ann):
+    """Value dummy yang lolos validasi untuk anotasi `ann`."""
+    origin = typing.get_origin(ann)
+    if origin is Literal:
+        return typing.get_args(ann)[0]
+    if origin is list:
+        return [sample_value(typing.get_args(ann)[0])] * 3
+    if isinstance(ann, type) and issubclass(ann, BaseModel):
+        return {k: sample_value(f.annotation) for k, f in ann.model_fields.items()}
+    return {bool: True, int: 30, float: 0.5}.get(ann, "contoh isi field")
+
+
+def sample_inputs(template):
+    prompt = PromptTemplate.from_template(template)
+    return {v: "Pod CrashLoopBackOff setelah deploy" for v in prompt.input_variables
+            if v != "format_instructions"}
+
+
+class FakeLatencyLLM(BaseChatModel):
+    """Latency naik sesuai jumlah token input; mendukung with_structured_output."""
+
+    response_model: typing.Any = None
+    extra_prompt_tokens: int = 0      # schema dari with_structured_output
+
+    @property
+    def _llm_type(self):
+        return "fake-latency"
+
+    def _respond(self, messages):
+        prompt_tokens = sum(count_tokens(m.content) for m in messages) + self.extra_prompt_tokens
+        delay = DECODE_S + prompt_tokens * PREFILL_S_PER_TOKEN
+        content = self.response_model.model_validate(sample_value(self.response_model)).model_dump_json()
+        return delay, ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, result = self._respond(messages)
+        time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, result = self._respond(messages)
+        await asyncio.sleep(delay)
+        return result
+
+    def with_structured_output(self, schema, *, method="json_schema", **kwargs):
+        # meniru provider: schema dikirim di luar prompt (tetap dihitung token input),
+        # output di-parse sekali
+        llm = self.model_copy(update={"extra_prompt_tokens": schema_tokens(schema)})
+        return llm | RunnableLambda(lambda msg: schema.model_validate_json(msg.content))
+
+
+class RejectingLLM(FakeLatencyLLM):
+    """Model yang menolak response_format; mencatat prompt yang diterima."""
+
+    prompts: list = []
+
+    def _respond(self, messages):
+        self.prompts.append("\n".join(m.content for m in messages))
+        return 0.0, super()._respond(messages)[1]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if "response_format" in kwargs:
+            raise ValueError("response_format tidak didukung model ini")
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    def with_structured_output(self, schema, *, method="json_schema", **kwargs):
+        return self.bind(response_format=schema) | RunnableLambda(
+            lambda msg: schema.model_validate_json(msg.content))
+
+
+def check_fallback_prompts():
+    """Jalur fallback (response_format ditolak) harus tetap membawa schema di prompt."""
+    schema = selfHealing.DevOpsReport
+    marker = json.dumps(next(iter(schema.model_json_schema()["properties"])))
+
+    llm = RejectingLLM(response_model=schema, prompts=[])
+    structured_chain(PromptTemplate.from_template(GENERIC_TEMPLATE), llm, schema).invoke({"input": "x"})
+    assert marker in llm.prompts[-1], "structured_chain: fallback tanpa format_instructions"
+
+    llm = RejectingLLM(response_model=schema, prompts=[])
+    generate, _, _ = selfHealing.build_chain(structured=True, llm=llm)
+    generate.invoke({"issue": "x"})
+    assert marker in llm.prompts[-1], "selfHealing: fallback tanpa format_instructions"
+
+
+def rendered_tokens(chain, inputs):
+    # RunnableWithFallbacks -> chain utama; RunnableSequence -> langsung
+    seq = getattr(chain, "runnable", chain)
+    return count_tokens(seq.first.invoke(inputs).to_string())
+
+
+async def timed(chain, inputs, runs=RUNS):
+    start = time.perf_counter()
+    for _ in range(runs):
+        await chain.ainvoke(inputs)
+    return (time.perf_counter() - start) / runs
+
+
+async def bench_offline():
+    check_fallback_prompts()
+    print(f"Fake LLM: {DECODE_S * 1000:.0f} ms decode + "
+          f"{PREFILL_S_PER_TOKEN * 1e6:.0f} us/token input, {RUNS} run\n")
+    print(f"{'chain':<26} {'tok parser':>10} {'tok native':>10} {'ms parser':>10} {'ms native':>10}")
+
+    for name, schema, template in CASES:
+        prompt = PromptTemplate.from_template(template)
+        inputs = sample_inputs(template)
+        llm = FakeLatencyLLM(response_model=schema)
+
+        parser = parser_chain(prompt, llm, schema)
+        native = structured_chain(prompt, llm, schema)
+        assert (await native.ainvoke(inputs)) == (await parser.ainvoke(inputs))
+
+        native_tokens = rendered_tokens(native, inputs) + schema_tokens(schema)
+        print(f"{name:<26} {rendered_tokens(parser, inputs):>10} {native_tokens:>10} "
+              f"{await timed(parser, inputs) * 1000:>10.0f} {await timed(native, inputs) * 1000:>10.0f}")
+
+
+async def bench_live(model="gpt-4.1-mini"):
+    from dotenv import load_dotenv
+    from langchain_community.callbacks import get_openai_callback
+    from chainRegistry import get_llm
+
+    load_dotenv()
+    llm = get_llm(model, 0)
+    print(f"Live: {model}, {RUNS} run\n")
+    print(f"{'chain':<26} {'tok parser':>10} {'tok native':>10} {'ms parser':>10} {'ms native':>10}")
+
+    for name, schema, template in CASES:
+        prompt = PromptTemplate.from_template(template)
+        inputs = sample_inputs(template)
+        row = []
+        for chain in (parser_chain(prompt, llm, schema), structured_chain(prompt, llm, schema)):
+            with get_openai_callback() as cb:
+                elapsed = await timed(chain, inputs)
+            row.append((cb.prompt_tokens // RUNS, elapsed))
+
+        (tok_p, ms_p), (tok_n, ms_n) = row
+        print(f"{name:<26} {tok_p:>10} {tok_n:>10} {ms_p * 1000:>10.0f} {ms_n * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    # catatan: token "native" di mode live sudah termasuk schema yang disisipkan provider
+    asyncio.run(bench_live() if "--live" in sys.argv else bench_offline())
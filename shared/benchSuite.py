@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from fakeModels import FakeChatOpenAI, HashEmbeddings, LatencyModel, make_corpus
+from instrumentation import Metrics, instrument
+
+ROOT = Path(__file__).resolve().parent.parent
+for sub in ("example/day1", "example/day2", "example/day3", "example/day4", "example/day5", "task"):
+    sys.path.append(str(ROOT / sub))
+
+
+# ====================================
+# Benchmark suite offline: semua pipeline tanpa OpenAI key
+# ====================================
+# Tiap pipeline jalan di subprocess sendiri (peak RSS tidak tercampur),
+# LLM = FakeChatOpenAI, embeddings = HashEmbeddings, korpus sintetis.
+#
+#   python benchSuite.py --out base.json                 # simpan hasil
+#   python benchSuite.py --compare base.json             # bandingkan dengan commit lama
+#   python benchSuite.py rag_semantic --requests 200     # pipeline tertentu saja
+
+QUERIES = [
+    "apa penyebab HPA tidak melakukan scaling",
+    "kenapa checkout-svc timeout ke payment-svc",
+    "bagaimana mengatasi latency p95 di atas 3 detik",
+    "kenapa metrics server error",
+    "apa isi konfigurasi HorizontalPodAutoscaler",
+]
+ISSUES = [
+    "Docker compose service terus restart dengan exit code 137",
+    "Pod Kubernetes CrashLoopBackOff karena ImagePullBackOff",
+    "Latency API meningkat drastis setelah deploy versi baru",
+    "Kubernetes HPA tidak scaling meskipun CPU 200%",
+]
+
+
+def fake_llm(args, **kwargs):
+    latency = LatencyModel(
+        kind="lognormal",
+        median_s=args.llm_ms / 1000,
+        spread=args.llm_sigma,
+        prefill_s_per_token=2e-6,      # ~500k token/detik prefill
+        decode_s_per_token=1e-4,       # ~10k token/detik decode
+    )
+    return FakeChatOpenAI(latency=latency, seed=args.seed, **kwargs)
+
+
+# ---------- pipeline: setup (tidak diukur) -> fn(i) per request ----------
+def setup_rag_naive(args, corpus):
+    from chainRegistry import set_llm
+    from ragMin import bm25_retriever, build_index, load_doc, rag_answer, split_docs
+
+    llm = fake_llm(args)
+    set_llm(llm, model="gpt-4.1-mini", temperature=0.2)
+    index = build_index(split_docs(load_doc(corpus)))
+
+    def run(i):
+        query = QUERIES[i % len(QUERIES)]
+        return rag_answer("\n\n".join(bm25_retriever(index, query, k=3)), query)
+
+    return run, lambda: {"llm_calls": llm.calls}
+
+
+def setup_rag_semantic(args, corpus):
+    from chainRegistry import set_llm
+    from contextPacker import pack_context
+    from instrumentation import stage
+    from ragSemantic import ask_llm, create_vectorstore, load_and_split, retrieve
+
+    llm = fake_llm(args)
+    set_llm(llm, model="gpt-4.1-mini", temperature=0.2)
+    embeddings = HashEmbeddings()
+    vs = create_vectorstore(load_and_split(corpus), index=args.index, embeddings=embeddings)
+
+    def run(i):
+        query = QUERIES[i % len(QUERIES)]
+        docs = retrieve(vs, query, k=3)
+        with stage("pack", "context"):
+            packed = pack_context(docs, max_tokens=1500)
+        return ask_llm(packed.text, query)
+
+    return run, lambda: {"llm_calls": llm.calls, "embedded_texts": embeddings.texts}
+
+
+def setup_multi_step(args, corpus):
+    from multiStepPipeline import build_dag
+
+    llm = fake_llm(args, model="gpt-4.1-nano")
+    dag = build_dag(llm, structured=args.structured)
+
+    def run(i):
+        results, _ = asyncio.run(dag.run(issue=ISSUES[i % len(ISSUES)]))
+        return results["final"]
+
+    return run, lambda: {"llm_calls": llm.calls}
+
+
+def setup_schema_json(args, corpus):
+    from jsonOutput import build_chain
+
+    llm = fake_llm(args)
+    chain = build_chain(llm=llm, structured=args.structured)
+    return lambda i: chain.invoke({"topic": QUERIES[i % len(QUERIES)]}), lambda: {"llm_calls": llm.calls}
+
+
+def setup_schema_strict(args, corpus):
+    from schemaStrict import build_chain
+
+    llm = fake_llm(args)
+    chain = build_chain(llm=llm, structured=args.structured)
+    return lambda i: chain.invoke({"issue": ISSUES[i % len(ISSUES)]}), lambda: {"llm_calls": llm.calls}
+
+
+def setup_self_healing(args, corpus):
+    from selfHealing import DevOpsReport, HealMetrics, build_chain, safe_invoke
+
+    # jawaban pertama sebagian rusak; call perbaikan (tanpa schema di prompt)
+    # dijawab sesuai response_model
+    llm = fake_llm(args, malformed_rate=args.malformed_rate, response_model=DevOpsReport)
+    generate, llm_chain, parser = build_chain(llm=llm, structured=args.structured)
+    heal = HealMetrics()
+
+    def run(i):
+        return safe_invoke(generate, llm_chain, parser, ISSUES[i % len(ISSUES)], metrics=heal)
+
+    return run, lambda: {"llm_calls": llm.calls, **heal.summary()}
+
+
+def setup_task_d1(args, corpus):
+    from taskD1_latihan import build_chain
+
+    llm = fake_llm(args)
+    chain = build_chain(llm=llm, cache=None, structured=args.structured)
+    return lambda i: chain.invoke({"issue": ISSUES[i % len(ISSUES)]}), lambda: {"llm_calls": llm.calls}
+
+
+PIPELINES = {
+    "rag_naive": setup_rag_naive,
+    "rag_semantic": setup_rag_semantic,
+    "multi_step": setup_multi_step,
+    "schema_json": setup_schema_json,
+    "schema_strict": setup_schema_strict,
+    "self_healing": setup_self_healing,
+    "task_d1": setup_task_d1,
+}
+
+
+# ---------- child: satu pipeline, hasil JSON ke stdout ----------
+def percentiles_ms(latencies):
+    arr = np.asarray(latencies) * 1000
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "mean": round(float(arr.mean()), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def run_child(name, args):
+    start = time.perf_counter()
+    run, extra = PIPELINES[name](args, args.corpus)
+    setup_s = time.perf_counter() - start
+
+    for i in range(args.warmup):
+        run(i)
+
+    metrics, latencies, errors = Metrics(), [], 0
+    with instrument(metrics=metrics):
+        wall = time.perf_counter()
+        for i in range(args.requests):
+            t0 = time.perf_counter()
+            try:
+                run(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+        wall = time.perf_counter() - wall
+
+    return {
+        "requests": args.requests,
+        "errors": errors,
+        "setup_s": round(setup_s, 3),
+        "throughput_rps": round(args.requests / wall, 2),
+        "latency_ms": percentiles_ms(latencies),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": metrics.summary(),
+        "extra": extra(),
+    }
+
+
+# ---------- parent ----------
+def git_info():
+    def git(*cmd):
+        proc = subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True)
+        return proc.stdout.strip() if proc.returncode == 0 else None
+
+    return {"commit": git("rev-parse", "--short", "HEAD"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def child_argv(name, args):
+    argv = [sys.executable, __file__, name, "--child", "--corpus", args.corpus,
+            "--requests", str(args.requests), "--warmup", str(args.warmup),
+            "--llm-ms", str(args.llm_ms), "--llm-sigma", str(args.llm_sigma),
+            "--malformed-rate", str(args.malformed_rate), "--seed", str(args.seed)]
+    if args.index:
+        argv += ["--index", args.index]
+    if args.structured:
+        argv.append("--structured")
+    return argv
+
+
+def print_table(report, baseline=None):
+    base = (baseline or {}).get("pipelines", {})
+    print(f"{'pipeline':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'peak MB':>8} {'err':>4}")
+    for name, row in report["pipelines"].items():
+        if "error" in row:
+            print(f"{name:<14} gagal: {row['error']}")
+            continue
+        lat = row["latency_ms"]
+        print(f"{name:<14} {row['throughput_rps']:>9.1f} {lat['p50']:>9.2f} {lat['p95']:>9.2f} "
+              f"{lat['p99']:>9.2f} {row['peak_rss_mb']:>8.1f} {row['errors']:>4}")
+
+        old = base.get(name)
+        if old and "error" not in old:
+            def delta(new, prev):
+                return f"{(new - prev) / prev * 100:+.1f}%" if prev else "n/a"
+            print(f"{'  vs ' + str(baseline.get('commit')):<14} "
+                  f"{delta(row['throughput_rps'], old['throughput_rps']):>9} "
+                  + " ".join(f"{delta(lat[q], old['latency_ms'][q]):>9}" for q in ("p50", "p95", "p99"))
+                  + f" {delta(row['peak_rss_mb'], old['peak_rss_mb']):>8}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark offline semua pipeline")
+    ap.add_argument("pipelines", nargs="*", help=f"default semua: {', '.join(PIPELINES)}")
+    ap.add_argument("--requests", type=int, default=100)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--corpus-mb", type=float, default=2.0, help="ukuran korpus RAG sintetis")
+    ap.add_argument("--corpus", help=argparse.SUPPRESS)
+    ap.add_argument("--llm-ms", type=float, default=5.0, help="median latency LLM palsu")
+    ap.add_argument("--llm-sigma", type=float, default=0.5, help="sigma lognormal latency")
+    ap.add_argument("--malformed-rate", type=float, default=0.3, help="jawaban rusak di self_healing")
+    ap.add_argument("--index", help="index vectorstore rag_semantic (flat/ivf/hnsw/...)")
+    ap.add_argument("--structured", action="store_true", help="schema chain lewat with_structured_output")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="tulis hasil JSON ke file")
+    ap.add_argument("--compare", help="JSON hasil run sebelumnya")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    unknown = set(args.pipelines) - set(PIPELINES)
+    if unknown:
+        ap.error(f"pipeline tidak dikenal: {', '.join(sorted(unknown))}")
+
+    if args.child:
+        print(json.dumps(run_child(args.pipelines[0], args)))
+        return
+
+    names = args.pipelines or list(PIPELINES)
+    report = {
+        **git_info(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {k: getattr(args, k) for k in
+                   ("requests", "warmup", "corpus_mb", "llm_ms", "llm_sigma",
+                    "malformed_rate", "index", "structured", "seed")},
+        "pipelines": {},
+    }
+
+    fd, args.corpus = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        make_corpus(args.corpus, args.corpus_mb, seed=args.seed)
+        for name in names:
+            proc = subprocess.run(child_argv(name, args), capture_output=True, text=True)
+            if proc.returncode != 0:
+                tail = proc.stderr.strip().splitlines()[-1:] or [f"exit {proc.returncode}"]
+                report["pipelines"][name] = {"error": tail[0]}
+            else:
+                report["pipelines"][name] = json.loads(proc.stdout.strip().splitlines()[-1])
+    finally:
+        os.remove(args.corpus)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+
+    print(f"commit {report['commit']}{' (dirty)' if report['dirty'] else ''}, "
+          f"{args.requests} request/pipeline, LLM palsu median {args.llm_ms:g} ms, "
+          f"korpus {args.corpus_mb:g} MB\n")
+    print_table(report, baseline)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nhasil -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import random
+import sys
+import time
+import typing
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import PromptTemplate
+
+from benchStructured import count_tokens, sample_value, ROOT
+from structuredOutput import parser_chain
+from toonCompact import docs_to_toon, encode_output, encode_value, toon_chain, toon_inputs
+
+sys.path.append(str(ROOT / "example/day4"))
+
+from jsonOutput import Explanation
+from schemaStrict import DevOpsReport
+from multiStepPipeline import FinalDevOpsReport, STEP4_PROMPT
+from taskD1 import DevOpsTroubleshoot, TEMPLATE as TASK_TEMPLATE
+from jsonOutput_RagSemantic import HPADiagnosis, ASK_TEMPLATE
+from ragMin import RAG_TEMPLATE
+from streamSplit import stream_split
+
+
+# ====================================
+# JSON vs TOON: token prompt, token output, latency end-to-end
+# ====================================
+# Fake LLM: latency = prefill per token input + decode per token output,
+# jawaban mengikuti format yang diminta prompt (```toon atau JSON).
+
+PREFILL_S_PER_TOKEN = 0.0002
+DECODE_S_PER_TOKEN = 0.01       # ~100 token/detik
+RUNS = 3
+
+GENERIC_TEMPLATE = "{format_instructions}\n\nInput: {input}\n"
+TABLE_TEMPLATE = "Data:\n{table}\n\nTugas: {task}\n"
+FREE_TEXT = "HPA tidak scaling karena metrics-server belum terpasang dan resource requests kosong."
+
+
+class FakeFormatLLM(BaseChatModel):
+    response_model: typing.Any = None
+    last_tokens: dict = {}
+
+    @property
+    def _llm_type(self):
+        return "fake-format"
+
+    def _respond(self, messages):
+        prompt = "".join(m.content for m in messages)
+        if self.response_model is None:
+            content = FREE_TEXT
+        else:
+            data = self.response_model.model_validate(sample_value(self.response_model)).model_dump()
+            if "```toon" in prompt:
+                content = "```toon\n" + encode_output(data) + "\n```"
+            else:
+                content = "```json\n" + json.dumps(data, indent=2, ensure_ascii=False) + "\n```"
+
+        self.last_tokens = {"prompt": count_tokens(prompt), "output": count_tokens(content)}
+        delay = (self.last_tokens["prompt"] * PREFILL_S_PER_TOKEN
+                 + self.last_tokens["output"] * DECODE_S_PER_TOKEN)
+        return delay, ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, result = self._respond(messages)
+        time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, result = self._respond(messages)
+        await asyncio.sleep(delay)
+        return result
+
+
+# ========== DATA SKENARIO ==========
+def study_plan():
+    # sama dengan contoh day1/toon.py, diperbesar
+    priorities = ["high", "medium", "low"]
+    return [{"id": i, "name": f"Topik {i}", "priority": priorities[i % 3]} for i in range(1, 31)]
+
+
+def incidents(n=40, seed=0):
+    rnd = random.Random(seed)
+    services = ["api-gateway", "payment", "auth", "search", "worker"]
+    return [
+        {
+            "id": f"INC-{1000 + i}",
+            "service": rnd.choice(services),
+            "status": rnd.choice(["CrashLoopBackOff", "OOMKilled", "Running", "Pending"]),
+            "cpu_pct": round(rnd.uniform(5, 99), 1),
+            "mem_mb": rnd.randint(128, 4096),
+            "restarts": rnd.randint(0, 30),
+            "p95_ms": rnd.randint(40, 3000),
+        }
+        for i in range(n)
+    ]
+
+
+def top_chunks(k=5):
+    docs = list(stream_split(ROOT / "example/day5/sample_noise.txt"))
+    return docs[:k]
+
+
+def chunks_json(docs):
+    return json.dumps(
+        [{**d.metadata, "text": d.page_content} for d in docs], ensure_ascii=False
+    )
+
+
+def scenarios():
+    docs = top_chunks()
+    query = "apa penyebab HPA tidak melakukan scaling"
+    table_task = "Ringkas service yang paling bermasalah."
+
+    # (nama, template, schema, input JSON, input TOON)
+    return [
+        ("day1 toon study_plan", TABLE_TEMPLATE, None,
+         {"table": json.dumps(study_plan()), "task": table_task},
+         {"table": encode_value({"topics": study_plan()}), "task": table_task}),
+        ("day1 jsonOutput", GENERIC_TEMPLATE, Explanation,
+         {"input": "LangChain"}, {"input": "LangChain"}),
+        ("day2 schemaStrict", GENERIC_TEMPLATE, DevOpsReport,
+         {"input": "API latency naik setelah deploy"}, {"input": "API latency naik setelah deploy"}),
+        ("day3 step4", STEP4_PROMPT.template, FinalDevOpsReport,
+         {"classification": "issue_type: infra\nseverity: high", "root_cause": FREE_TEXT, "actions": "- cek HPA"},
+         {"classification": "issue_type: infra\nseverity: high", "root_cause": FREE_TEXT, "actions": "- cek HPA"}),
+        ("task incidents table", TASK_TEMPLATE, DevOpsTroubleshoot,
+         {"issue": json.dumps(incidents())},
+         {"issue": incidents()}),    # di-encode oleh stage toon_inputs
+        ("day4 ragMin chunks", RAG_TEMPLATE, None,
+         {"context": chunks_json(docs), "query": query},
+         {"context": docs_to_toon(docs), "query": query}),
+        ("day5 ask_llm", ASK_TEMPLATE, HPADiagnosis,
+         {"context": chunks_json(docs), "query": query},
+         {"context": docs_to_toon(docs), "query": query}),
+    ]
+
+
+def build(template, schema, toon):
+    prompt = PromptTemplate.from_template(template)
+    llm = FakeFormatLLM(response_model=schema)
+    if schema is None:
+        chain = prompt | llm
+    elif toon:
+        chain = toon_chain(prompt, llm, schema)
+    else:
+        chain = parser_chain(prompt, llm, schema)
+
+    if toon:
+        chain = toon_inputs(["issue"]) | chain
+    return chain, llm
+
+
+async def measure(template, schema, inputs, toon):
+    chain, llm = build(template, schema, toon)
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        result = await chain.ainvoke(inputs)
+    elapsed = (time.perf_counter() - start) / RUNS
+    return result, llm.last_tokens, elapsed
+
+
+def _pct(before, after):
+    return f"{(1 - after / before) * 100:>5.0f}%" if before else "    -"
+
+
+async def main():
+    print(f"Fake LLM: {PREFILL_S_PER_TOKEN * 1e6:.0f} us/token input, "
+          f"{DECODE_S_PER_TOKEN * 1000:.0f} ms/token output, {RUNS} run\n")
+    print(f"{'skenario':<22} {'in json':>8} {'in toon':>8} {'hemat':>6} "
+          f"{'out json':>9} {'out toon':>9} {'ms json':>8} {'ms toon':>8}")
+
+    totals = [0, 0, 0, 0]
+    for name, template, schema, json_inputs, toon_inputs_ in scenarios():
+        res_json, tok_json, ms_json = await measure(template, schema, json_inputs, toon=False)
+        res_toon, tok_toon, ms_toon = await measure(template, schema, toon_inputs_, toon=True)
+        if schema is not None:
+            assert res_json == res_toon, name   # hasil decode TOON == hasil JSON
+
+        totals = [a + b for a, b in zip(totals, (tok_json["prompt"], tok_toon["prompt"],
+                                                tok_json["output"], tok_toon["output"]))]
+        print(f"{name:<22} {tok_json['prompt']:>8} {tok_toon['prompt']:>8} "
+              f"{_pct(tok_json['prompt'], tok_toon['prompt']):>6} "
+              f"{tok_json['output']:>9} {tok_toon['output']:>9} "
+              f"{ms_json * 1000:>8.0f} {ms_toon * 1000:>8.0f}")
+
+    print(f"\ntotal token input  : {totals[0]} -> {totals[1]} ({_pct(totals[0], totals[1]).strip()} hemat)")
+    print(f"total token output : {totals[2]} -> {totals[3]} ({_pct(totals[2], totals[3]).strip()} hemat)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import weakref
+
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
+
+from streamingJson import StreamingJsonFieldParser
+from structuredOutput import structured_chain
+from toonCompact import toon_chain
+
+
+# ====================================
+# Registry: build sekali, pakai ulang
+# ====================================
+# - satu pasang httpx client (sync + async) per model -> connection pool &
+#   TLS session dipakai ulang antar request; pool async per event loop, karena
+#   koneksi async terikat ke loop yang membuatnya (asyncio.run() berulang)
+# - satu ChatOpenAI per (model, temperature)
+# - satu chain per (model, temperature, schema, template)
+
+_lock = threading.RLock()
+_http_clients = {}
+_llms = {}
+_chains = {}
+
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """AsyncClient yang meneruskan request ke pool milik event loop yang sedang jalan.
+
+    Loop yang sudah ditutup dibuang dari map (koneksinya ikut mati bersama loop).
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client_kwargs = kwargs
+        self._per_loop = weakref.WeakKeyDictionary()
+        self._loop_lock = threading.Lock()
+
+    def _current(self):
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            for stale in [l for l in self._per_loop if l.is_closed()]:
+                del self._per_loop[stale]
+            if loop not in self._per_loop:
+                self._per_loop[loop] = httpx.AsyncClient(**self._client_kwargs)
+            return self._per_loop[loop]
+
+    async def send(self, request, **kwargs):
+        return await self._current().send(request, **kwargs)
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            client = self._per_loop.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        await super().aclose()
+
+    def close_all(self):
+        """Tutup pool di loop yang masih hidup tapi tidak sedang jalan; sisanya dibuang."""
+        with self._loop_lock:
+            clients = list(self._per_loop.items())
+            self._per_loop.clear()
+        for loop, client in clients:
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.aclose())
+
+
+def get_http_clients(model):
+    with _lock:
+        if model not in _http_clients:
+            _http_clients[model] = (
+                httpx.Client(limits=POOL_LIMITS),
+                LoopLocalAsyncClient(limits=POOL_LIMITS),
+            )
+        return _http_clients[model]
+
+
+def get_llm(model="gpt-4.1-mini", temperature=0.2):
+    key = (model, temperature)
+    with _lock:
+        if key not in _llms:
+            http_client, http_async_client = get_http_clients(model)
+            _llms[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+        return _llms[key]
+
+
+def set_llm(llm, model="gpt-4.1-mini", temperature=0.2):
+    """Ganti llm untuk (model, temperature), mis. FakeChatOpenAI saat benchmark.
+
+    Chain lama yang dibangun di atas llm sebelumnya dibuang dari cache.
+    """
+    key = (model, temperature)
+    with _lock:
+        _llms[key] = llm
+        for chain_key in [k for k in _chains if k[:2] == key]:
+            del _chains[chain_key]
+
+
+def make_chain(template, schema=None, llm=None, streaming=False, structured=False, toon=False):
+    """`prompt | llm | parser` kalau ada schema, kalau tidak `prompt | llm`.
+
+    streaming=True  -> parser incremental untuk `chain.astream`.
+    structured=True -> schema lewat API (with_structured_output), tanpa
+                       format_instructions di prompt; fallback ke parser.
+    toon=True       -> schema ringkas + jawaban TOON; fallback ke JSON parser.
+    """
+    llm = llm or get_llm()
+
+    if schema is None:
+        return PromptTemplate.from_template(template) | llm
+
+    if structured:
+        return structured_chain(PromptTemplate.from_template(template), llm, schema)
+
+    if toon:
+        return toon_chain(PromptTemplate.from_template(template), llm, schema)
+
+    parser_cls = StreamingJsonFieldParser if streaming else JsonOutputParser
+    parser = parser_cls(pydantic_object=schema)
+    prompt = PromptTemplate.from_template(
+        template,
+        partial_variables={"format_instructions": parser.get_format_instructions()},
+    )
+    return prompt | llm | parser
+
+
+def get_chain(template, schema=None, model="gpt-4.1-mini", temperature=0.2,
+              streaming=False, structured=False, toon=False):
+    key = (model, temperature, schema, template, streaming, structured, toon)
+    with _lock:
+        if key not in _chains:
+            llm = get_llm(model, temperature)
+            _chains[key] = make_chain(template, schema, llm, streaming, structured, toon)
+        return _chains[key]
+
+
+def clear_registry():
+    with _lock:
+        for client, async_client in _http_clients.values():
+            client.close()
+            async_client.close_all()
+        _http_clients.clear()
+        _llms.clear()
+        _chains.clear()
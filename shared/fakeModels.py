@@ -0,0 +1,350 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_openai import ChatOpenAI
+
+
+# ====================================
+# Model palsu untuk benchmark & regression offline
+# ====================================
+# - FakeChatOpenAI : drop-in ChatOpenAI (tanpa network), latency dari distribusi
+#                    yang bisa diatur, jawaban scripted / otomatis dari schema
+# - HashEmbeddings : feature hashing kata + trigram -> vektor deterministik
+# - make_corpus    : korpus sintetis ukuran bebas dari teks ala sample_noise.txt
+
+SCHEMA_RE = re.compile(r"Here is the output schema:\s*```\s*(\{.*?\})\s*```", re.DOTALL)
+WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text):
+    # ~4 karakter/token (tanpa download encoding tiktoken)
+    return max(1, len(text) // 4)
+
+
+# ---------- latency ----------
+@dataclass
+class LatencyModel:
+    """fixed | uniform (median ± spread) | lognormal (sigma = spread),
+    ditambah prefill per token input dan decode per token output."""
+
+    kind: str = "fixed"
+    median_s: float = 0.0
+    spread: float = 0.5
+    prefill_s_per_token: float = 0.0
+    decode_s_per_token: float = 0.0
+
+    def sample(self, rng, prompt_tokens=0, completion_tokens=0):
+        if self.kind == "lognormal":
+            base = self.median_s * rng.lognormvariate(0, self.spread)
+        elif self.kind == "uniform":
+            base = self.median_s * rng.uniform(1 - self.spread, 1 + self.spread)
+        else:
+            base = self.median_s
+        return max(0.0, base + prompt_tokens * self.prefill_s_per_token
+                   + completion_tokens * self.decode_s_per_token)
+
+
+# ---------- jawaban JSON dari schema ----------
+def json_schema_of(schema):
+    """Pydantic class / response_format dict / JSON schema -> JSON schema dict."""
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema.model_json_schema()
+    if isinstance(schema, dict) and "json_schema" in schema:
+        return schema["json_schema"].get("schema", {})
+    return schema
+
+
+def sample_from_schema(schema, defs=None):
+    """Instance dummy yang lolos validasi untuk JSON schema `schema`."""
+    defs = schema.get("$defs", {}) if defs is None else defs
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    for key in ("allOf", "anyOf", "oneOf"):
+        if key in schema:
+            return sample_from_schema(schema[key][0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if kind == "object":
+        return {k: sample_from_schema(v, defs) for k, v in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {}), defs) for _ in range(3)]
+    return {"integer": 30, "number": 0.5, "boolean": True, "null": None}.get(kind, "contoh isi field")
+
+
+# korupsi yang biasa muncul dari model sungguhan; trailing_comma & missing_field
+# tidak bisa diperbaiki repair_locally -> butuh call perbaikan ke LLM
+def _fence(data, schema, rng):
+    return f"Berikut hasil analisanya:\n```json\n{json.dumps(data, indent=2)}\n```\nSemoga membantu."
+
+
+def _truncate(data, schema, rng):
+    return json.dumps(data).rstrip("}]")
+
+
+def _trailing_comma(data, schema, rng):
+    return json.dumps(data)[:-1] + ",}"
+
+
+def _enum_case(data, schema, rng):
+    for key, prop in schema.get("properties", {}).items():
+        if "enum" in prop and isinstance(data.get(key), str):
+            data[key] = data[key].upper()
+    return json.dumps(data)
+
+
+def _int_as_text(data, schema, rng):
+    for key, prop in schema.get("properties", {}).items():
+        if prop.get("type") == "integer" and key in data:
+            data[key] = f"sekitar {data[key]} menit"
+    return json.dumps(data)
+
+
+def _missing_field(data, schema, rng):
+    required = [k for k in schema.get("required", []) if k in data]
+    if required:
+        del data[rng.choice(required)]
+    return json.dumps(data)
+
+
+CORRUPTIONS = {
+    "fence": _fence,
+    "truncate": _truncate,
+    "trailing_comma": _trailing_comma,
+    "enum_case": _enum_case,
+    "int_as_text": _int_as_text,
+    "missing_field": _missing_field,
+}
+
+
+def json_response(schema, rng=None, malformed_rate=0.0, corruptions=None):
+    """JSON valid untuk `schema`; dengan peluang `malformed_rate` dirusak
+    memakai salah satu `corruptions` (nama di CORRUPTIONS)."""
+    schema = json_schema_of(schema)
+    data = sample_from_schema(schema)
+    rng = rng or random.Random(0)
+    if rng.random() >= malformed_rate:
+        return json.dumps(data, ensure_ascii=False)
+    name = rng.choice(corruptions or list(CORRUPTIONS))
+    return CORRUPTIONS[name](data, schema, rng)
+
+
+# ---------- chat model ----------
+class FakeChatOpenAI(ChatOpenAI):
+    """ChatOpenAI tanpa network.
+
+    responses:
+      None      -> otomatis: JSON dari response_format / schema di prompt
+                   (format_instructions) / response_model, selain itu teks
+      list      -> jawaban scripted, diputar berurutan (str atau callable)
+      dict      -> {substring prompt: jawaban}, tidak cocok -> otomatis
+      callable  -> fn(prompt_text) -> str
+    malformed_rate -> sebagian jawaban JSON otomatis dirusak (jalur selfHealing).
+    """
+
+    responses: Any = None
+    response_model: Any = None
+    latency: Any = None
+    malformed_rate: float = 0.0
+    corruptions: Any = None
+    reply_words: int = 60
+    seed: int = 0
+
+    _rng: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("api_key", "sk-offline")
+        kwargs.setdefault("model", "gpt-4.1-mini")
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self):
+        return "fake-openai-chat"
+
+    @property
+    def calls(self):
+        return self._calls
+
+    # ---------- isi jawaban ----------
+    def _auto(self, prompt, response_format):
+        schema = response_format or self.response_model
+        if schema is None:
+            match = SCHEMA_RE.search(prompt)
+            schema = json.loads(match.group(1)) if match else None
+
+        if schema is not None:
+            # structured output native (response_format) selalu valid
+            rate = 0.0 if response_format is not None else self.malformed_rate
+            return json_response(schema, self._rng, rate, self.corruptions)
+
+        words = WORD_RE.findall(prompt) or ["ok"]
+        return " ".join(self._rng.choice(words) for _ in range(self.reply_words))
+
+    def _content(self, prompt, response_format):
+        reply = None
+        if isinstance(self.responses, list):
+            reply = self.responses[self._calls % len(self.responses)]
+        elif isinstance(self.responses, dict):
+            reply = next((r for k, r in self.responses.items() if k in prompt), None)
+        elif callable(self.responses):
+            reply = self.responses
+
+        if reply is None:
+            return self._auto(prompt, response_format)
+        return reply(prompt) if callable(reply) else reply
+
+    def _respond(self, messages, kwargs):
+        prompt = "\n".join(m.content if isinstance(m.content, str) else str(m.content)
+                           for m in messages)
+        with self._lock:
+            content = self._content(prompt, kwargs.get("response_format"))
+            self._calls += 1
+            usage = {"prompt_tokens": estimate_tokens(prompt),
+                     "completion_tokens": estimate_tokens(content)}
+            delay = (self.latency or LatencyModel()).sample(
+                self._rng, usage["prompt_tokens"], usage["completion_tokens"])
+
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return delay, content, usage
+
+    def _result(self, content, usage):
+        message = AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": usage["prompt_tokens"],
+                            "output_tokens": usage["completion_tokens"],
+                            "total_tokens": usage["total_tokens"]},
+            response_metadata={"model_name": self.model_name},
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": usage, "model_name": self.model_name},
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, content, usage = self._respond(messages, kwargs)
+        time.sleep(delay)
+        return self._result(content, usage)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, content, usage = self._respond(messages, kwargs)
+        await asyncio.sleep(delay)
+        return self._result(content, usage)
+
+    # ---------- streaming: ~30% delay sebelum token pertama, sisanya merata ----------
+    @staticmethod
+    def _pieces(content, size=16):
+        return [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, content, _ = self._respond(messages, kwargs)
+        pieces = self._pieces(content)
+        time.sleep(delay * 0.3)
+        for piece in pieces:
+            time.sleep(delay * 0.7 / len(pieces))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, content, _ = self._respond(messages, kwargs)
+        pieces = self._pieces(content)
+        await asyncio.sleep(delay * 0.3)
+        for piece in pieces:
+            await asyncio.sleep(delay * 0.7 / len(pieces))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    def with_structured_output(self, schema, *, method="json_schema", **kwargs):
+        # meniru provider: schema dikirim di luar prompt, output di-parse sekali
+        return self.bind(response_format=schema) | RunnableLambda(
+            lambda msg: schema.model_validate_json(msg.content))
+
+
+# ---------- embeddings ----------
+class HashEmbeddings(Embeddings):
+    """Feature hashing kata + character trigram -> vektor ternormalisasi.
+
+    Deterministik (teks sama -> vektor sama) dan cukup lexical supaya
+    retrieval tetap bermakna; latency per call bisa disimulasikan.
+    """
+
+    def __init__(self, dim=256, latency_s=0.0, per_text_s=0.0):
+        self.dim = dim
+        self.latency_s = latency_s
+        self.per_text_s = per_text_s
+        self.calls = 0
+        self.texts = 0
+
+    def _vec(self, text):
+        v = np.zeros(self.dim, dtype=np.float32)
+        t = text.lower()
+        for word in WORD_RE.findall(t):
+            v[zlib.crc32(word.encode()) % self.dim] += 2.0
+        t = f"  {t}  "
+        for i in range(len(t) - 2):
+            v[zlib.crc32(t[i:i + 3].encode()) % self.dim] += 1.0
+        return (v / (np.linalg.norm(v) or 1.0)).tolist()
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        self.texts += len(texts)
+        time.sleep(self.latency_s + self.per_text_s * len(texts))
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+# ---------- korpus sintetis ----------
+SERVICES = ["checkout-svc", "payment-svc", "api-gateway", "order-svc", "auth-svc",
+            "inventory-svc", "search-svc", "notif-svc"]
+SOURCE = Path(__file__).resolve().parent.parent / "example" / "day5" / "sample_noise.txt"
+
+
+def make_corpus(path, size_mb=1.0, src=SOURCE, seed=0):
+    """Tulis ~size_mb MB catatan insiden ke `path`: baris & section dari `src`
+    diacak, angka dan nama service diganti supaya tiap chunk berbeda."""
+    rng = random.Random(seed)
+    sections = [s.strip() for s in re.split(r"\n\s*\n", Path(src).read_text(encoding="utf-8"))
+                if s.strip()]
+    lines = [line for s in sections for line in s.splitlines() if line.strip()]
+    svc_re = re.compile("|".join(map(re.escape, SERVICES)))
+
+    def mutate(text):
+        text = svc_re.sub(lambda _: rng.choice(SERVICES), text)
+        return re.sub(r"\d+", lambda m: str(rng.randint(1, 10 ** len(m.group()) - 1)), text)
+
+    target, written, i = int(size_mb * 1024**2), 0, 0
+    with open(path, "w", encoding="utf-8") as out:
+        while written < target:
+            parts = [f"==== CATATAN INSIDEN {i} ===="]
+            parts += [mutate(s) for s in rng.sample(sections, k=min(3, len(sections)))]
+            parts.append("\n".join(mutate(line) for line in rng.sample(lines, k=min(6, len(lines)))))
+            block = "\n\n".join(parts) + "\n\n"
+            out.write(block)
+            written += len(block.encode("utf-8"))
+            i += 1
+    return path
@@ -0,0 +1,354 @@
+import json
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+
+# ====================================
+# Instrumentation: latency, token & cost per stage
+# ====================================
+# with instrument(trace_path="traces.jsonl") as rec:
+#     chain.invoke(...)              # prompt / llm / parser / retriever tercatat otomatis
+#     with stage("validate"): ...    # kode di luar runnable
+#     count("heals", kind="llm")
+# rec.metrics.to_prometheus()        # histogram ala Prometheus (textfile collector)
+
+# detik; p99 LLM biasanya di 1-10s, prompt/parse di bawah 10ms
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# USD per 1M token (input, output); update kalau harga berubah
+MODEL_PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "text-embedding-3-small": (0.02, 0.0),
+}
+
+RUN_TYPE_STAGES = {"prompt": "prompt", "parser": "parse", "retriever": "retrieval"}
+
+
+def token_cost(model, prompt_tokens, completion_tokens):
+    # "gpt-4.1-mini-2025-04-14" -> harga "gpt-4.1-mini" (prefix terpanjang)
+    matches = [m for m in MODEL_PRICES if model and model.startswith(m)]
+    if not matches:
+        return 0.0
+    price_in, price_out = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+# ========== METRICS ==========
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS, keep=10000):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)       # + bucket +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.samples = deque(maxlen=keep)           # untuk p50/p99 di summary()
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.samples.append(value)
+
+    def quantile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Metrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}     # (name, labels) -> Histogram
+        self.counters = {}       # (name, labels) -> float
+        self._lock = threading.Lock()
+
+    def observe(self, metric, value, **labels):
+        key = (metric, _labels(labels))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(self.buckets)
+            self.histograms[key].observe(value)
+
+    def inc(self, metric, value=1, **labels):
+        key = (metric, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_prometheus(self, prefix="llm_"):
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for (n, labels), h in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, c in zip(list(h.buckets) + ["+Inf"], h.counts):
+                        cumulative += c
+                        lines.append(f"{prefix}{name}_bucket"
+                                     f"{_format_labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{prefix}{name}_sum{_format_labels(labels)} {h.sum:.6f}")
+                    lines.append(f"{prefix}{name}_count{_format_labels(labels)} {h.count}")
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for (n, labels), v in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{prefix}{name}{_format_labels(labels)} {v:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix="llm_"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
+
+    def summary(self, metric="stage_seconds"):
+        """{stage/name: count, mean, p50, p99} untuk histogram `metric`."""
+        out = {}
+        with self._lock:
+            for (n, labels), h in sorted(self.histograms.items()):
+                if n != metric:
+                    continue
+                key = "/".join(v for _, v in labels)
+                out[key] = {
+                    "count": h.count,
+                    "mean_ms": round(h.sum / h.count * 1000, 2),
+                    "p50_ms": round(h.quantile(0.5) * 1000, 2),
+                    "p99_ms": round(h.quantile(0.99) * 1000, 2),
+                }
+        return out
+
+    def counter_totals(self):
+        with self._lock:
+            return {f"{n}{_format_labels(labels)}": v for (n, labels), v in sorted(self.counters.items())}
+
+
+METRICS = Metrics()
+
+
+class JsonlTraceWriter:
+    """Satu span per baris: gampang di-grep / di-load ke pandas / dikirim ke log pipeline."""
+
+    def __init__(self, path):
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+# ========== CALLBACK HANDLER ==========
+class InstrumentationHandler(BaseCallbackHandler):
+    run_inline = True            # jalan di thread yang sama -> timing tidak tergeser
+
+    def __init__(self, metrics=METRICS, trace=None, trace_id=None):
+        self.metrics = metrics
+        self.trace = trace
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self._runs = {}          # run_id -> (stage, name, parent_run_id, start_wall, start)
+        self._lock = threading.Lock()
+
+    # ---------- span ----------
+    def start_span(self, run_id, stage, name, parent_run_id=None, tags=None):
+        with self._lock:
+            self._runs[run_id] = (stage, name, parent_run_id, time.time(), time.perf_counter())
+        # Runnable.with_retry menandai attempt ke-2 dst dengan tag "retry:attempt:N"
+        if tags and any(t.startswith("retry:attempt:") for t in tags):
+            self.count("retries_total", stage=stage, name=name)
+
+    def end_span(self, run_id, error=None, **fields):
+        end = time.perf_counter()
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        stage, name, parent_run_id, start_wall, start = run
+        elapsed = end - start
+
+        self.metrics.observe("stage_seconds", elapsed, stage=stage, name=name)
+        if error is not None:
+            self.metrics.inc("stage_errors_total", stage=stage, name=name)
+        if self.trace is not None:
+            self.trace.write({
+                "trace_id": self.trace_id,
+                "run_id": str(run_id),
+                "parent_run_id": str(parent_run_id) if parent_run_id else None,
+                "stage": stage,
+                "name": name,
+                "start": round(start_wall, 6),
+                "duration_ms": round(elapsed * 1000, 3),
+                "error": repr(error) if error is not None else None,
+                **fields,
+            })
+
+    def count(self, metric, value=1, **labels):
+        self.metrics.inc(metric, value, **labels)
+        if self.trace is not None:
+            self.trace.write({"trace_id": self.trace_id, "counter": metric,
+                              "value": value, "start": round(time.time(), 6), **labels})
+
+    # ---------- chain / prompt / parser ----------
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, **kwargs):
+        name = kwargs.get("name") or _serialized_name(serialized)
+        stage = RUN_TYPE_STAGES.get(kwargs.get("run_type"), "chain")
+        self.start_span(run_id, stage, name, parent_run_id, tags)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self.end_span(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self.end_span(run_id, error=error)
+
+    # ---------- llm ----------
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None,
+                            **kwargs):
+        self.start_span(run_id, "llm", _model_name(serialized, kwargs), parent_run_id, tags)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, tags=None, **kwargs):
+        self.start_span(run_id, "llm", _model_name(serialized, kwargs), parent_run_id, tags)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.get(run_id)
+        model = run[1] if run else None
+        prompt_tokens, completion_tokens = _token_usage(response)
+        cost = token_cost(model, prompt_tokens, completion_tokens)
+
+        self.metrics.inc("tokens_total", prompt_tokens, model=model, type="prompt")
+        self.metrics.inc("tokens_total", completion_tokens, model=model, type="completion")
+        self.metrics.inc("cost_usd_total", cost, model=model)
+        self.end_span(run_id, prompt_tokens=prompt_tokens,
+                      completion_tokens=completion_tokens, cost_usd=round(cost, 8))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self.end_span(run_id, error=error)
+
+    # ---------- retriever ----------
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, tags=None,
+                           **kwargs):
+        name = kwargs.get("name") or _serialized_name(serialized)
+        self.start_span(run_id, "retrieval", name, parent_run_id, tags)
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        self.end_span(run_id, documents=len(documents))
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        self.end_span(run_id, error=error)
+
+    # ---------- retry yang dilaporkan lewat callback ----------
+    def on_retry(self, retry_state, *, run_id, **kwargs):
+        with self._lock:
+            run = self._runs.get(run_id)
+        self.count("retries_total", stage=run[0] if run else None, name=run[1] if run else None)
+
+
+def _serialized_name(serialized):
+    if not serialized:
+        return "unknown"
+    return serialized.get("name") or (serialized.get("id") or ["unknown"])[-1]
+
+
+def _model_name(serialized, kwargs):
+    params = kwargs.get("invocation_params") or {}
+    metadata = kwargs.get("metadata") or {}
+    return (params.get("model_name") or params.get("model")
+            or metadata.get("ls_model_name") or _serialized_name(serialized))
+
+
+def _token_usage(response):
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+    # streaming / model lain: usage_metadata di AIMessage
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for g in generations:
+            meta = getattr(getattr(g, "message", None), "usage_metadata", None) or {}
+            prompt_tokens += meta.get("input_tokens", 0)
+            completion_tokens += meta.get("output_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+# ========== CONTEXT MANAGER ==========
+_handler_var = ContextVar("instrumentation_handler", default=None)
+# handler di context var otomatis ditambahkan ke callbacks setiap runnable
+# (mekanisme yang sama dengan get_openai_callback)
+register_configure_hook(_handler_var, True)
+
+
+@contextmanager
+def instrument(metrics=METRICS, trace_path=None, prom_path=None, trace_id=None):
+    """trace_path -> span JSONL; prom_path -> file histogram Prometheus saat keluar."""
+    trace = JsonlTraceWriter(trace_path) if trace_path else None
+    handler = InstrumentationHandler(metrics, trace, trace_id)
+    token = _handler_var.set(handler)
+    try:
+        yield handler
+    finally:
+        _handler_var.reset(token)
+        if trace is not None:
+            trace.close()
+        if prom_path:
+            metrics.write_prometheus(prom_path)
+
+
+@contextmanager
+def stage(name, label=None):
+    """Timing manual untuk kode di luar runnable (validate, repair, hybrid
+    retrieval, ...). Tanpa instrument() aktif -> no-op."""
+    handler = _handler_var.get()
+    if handler is None:
+        yield
+        return
+
+    run_id = uuid.uuid4()
+    handler.start_span(run_id, name, label or name)
+    try:
+        yield
+    except BaseException as e:
+        handler.end_span(run_id, error=e)
+        raise
+    handler.end_span(run_id)
+
+
+def count(metric, value=1, **labels):
+    handler = _handler_var.get()
+    if handler is not None:
+        handler.count(metric, value, **labels)
+
+
+def print_stage_report(metrics=METRICS):
+    print(f"{'stage':<10} {'name':<28} {'count':>6} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for key, row in metrics.summary().items():
+        name, _, stage_name = key.rpartition("/")
+        print(f"{stage_name:<10} {name:<28} {row['count']:>6} {row['mean_ms']:>9.2f} "
+              f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+    for key, value in metrics.counter_totals().items():
+        print(f"{key} = {value:g}")
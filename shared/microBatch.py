@@ -0,0 +1,200 @@
+import asyncio
+import copy
+import json
+
+from pydantic import ValidationError
+from langchain_core.prompts import PromptTemplate
+from langchain_core.utils.json import parse_json_markdown
+
+
+# ====================================
+# Micro-batching: request bersamaan -> satu call LLM
+# ====================================
+# Request dikumpulkan selama `max_wait_s` (atau sampai `max_batch` item),
+# lalu dikirim sebagai satu prompt yang meminta JSON array, satu object per
+# item dengan field "index". Hasil dipecah & divalidasi per item; item yang
+# hilang / tidak valid (atau seluruh batch kalau call gagal) diulang lewat
+# chain satuan. format_instructions hanya dikirim sekali per batch.
+
+BATCH_FORMAT_INSTRUCTIONS = """Jawab HANYA dengan JSON array, satu object per item, urutan bebas.
+Setiap object WAJIB punya field "index" (nomor [n] item di daftar) dan field lain sesuai JSON schema berikut:
+```
+{schema}
+```"""
+
+
+def batch_format_instructions(schema):
+    props = schema.model_json_schema()
+    props.pop("title", None)
+    return BATCH_FORMAT_INSTRUCTIONS.format(schema=json.dumps(props, ensure_ascii=False))
+
+
+def split_batch(raw, schema, n):
+    """JSON array -> {index: dict tervalidasi}; item rusak / di luar range dilewati."""
+    try:
+        data = parse_json_markdown(raw)
+    except (ValueError, TypeError):
+        return {}
+    if isinstance(data, dict):          # model kadang membungkus: {"results": [...]}
+        data = next((v for v in data.values() if isinstance(v, list)), [])
+    if not isinstance(data, list):
+        return {}
+
+    results = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", None)
+        if not isinstance(index, int) or not 0 <= index < n or index in results:
+            continue
+        try:
+            results[index] = schema.model_validate(item).model_dump()
+        except ValidationError:
+            continue
+    return results
+
+
+class MicroBatcher:
+    """`await batcher.submit(inputs)` -> hasil untuk satu item.
+
+    single_chain : chain satuan (`prompt | llm | parser`) untuk fallback
+    render_item  : inputs -> teks satu item di prompt batch
+    key_fn       : inputs -> key; request dengan key sama yang masih antre /
+                   diproses digabung, dan key dipakai untuk `cache` (exact tier)
+    """
+
+    def __init__(self, llm, schema, batch_template, single_chain, render_item,
+                 max_batch=16, max_wait_s=0.02, max_concurrency=4, key_fn=None, cache=None):
+        self.schema = schema
+        self.single_chain = single_chain
+        self.render_item = render_item
+        self.key_fn = key_fn
+        self.cache = cache
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_s
+        self.max_concurrency = max_concurrency
+
+        prompt = PromptTemplate.from_template(batch_template).partial(
+            format_instructions=batch_format_instructions(schema)
+        )
+        self.batch_chain = prompt | llm
+        self._pending = []          # [(inputs, future, key)]
+        self._inflight = {}         # key -> future
+        self._timer = None
+        self._slots = None
+        self._tasks = set()
+
+        self.batches = 0
+        self.batched_items = 0
+        self.fallback_items = 0
+        self.cache_hits = 0
+        self.deduped = 0
+
+    async def submit(self, inputs):
+        key = self.key_fn(inputs) if self.key_fn is not None else None
+        if key is not None:
+            if self.cache is not None:
+                hit = self.cache.get_exact(key)
+                if hit is not None:
+                    self.cache_hits += 1
+                    return hit
+            if key in self._inflight:
+                self.deduped += 1
+                return copy.deepcopy(await asyncio.shield(self._inflight[key]))
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if key is not None:
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        self._pending.append((inputs, future, key))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_s, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_s, self._flush)
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        error = None
+        try:
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.max_concurrency)
+            async with self._slots:
+                results = await self._call_batch(batch) if len(batch) > 1 else {}
+
+            for i, (_, future, key) in enumerate(batch):
+                if i in results and not future.done():
+                    if self.cache is not None and key is not None:
+                        self.cache.record_miss()
+                        self.cache.put(key, copy.deepcopy(results[i]))
+                    future.set_result(results[i])
+
+            # item yang tidak terjawab / tidak valid -> call satuan, paralel
+            missing = [(inputs, future) for i, (inputs, future, _) in enumerate(batch) if i not in results]
+            self.fallback_items += len(missing) if len(batch) > 1 else 0
+            await asyncio.gather(*(self._run_single(inputs, future) for inputs, future in missing))
+        except Exception as e:
+            error = e
+        finally:
+            # apa pun yang gagal di atas, tidak ada request yang menunggu selamanya
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error or RuntimeError("micro-batch berhenti tanpa hasil"))
+
+    async def _call_batch(self, batch):
+        # item yang gagal di-render tidak ikut prompt -> nanti lewat call satuan
+        lines = []
+        for i, (inputs, _, _) in enumerate(batch):
+            try:
+                lines.append(f"[{i}] {self.render_item(inputs)}")
+            except Exception:
+                continue
+        if len(lines) < 2:
+            return {}
+
+        self.batches += 1
+        try:
+            message = await self.batch_chain.ainvoke({"items": "\n".join(lines)})
+        except Exception:
+            return {}
+        rendered = {int(line[1:line.index("]")]) for line in lines}
+        results = {i: r for i, r in split_batch(message.content, self.schema, len(batch)).items()
+                   if i in rendered}
+        self.batched_items += len(results)
+        return results
+
+    async def _run_single(self, inputs, future):
+        try:
+            async with self._slots:
+                result = await self.single_chain.ainvoke(inputs)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "fallback_items": self.fallback_items,
+            "items_per_batch": self.batched_items / self.batches if self.batches else 0.0,
+            "cache_hits": self.cache_hits,
+            "deduped": self.deduped,
+        }
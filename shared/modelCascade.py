@@ -0,0 +1,208 @@
+import threading
+import time
+
+from pydantic import ValidationError
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableLambda
+
+from chainRegistry import get_llm
+from instrumentation import METRICS, Histogram
+
+
+# ====================================
+# Model cascade: model termurah dulu, naik tier hanya kalau perlu
+# ====================================
+# Eskalasi ke tier berikutnya kalau:
+# - validation : output gagal parse / ValidationError terhadap schema
+# - confidence : heuristic_confidence(hasil) < min_confidence (atau accept() False)
+# - retrieval  : skor retrieval teratas < min_retrieval_score -> tier termurah
+#                dilewati (konteks lemah tidak bisa ditebus model kecil)
+# Error lain (rate limit, timeout, auth) TIDAK eskalasi -> langsung diteruskan,
+# supaya gangguan provider tidak ditagih ke tier yang lebih mahal. Aktifkan
+# `escalate_on_error=True` kalau memang mau.
+# Per tier tercatat per router: attempt, hasil per outcome, latency -> hit rate
+# untuk tuning threshold (juga ikut ke export Prometheus lewat Metrics).
+
+DEFAULT_TIERS = ("gpt-4.1-nano", "gpt-4.1-mini", "gpt-4.1")
+
+# frasa yang menandakan model menebak / menyerah
+HEDGES = (
+    "tidak tahu", "tidak yakin", "tidak ada informasi", "tidak disebutkan",
+    "tidak dapat ditentukan", "i don't know", "not sure", "unknown", "n/a",
+)
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _strings(v)
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            yield ""                    # list kosong (mis. possible_fixes) dihitung kosong
+        for v in value:
+            yield from _strings(v)
+    elif hasattr(value, "content"):     # AIMessage
+        yield from _strings(value.content)
+    elif hasattr(value, "model_dump"):
+        yield from _strings(value.model_dump())
+
+
+def heuristic_confidence(result, min_chars=20):
+    """0..1: porsi field teks yang terisi; ada frasa ragu -> dipotong setengah."""
+    texts = list(_strings(result))
+    if not texts or sum(len(t.strip()) for t in texts) < min_chars:
+        return 0.0
+    filled = sum(bool(t.strip()) for t in texts) / len(texts)
+    hedged = any(h in t.lower() for t in texts for h in HEDGES)
+    return filled * (0.5 if hedged else 1.0)
+
+
+class Escalate(Exception):
+    def __init__(self, reason, result=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.result = result
+
+
+class CascadeRouter:
+    """`router.run(lambda llm: ..., schema=..., retrieval_score=...)`.
+
+    tiers       : nama model, termurah/tercepat dulu
+    llm_factory : (model, temperature) -> llm; default registry (pool HTTP dipakai ulang)
+    escalate_on_error : error selain validation (rate limit, timeout, ...) ikut eskalasi
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, temperature=0.1, llm_factory=get_llm,
+                 min_confidence=0.7, min_retrieval_score=0.35, metrics=METRICS,
+                 escalate_on_error=False):
+        self.tiers = list(tiers)
+        self.temperature = temperature
+        self.llm_factory = llm_factory
+        self.min_confidence = min_confidence
+        self.min_retrieval_score = min_retrieval_score
+        self.metrics = metrics
+        self.escalate_on_error = escalate_on_error
+
+        self._lock = threading.Lock()
+        self._chains = {}
+        self.requests = 0
+        # counter lokal: `metrics` bisa dipakai bersama banyak router (default METRICS global)
+        self._outcomes = {model: {} for model in self.tiers}
+        self._latency = {model: Histogram() for model in self.tiers}
+
+    def llm(self, tier):
+        return self.llm_factory(model=self.tiers[tier], temperature=self.temperature)
+
+    def _record(self, tier, outcome, elapsed=None):
+        model = self.tiers[tier]
+        with self._lock:
+            outcomes = self._outcomes[model]
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if elapsed is not None:
+                self._latency[model].observe(elapsed)
+        self.metrics.inc("cascade_attempts_total", tier=model, outcome=outcome)
+        if elapsed is not None:
+            self.metrics.observe("cascade_seconds", elapsed, tier=model)
+
+    def _check(self, result, schema, accept):
+        if schema is not None:
+            data = result.model_dump() if hasattr(result, "model_dump") else result
+            schema.model_validate(data)        # ValidationError -> eskalasi
+        ok = accept(result) if accept is not None else (
+            heuristic_confidence(result) >= self.min_confidence)
+        if not ok:
+            raise Escalate("confidence", result)
+
+    def start_tier(self, retrieval_score=None):
+        if retrieval_score is not None and retrieval_score < self.min_retrieval_score:
+            return min(1, len(self.tiers) - 1)
+        return 0
+
+    def run(self, call, schema=None, accept=None, retrieval_score=None):
+        """call(llm) -> hasil. Tier terakhir: ValidationError diteruskan, confidence
+        rendah tetap dikembalikan (tidak ada tier lagi). Error lain langsung
+        diteruskan dari tier mana pun, kecuali `escalate_on_error`."""
+        with self._lock:
+            self.requests += 1
+
+        start = self.start_tier(retrieval_score)
+        for tier in range(start):
+            self._record(tier, "skipped_retrieval")
+
+        for tier in range(start, len(self.tiers)):
+            last = tier == len(self.tiers) - 1
+            t0 = time.perf_counter()
+            try:
+                result = call(self.llm(tier))
+                self._check(result, schema, accept)
+            except Escalate as e:
+                self._record(tier, "low_confidence", time.perf_counter() - t0)
+                if last:
+                    return e.result
+                continue
+            except (ValidationError, OutputParserException):
+                self._record(tier, "validation", time.perf_counter() - t0)
+                if last:
+                    raise
+                continue
+            except Exception:
+                self._record(tier, "error", time.perf_counter() - t0)
+                if last or not self.escalate_on_error:
+                    raise
+                continue
+
+            self._record(tier, "accepted", time.perf_counter() - t0)
+            return result
+
+    def as_chain(self, build, schema=None, accept=None):
+        """Runnable pengganti chain biasa; build(llm) -> chain, dibangun sekali per tier."""
+        def chain_for(llm):
+            key = id(llm)
+            with self._lock:
+                if key not in self._chains:
+                    self._chains[key] = (llm, build(llm))
+                return self._chains[key][1]
+
+        def invoke(inputs, config=None):
+            return self.run(lambda llm: chain_for(llm).invoke(inputs, config),
+                            schema=schema, accept=accept)
+
+        return RunnableLambda(invoke, name="cascade_chain")
+
+    # ---------- laporan ----------
+    def tier_stats(self):
+        """Statistik router ini saja (bukan gabungan semua router di `metrics`)."""
+        with self._lock:
+            requests = self.requests
+            counts = {model: dict(outcomes) for model, outcomes in self._outcomes.items()}
+            latency = {model: (h.count, h.quantile(0.5), h.quantile(0.99))
+                       for model, h in self._latency.items()}
+
+        stats = {}
+        for model in self.tiers:
+            outcomes = counts[model]
+            attempts = sum(v for k, v in outcomes.items() if k != "skipped_retrieval")
+            accepted = outcomes.get("accepted", 0)
+            n, p50, p99 = latency[model]
+            stats[model] = {
+                "attempts": attempts,
+                "accepted": accepted,
+                "hit_rate": accepted / attempts if attempts else 0.0,
+                "served_share": accepted / requests if requests else 0.0,
+                "escalated": {k: v for k, v in outcomes.items() if k != "accepted"},
+                "p50_ms": round(p50 * 1000, 2) if n else None,
+                "p99_ms": round(p99 * 1000, 2) if n else None,
+            }
+        return stats
+
+
+def print_cascade_report(router):
+    print(f"{'tier':<14} {'attempts':>8} {'accepted':>8} {'hit rate':>9} {'served':>7} "
+          f"{'p50 ms':>8} {'p99 ms':>8}  escalated")
+    for model, row in router.tier_stats().items():
+        escalated = ", ".join(f"{k}={v}" for k, v in sorted(row["escalated"].items())) or "-"
+        print(f"{model:<14} {row['attempts']:>8} {row['accepted']:>8} {row['hit_rate']:>9.0%} "
+              f"{row['served_share']:>7.0%} {row['p50_ms'] or 0:>8.1f} {row['p99_ms'] or 0:>8.1f}  "
+              f"{escalated}")
@@ -0,0 +1,283 @@
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.runnables import RunnableLambda, RunnableSequence
+
+
+# ====================================
+# Response cache untuk `prompt | llm | parser`
+# ====================================
+# Tier 1 (exact): key = sha256(model, temperature, prompt yang sudah di-render)
+# Tier 2 (semantic, opsional): pakai jawaban yang sudah ada kalau embedding
+#   issue baru cukup mirip (cosine >= threshold) dengan issue yang di-cache
+# Dibatasi jumlah entry (max_entries) dan byte (max_bytes, ukuran value yang
+# di-serialize + vector); evict LRU sampai dua-duanya masuk budget.
+# Miss bersamaan untuk key yang sama digabung: hanya satu call LLM, sisanya
+# menunggu hasilnya (in-flight coalescing).
+
+
+def value_size(value):
+    """Perkiraan byte value = panjang JSON-nya (pydantic / AIMessage -> model_dump_json)."""
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json().encode("utf-8"))
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class ResponseCache:
+    def __init__(self, max_entries=1024, ttl_s=3600, embeddings=None,
+                 similarity_threshold=0.95, max_bytes=64 * 1024**2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        # key -> (expires_at, namespace, vector, value, size)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._flights = {}          # key -> _Flight (invoke sync)
+        self._aflights = {}         # key -> asyncio.Future (ainvoke)
+
+    @staticmethod
+    def make_key(model, temperature, rendered_prompt):
+        raw = f"{model}\x00{temperature}\x00{rendered_prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _expired(self, entry, now):
+        return entry[0] < now
+
+    def get_exact(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, now):
+                del self._entries[key]
+                self._size -= entry[4]
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return copy.deepcopy(entry[3])
+
+    def get_semantic(self, namespace, vector):
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                (k, e[2]) for k, e in self._entries.items()
+                if e[1] == namespace and e[2] is not None and not self._expired(e, now)
+            ]
+            if not candidates:
+                return None
+
+            matrix = np.stack([v for _, v in candidates])
+            sims = matrix @ vector
+            best = int(np.argmax(sims))
+            if sims[best] < self.similarity_threshold:
+                return None
+
+            key = candidates[best][0]
+            self._entries.move_to_end(key)
+            self.semantic_hits += 1
+            return copy.deepcopy(self._entries[key][3])
+
+    def put(self, key, value, namespace=None, vector=None):
+        size = value_size(value) + (vector.nbytes if vector is not None else 0)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[4]
+            self._entries[key] = (time.monotonic() + self.ttl_s, namespace, vector, value, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted[4]
+                self.evictions += 1
+
+    # ---------- in-flight coalescing ----------
+    def coalesce(self, key, compute):
+        """Miss sync: thread pertama menjalankan compute(), thread lain dengan key sama menunggu."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            result = compute()
+            flight.result = copy.deepcopy(result)   # caller boleh mengubah `result`
+            return result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def acoalesce(self, key, compute):
+        """Versi async: compute() -> coroutine, dijalankan sekali per key yang sedang in-flight."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._aflights.get(key)
+            # future milik loop lain (asyncio.run() terpisah) tidak bisa di-await
+            leader = future is None or future.get_loop() is not loop
+            if leader:
+                future = self._aflights[key] = loop.create_future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return copy.deepcopy(await asyncio.shield(future))
+
+        try:
+            result = await compute()
+            future.set_result(copy.deepcopy(result))
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()      # sudah diteruskan ke caller; jangan warning "never retrieved"
+            raise
+        finally:
+            if not future.done():   # leader di-cancel -> yang menunggu ikut berhenti
+                future.cancel()
+            with self._lock:
+                if self._aflights.get(key) is future:
+                    del self._aflights[key]
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        hits = self.exact_hits + self.semantic_hits + self.coalesced
+        lookups = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+def _normalize(vector):
+    v = np.asarray(vector, dtype=np.float32)
+    return v / (np.linalg.norm(v) or 1.0)
+
+
+def _chain_parts(chain):
+    # -> (prompt, tail, model, temperature); tail None = chain dipanggil utuh
+    if isinstance(chain, RunnableSequence):
+        prompt, llm, *rest = chain.steps
+        tail = RunnableSequence(llm, *rest) if rest else llm
+    else:
+        prompt, llm, *_ = chain.runnable.steps   # RunnableWithFallbacks
+        tail = None
+
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", type(llm).__name__)
+    return prompt, tail, model, getattr(llm, "temperature", None)
+
+
+def exact_key_fn(chain):
+    """inputs -> key exact tier yang sama dengan with_response_cache(chain, ...)."""
+    prompt, _, model, temperature = _chain_parts(chain)
+    return lambda inputs: ResponseCache.make_key(model, temperature, prompt.invoke(inputs).to_string())
+
+
+def with_response_cache(chain, cache, semantic_field="issue"):
+    """Bungkus `prompt | llm | parser` dengan `cache`.
+
+    Prompt di-render sekali; hasil render dipakai sebagai key dan langsung
+    diteruskan ke `llm | parser` kalau cache miss. Chain lain (mis. structured
+    output dengan fallback) dipanggil utuh saat miss. Miss bersamaan untuk key
+    yang sama hanya memanggil LLM sekali.
+    """
+    prompt, tail, model, temperature = _chain_parts(chain)
+    namespace = ResponseCache.make_key(model, temperature, getattr(prompt, "template", ""))
+    use_semantic = cache.embeddings is not None and semantic_field is not None
+
+    def lookup(inputs):
+        prompt_value = prompt.invoke(inputs)
+        key = cache.make_key(model, temperature, prompt_value.to_string())
+        return prompt_value, key, cache.get_exact(key)
+
+    def invoke(inputs, config=None):
+        prompt_value, key, hit = lookup(inputs)
+        if hit is not None:
+            return hit
+
+        def compute():
+            vector = None
+            if use_semantic:
+                vector = _normalize(cache.embeddings.embed_query(inputs[semantic_field]))
+                hit = cache.get_semantic(namespace, vector)
+                if hit is not None:
+                    return hit
+
+            cache.record_miss()
+            if tail is not None:
+                result = tail.invoke(prompt_value, config)
+            else:
+                result = chain.invoke(inputs, config)
+            cache.put(key, copy.deepcopy(result), namespace, vector)
+            return result
+
+        return cache.coalesce(key, compute)
+
+    async def ainvoke(inputs, config=None):
+        prompt_value, key, hit = lookup(inputs)
+        if hit is not None:
+            return hit
+
+        async def compute():
+            vector = None
+            if use_semantic:
+                vector = _normalize(await cache.embeddings.aembed_query(inputs[semantic_field]))
+                hit = cache.get_semantic(namespace, vector)
+                if hit is not None:
+                    return hit
+
+            cache.record_miss()
+            if tail is not None:
+                result = await tail.ainvoke(prompt_value, config)
+            else:
+                result = await chain.ainvoke(inputs, config)
+            cache.put(key, copy.deepcopy(result), namespace, vector)
+            return result
+
+        return await cache.acoalesce(key, compute)
+
+    return RunnableLambda(invoke, afunc=ainvoke, name="cached_chain")
@@ -0,0 +1,144 @@
+import json
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import TypeAdapter, ValidationError
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.output_parsers.transform import BaseTransformOutputParser
+from langchain_core.utils.json import parse_json_markdown
+
+
+_type_adapter = lru_cache(maxsize=None)(TypeAdapter)
+
+
+# ====================================
+# Incremental JSON: emit field top-level begitu value-nya lengkap
+# ====================================
+
+class IncrementalJsonObjectParser:
+    """Scanner satu kali jalan (O(n) total) untuk object JSON yang datang
+    per potongan. `feed()` mengembalikan pasangan (key, value) top-level yang
+    baru selesai; teks di luar object (mis. ```json fence) diabaikan.
+    Field yang bukan JSON valid -> OutputParserException."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.field_start = None
+        self.done = False
+
+    def feed(self, text):
+        self.buffer += text
+        completed = []
+        buf = self.buffer
+
+        while self.pos < len(buf) and not self.done:
+            ch = buf[self.pos]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.depth > 0:
+                    self.in_string = True
+            elif self.depth == 0:
+                if ch == "{":
+                    self.depth = 1
+                    self.field_start = self.pos + 1
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                if self.depth == 1:
+                    completed += self._close_field(buf)
+                    self.done = True
+                self.depth -= 1
+            elif ch == "," and self.depth == 1:
+                completed += self._close_field(buf)
+                self.field_start = self.pos + 1
+
+            self.pos += 1
+
+        return completed
+
+    def _close_field(self, buf):
+        segment = buf[self.field_start:self.pos].strip()
+        if not segment:
+            return []
+        try:
+            return list(json.loads("{" + segment + "}").items())
+        except json.JSONDecodeError as e:
+            raise OutputParserException(
+                f"Field JSON tidak valid: {e}", llm_output=segment
+            ) from e
+
+
+class StreamingJsonFieldParser(BaseTransformOutputParser[dict]):
+    """Pengganti JsonOutputParser untuk `chain.astream`: setiap kali satu field
+    top-level selesai (dan lolos validasi tipe field-nya), yield dict berisi
+    semua field yang sudah lengkap. `invoke` tetap mengembalikan dict penuh.
+    JSON rusak / tipe field salah di tengah stream -> OutputParserException,
+    sama seperti JsonOutputParser di jalur non-stream."""
+
+    pydantic_object: Optional[Any] = None
+
+    @property
+    def _type(self):
+        return "streaming_json_field"
+
+    def get_format_instructions(self):
+        return JsonOutputParser(pydantic_object=self.pydantic_object).get_format_instructions()
+
+    def parse(self, text):
+        return parse_json_markdown(text)
+
+    def _validate_field(self, key, value):
+        fields = getattr(self.pydantic_object, "model_fields", {})
+        if key not in fields:
+            return value
+        # validasi tipe field, lalu kembali ke bentuk dict/list seperti JsonOutputParser
+        adapter = _type_adapter(fields[key].annotation)
+        try:
+            return adapter.dump_python(adapter.validate_python(value))
+        except ValidationError as e:
+            raise OutputParserException(
+                f"Field '{key}' tidak valid: {e}", llm_output=json.dumps({key: value}, ensure_ascii=False)
+            ) from e
+
+    def _on_chunk(self, parser, fields, chunk):
+        text = chunk.content if isinstance(chunk, BaseMessage) else chunk
+        changed = False
+        for key, value in parser.feed(text):
+            fields[key] = self._validate_field(key, value)
+            changed = True
+        return changed
+
+    def _transform(self, input):
+        parser, fields = IncrementalJsonObjectParser(), {}
+        for chunk in input:
+            if self._on_chunk(parser, fields, chunk):
+                yield dict(fields)
+
+    async def _atransform(self, input):
+        parser, fields = IncrementalJsonObjectParser(), {}
+        async for chunk in input:
+            if self._on_chunk(parser, fields, chunk):
+                yield dict(fields)
+
+
+async def astream_fields(chain, inputs):
+    """`chain.astream` -> (key, value) untuk setiap field yang baru lengkap."""
+    seen = set()
+    async for partial in chain.astream(inputs):
+        for key, value in partial.items():
+            if key not in seen:
+                seen.add(key)
+                yield key, value
@@ -0,0 +1,41 @@
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableLambda
+
+
+# ====================================
+# Structured output native provider
+# ====================================
+# Schema Pydantic dikirim sebagai JSON schema lewat API (with_structured_output),
+# jadi {format_instructions} di prompt dikosongkan -> token input jauh lebih
+# sedikit. Model yang tidak mendukung -> jalur parser lama.
+
+def _to_dict(result):
+    # samakan bentuk output dengan JsonOutputParser (dict, bukan instance)
+    return result.model_dump() if hasattr(result, "model_dump") else result
+
+
+def parser_chain(prompt, llm, schema):
+    parser = JsonOutputParser(pydantic_object=schema)
+    prompt = prompt.partial(format_instructions=parser.get_format_instructions())
+    return prompt | llm | parser
+
+
+def structured_chain(prompt, llm, schema, method="json_schema"):
+    """`prompt` boleh berisi {format_instructions}; di mode native diisi "".
+
+    Validasi terjadi sekali, di parser milik with_structured_output.
+    Kalau call native gagal (mis. model tidak mendukung json_schema),
+    request diulang lewat jalur parser + format_instructions.
+    """
+    fallback = parser_chain(prompt, llm, schema)
+
+    try:
+        structured_llm = llm.with_structured_output(schema, method=method)
+    except NotImplementedError:
+        return fallback
+
+    if "format_instructions" in prompt.input_variables or "format_instructions" in prompt.partial_variables:
+        prompt = prompt.partial(format_instructions="")
+
+    native = prompt | structured_llm | RunnableLambda(_to_dict)
+    return native.with_fallbacks([fallback])
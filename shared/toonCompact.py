@@ -0,0 +1,217 @@
+import json
+import re
+import typing
+from typing import Literal
+
+from pydantic import BaseModel
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.json import parse_json_markdown
+from py_toon_format import encode, decode
+
+from structuredOutput import parser_chain
+
+
+TOON_FENCE_RE = re.compile(r"```(?:toon)?[ \t]*\n(.*?)(?:```|$)", re.DOTALL)
+LIST_HEADER_RE = re.compile(r"^(\s*)([^\s:\[]+)\[(?:\d+|N)?\]:\s*$")
+
+
+# ====================================
+# INPUT: data terstruktur -> TOON (tabel, bukan JSON verbose)
+# ====================================
+
+def _cell(value):
+    # satu baris per row: newline & spasi ganda di teks chunk dirapatkan
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def to_table(rows):
+    """List of dict -> row seragam (union key, nilai primitif) supaya
+    di-encode sebagai tabel `name[N]{a,b,c}:`."""
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    return [{c: _cell(row.get(c)) for c in columns} for row in rows]
+
+
+def encode_value(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+        return encode({"items": to_table(value)})
+    if isinstance(value, dict):
+        return encode({
+            k: to_table(v) if isinstance(v, list) and v and all(isinstance(x, dict) for x in v) else v
+            for k, v in value.items()
+        })
+    return encode(value)
+
+
+def docs_to_toon(docs, name="chunks", metadata_keys=("source", "start_index")):
+    """Chunk + metadata sebagai satu tabel TOON (header kolom hanya sekali)."""
+    rows = [
+        {**{k: d.metadata.get(k) for k in metadata_keys}, "text": d.page_content}
+        for d in docs
+    ]
+    return encode({name: to_table(rows)})
+
+
+def toon_inputs(fields):
+    """Stage compaction: `toon_inputs(["incidents"]) | chain`."""
+    def compact(inputs):
+        return {**inputs, **{f: encode_value(inputs[f]) for f in fields if f in inputs}}
+    return RunnableLambda(compact, name="toon_inputs")
+
+
+# ====================================
+# OUTPUT: schema ringkas -> jawaban TOON -> model Pydantic
+# ====================================
+# Object bersarang ditulis sebagai path bertitik (analysis.cpu: ...),
+# list sebagai item "- " per baris (decoder tidak menghormati quote di
+# list inline, jadi item berisi koma akan terpecah)
+
+def _type_hint(ann):
+    if typing.get_origin(ann) is Literal:
+        return "|".join(str(a) for a in typing.get_args(ann))
+    return {str: "str", int: "int", float: "float", bool: "true|false"}.get(ann, "str")
+
+
+def _schema_lines(schema, prefix=""):
+    for name, field in schema.model_fields.items():
+        ann, key = field.annotation, prefix + name
+        if isinstance(ann, type) and issubclass(ann, BaseModel):
+            yield from _schema_lines(ann, key + ".")
+        elif typing.get_origin(ann) is list:
+            yield f"{key}[N]:\n  - <{_type_hint(typing.get_args(ann)[0])}>"
+        else:
+            yield f"{key}: <{_type_hint(ann)}>"
+
+
+def toon_format_instructions(schema):
+    return (
+        "Jawab HANYA dengan satu blok ```toon (bukan JSON), satu field per baris:\n"
+        + "\n".join(_schema_lines(schema))
+        + "\nN = jumlah item list."
+    )
+
+
+def fix_list_counts(body):
+    """Samakan [N] di header list dengan jumlah item "- " yang benar-benar ada
+    (model sering salah hitung, decoder strict akan gagal)."""
+    lines = body.splitlines()
+    for i, line in enumerate(lines):
+        m = LIST_HEADER_RE.match(line)
+        if not m:
+            continue
+        indent, count = len(m.group(1)), 0
+        for nxt in lines[i + 1:]:
+            depth = len(nxt) - len(nxt.lstrip())
+            if depth <= indent:
+                break
+            count += depth == indent + 2 and nxt.lstrip().startswith("- ")
+        lines[i] = f"{m.group(1)}{m.group(2)}[{count}]:"
+    return "\n".join(lines)
+
+
+def flatten_dotted(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten_dotted(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def expand_dotted(data):
+    nested = {}
+    for key, value in data.items():
+        *parents, leaf = key.split(".")
+        node = nested
+        for p in parents:
+            node = node.setdefault(p, {})
+        node[leaf] = value
+    return nested
+
+
+def _item_to_str(value):
+    if isinstance(value, dict):     # "- a: b" terbaca sebagai object
+        return "; ".join(f"{k}: {v}" for k, v in value.items())
+    return value if isinstance(value, str) else str(value)
+
+
+def coerce_strings(data, schema):
+    """TOON tidak membedakan `30` dan `"30"`: angka di field str dikembalikan ke str."""
+    for name, field in schema.model_fields.items():
+        if name not in data:
+            continue
+        ann, value = field.annotation, data[name]
+        if ann is str and isinstance(value, (int, float, bool)):
+            data[name] = str(value)
+        elif typing.get_origin(ann) is list and typing.get_args(ann)[0] is str and isinstance(value, list):
+            data[name] = [_item_to_str(v) for v in value]
+        elif isinstance(ann, type) and issubclass(ann, BaseModel) and isinstance(value, dict):
+            coerce_strings(value, ann)
+    return data
+
+
+def encode_output(data):
+    """Kebalikan ToonOutputParser (mis. untuk contoh few-shot)."""
+    lines = []
+    for key, value in flatten_dotted(data).items():
+        if isinstance(value, list):
+            lines.append(f"{key}[{len(value)}]:")
+            lines += [f"  - {encode({'v': v})[3:]}" for v in value]
+        else:
+            lines.append(encode({key: value}))
+    return "\n".join(lines)
+
+
+class ToonOutputParser(BaseOutputParser[dict]):
+    """Decode jawaban TOON lalu validasi ke schema. Kalau model tetap menjawab
+    JSON, JSON itu yang dipakai; gagal keduanya -> OutputParserException."""
+
+    pydantic_object: typing.Any = None
+
+    @property
+    def _type(self):
+        return "toon"
+
+    def get_format_instructions(self):
+        return toon_format_instructions(self.pydantic_object)
+
+    def parse(self, text):
+        match = TOON_FENCE_RE.search(text)
+        body = match.group(1) if match else text
+
+        try:
+            data = decode(fix_list_counts(body.strip()))
+            if not isinstance(data, dict):      # mis. array di root: "[3]: a,b,c"
+                raise ValueError(f"root TOON harus object, bukan {type(data).__name__}")
+            data = coerce_strings(expand_dotted(data), self.pydantic_object)
+            return self.pydantic_object.model_validate(data).model_dump()
+        except (ValueError, TypeError, AttributeError) as toon_error:   # ValidationError turunan ValueError
+            try:
+                data = parse_json_markdown(text)
+                return self.pydantic_object.model_validate(data).model_dump()
+            except (ValueError, TypeError):
+                raise OutputParserException(
+                    f"Output bukan TOON/JSON valid: {toon_error}", llm_output=text
+                ) from toon_error
+
+
+def toon_chain(prompt, llm, schema):
+    """`prompt` berisi {format_instructions}. Jalur TOON dulu; kalau output
+    tidak bisa di-decode, request diulang sekali lewat jalur JSON parser."""
+    toon = (
+        prompt.partial(format_instructions=toon_format_instructions(schema))
+        | llm
+        | ToonOutputParser(pydantic_object=schema)
+    )
+    return toon.with_fallbacks(
+        [parser_chain(prompt, llm, schema)],
+        exceptions_to_handle=(OutputParserException,),
+    )
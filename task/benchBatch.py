@@ -0,0 +1,64 @@
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from taskD1_latihan import build_chain, troubleshoot_batch, troubleshoot_issue
+
+
+LATENCY_S = 0.2
+N_ISSUES = 32
+
+FAKE_REPORT = json.dumps({
+    "issue": "fake",
+    "root_cause": "fake root cause",
+    "possible_fixes": ["restart", "rollback"],
+    "risk_level": "medium",
+    "estimated_fix_time_minutes": 15,
+})
+
+
+class SlowFakeLLM(BaseChatModel):
+    """Mock LLM: latency tetap per call, async-friendly (asyncio.sleep)."""
+
+    latency: float = LATENCY_S
+
+    @property
+    def _llm_type(self):
+        return "slow-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=FAKE_REPORT))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=FAKE_REPORT))])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == "__main__":
+    chain = build_chain(llm=SlowFakeLLM(), cache=None)
+    issues = [f"Issue #{i}: pod restart loop" for i in range(N_ISSUES)]
+
+    print(f"{N_ISSUES} issues, mock LLM latency {LATENCY_S * 1000:.0f} ms\n")
+
+    t, _ = timed(lambda: [troubleshoot_issue(chain, iss) for iss in issues])
+    print(f"{'sequential invoke':<24} {t:>7.2f}s")
+
+    for limit in (1, 2, 4, 8, 16, 32):
+        t, results = timed(lambda: troubleshoot_batch(chain, issues, max_concurrency=limit))
+        assert all(r is not None for r in results)
+        print(f"{f'batch concurrency={limit}':<24} {t:>7.2f}s  "
+              f"(ideal {N_ISSUES / limit * LATENCY_S:.2f}s)")
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "shared"))
+from chainRegistry import make_chain
+from fakeModels import FakeChatOpenAI, LatencyModel, json_response, json_schema_of, sample_from_schema
+from instrumentation import Metrics, instrument
+from microBatch import MicroBatcher
+from taskD1 import BATCH_TEMPLATE, TEMPLATE, DevOpsTroubleshoot
+
+
+# ====================================
+# Burst alert: call satuan vs micro-batch (JSON array per batch)
+# ====================================
+# LLM palsu: overhead per call ~400 ms + decode 5 ms/token output, maks 4 call
+# paralel (mis. batas rate limit). Sebagian item di jawaban batch sengaja
+# hilang / tidak valid -> jalur fallback ke call satuan ikut terukur.
+
+N_ALERTS = 64
+BURST_S = 0.2                # semua alert datang dalam 200 ms
+MAX_CONCURRENCY = 4
+BATCH_SIZES = [1, 4, 8, 16]  # 1 = tanpa batching (semua lewat chain satuan)
+BAD_ITEM_RATE = 0.05
+
+ITEM_RE = re.compile(r"^\[(\d+)\] ", re.MULTILINE)
+LATENCY = LatencyModel("lognormal", median_s=0.4, spread=0.3,
+                       prefill_s_per_token=2e-5, decode_s_per_token=0.005)
+
+
+def responder(seed=0):
+    rng = random.Random(seed)
+    schema = json_schema_of(DevOpsTroubleshoot)
+
+    def reply(prompt):
+        indexes = ITEM_RE.findall(prompt)
+        if not indexes:
+            return json_response(DevOpsTroubleshoot)
+        items = []
+        for i in indexes:
+            item = {"index": int(i), **sample_from_schema(schema)}
+            r = rng.random()
+            if r < BAD_ITEM_RATE / 2:
+                continue                          # item hilang dari array
+            if r < BAD_ITEM_RATE:
+                item["risk_level"] = "sedang"     # enum tidak valid
+            items.append(item)
+        return json.dumps(items, ensure_ascii=False)
+
+    return reply
+
+
+def token_totals(metrics):
+    totals = {"prompt": 0, "completion": 0}
+    for (name, labels), value in metrics.counters.items():
+        if name == "tokens_total":
+            totals[dict(labels)["type"]] += value
+    return totals
+
+
+async def burst(batcher, n=N_ALERTS, seed=1):
+    rng = random.Random(seed)
+    latencies = []
+
+    async def alert(i):
+        await asyncio.sleep(rng.uniform(0, BURST_S))
+        t0 = time.perf_counter()
+        await batcher.submit({"issue": f"Alert #{i}: pod payment-svc restart loop (exit 137)"})
+        latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(alert(i) for i in range(n)))
+    return time.perf_counter() - start, np.array(latencies) * 1000
+
+
+async def run(max_batch):
+    llm = FakeChatOpenAI(responses=responder(), latency=LATENCY, seed=0)
+    batcher = MicroBatcher(
+        llm, DevOpsTroubleshoot, BATCH_TEMPLATE,
+        single_chain=make_chain(TEMPLATE, schema=DevOpsTroubleshoot, llm=llm),
+        render_item=lambda inputs: inputs["issue"],
+        max_batch=max_batch, max_wait_s=0.02, max_concurrency=MAX_CONCURRENCY,
+    )
+    metrics = Metrics()
+    with instrument(metrics=metrics):
+        wall, lat = await burst(batcher)
+
+    tokens = token_totals(metrics)
+    stats = batcher.stats()
+    label = "satuan" if max_batch == 1 else f"batch<= {max_batch}"
+    print(f"{label:<10} {llm.calls:>6} {stats['fallback_items']:>9} {tokens['prompt']:>10.0f} "
+          f"{tokens['completion']:>10.0f} {wall:>7.2f} {np.percentile(lat, 50):>8.0f} "
+          f"{np.percentile(lat, 99):>8.0f}")
+
+
+if __name__ == "__main__":
+    print(f"{N_ALERTS} alert dalam {BURST_S * 1000:.0f} ms, maks {MAX_CONCURRENCY} call LLM paralel, "
+          f"{BAD_ITEM_RATE:.0%} item batch rusak\n")
+    print(f"{'mode':<10} {'calls':>6} {'fallback':>9} {'tok input':>10} {'tok output':>10} "
+          f"{'wall s':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for size in BATCH_SIZES:
+        asyncio.run(run(size))
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "shared"))
+from fakeModels import FakeChatOpenAI, LatencyModel
+from taskD1_serve import TroubleshootService
+
+
+# ====================================
+# Load test taskD1_serve: open-loop (kedatangan Poisson), LLM palsu
+# ====================================
+# Issue diambil dari pool dengan distribusi Zipf -> beberapa issue "panas"
+# datang berulang kali bersamaan, seperti alert storm di production.
+#
+#   python benchServe.py                          # in-process (httpx.ASGITransport)
+#   python benchServe.py --url http://127.0.0.1:8000 --rates 20 50
+#     (server: python taskD1_serve.py --fake)
+
+LLM_MEDIAN_S = 0.2
+LLM_SIGMA = 0.4
+RATES = [20, 40, 80, 160]
+DURATION_S = 5.0
+N_DISTINCT = 40
+MAX_CONCURRENCY = 8
+MAX_QUEUE = 32
+
+SYMPTOMS = [
+    "Pod CrashLoopBackOff karena ImagePullBackOff",
+    "Docker compose service restart dengan exit code 137",
+    "Latency API naik drastis setelah deploy",
+    "HPA tidak scaling meskipun CPU 200%",
+    "Disk node hampir penuh oleh log aplikasi",
+]
+
+
+def fake_llm():
+    return FakeChatOpenAI(latency=LatencyModel("lognormal", LLM_MEDIAN_S, LLM_SIGMA), seed=0)
+
+
+def make_issues(n=N_DISTINCT):
+    issues = [f"{SYMPTOMS[i % len(SYMPTOMS)]} (service-{i})" for i in range(n)]
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(n)]
+    return issues, weights
+
+
+async def load_test(client, rate, duration_s, seed=0):
+    rng = random.Random(seed)
+    issues, weights = make_issues()
+    results = []
+
+    async def one(issue):
+        t0 = time.perf_counter()
+        try:
+            resp = await client.post("/troubleshoot", json={"issue": issue}, timeout=120)
+            status = resp.status_code
+        except httpx.HTTPError:
+            status = 0
+        results.append((status, time.perf_counter() - t0))
+
+    tasks = []
+    start = time.perf_counter()
+    next_at = 0.0
+    while next_at < duration_s:
+        await asyncio.sleep(max(0.0, start + next_at - time.perf_counter()))
+        tasks.append(asyncio.create_task(one(rng.choices(issues, weights)[0])))
+        next_at += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    ok = np.array([lat for status, lat in results if status == 200]) * 1000
+    return {
+        "sent": len(results),
+        "ok": len(ok),
+        "rejected": sum(status == 429 for status, _ in results),
+        "errors": sum(status not in (200, 429) for status, _ in results),
+        "ok_rps": len(ok) / elapsed,
+        "p50_ms": float(np.percentile(ok, 50)) if len(ok) else float("nan"),
+        "p99_ms": float(np.percentile(ok, 99)) if len(ok) else float("nan"),
+    }
+
+
+async def run_in_process(rates, duration_s):
+    for rate in rates:
+        for coalesce in (True, False):
+            service = TroubleshootService(llm=fake_llm(), cache=None, max_concurrency=MAX_CONCURRENCY,
+                                          max_queue=MAX_QUEUE, coalesce=coalesce)
+            await service.startup()
+            transport = httpx.ASGITransport(app=service)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                row = await load_test(client, rate, duration_s)
+            stats = service.stats()
+            print_row(rate, "single-flight" if coalesce else "tanpa coalesce", row,
+                      stats["llm_calls"], stats["coalesced"])
+
+
+async def run_remote(url, rates, duration_s):
+    async with httpx.AsyncClient(base_url=url) as client:
+        for rate in rates:
+            before = (await client.get("/stats")).json()
+            row = await load_test(client, rate, duration_s)
+            after = (await client.get("/stats")).json()
+            print_row(rate, "server", row, after["llm_calls"] - before["llm_calls"],
+                      after["coalesced"] - before["coalesced"])
+
+
+def print_row(rate, mode, row, llm_calls, coalesced):
+    print(f"{rate:>6} {mode:<15} {row['sent']:>6} {row['ok']:>6} {row['rejected']:>6} "
+          f"{row['errors']:>5} {row['ok_rps']:>8.1f} {row['p50_ms']:>8.0f} {row['p99_ms']:>8.0f} "
+          f"{llm_calls:>8} {coalesced:>9}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="server yang sudah jalan; default in-process")
+    ap.add_argument("--rates", type=float, nargs="+", default=RATES)
+    ap.add_argument("--duration", type=float, default=DURATION_S)
+    args = ap.parse_args()
+
+    print(f"LLM palsu median {LLM_MEDIAN_S * 1000:.0f} ms (lognormal sigma {LLM_SIGMA}), "
+          f"{N_DISTINCT} issue Zipf, {args.duration:g}s per rate")
+    if not args.url:
+        print(f"max_concurrency={MAX_CONCURRENCY}, max_queue={MAX_QUEUE}")
+    print(f"\n{'rps':>6} {'mode':<15} {'sent':>6} {'200':>6} {'429':>6} {'err':>5} "
+          f"{'ok rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'LLM call':>8} {'coalesced':>9}")
+
+    if args.url:
+        asyncio.run(run_remote(args.url, args.rates, args.duration))
+    else:
+        asyncio.run(run_in_process(args.rates, args.duration))
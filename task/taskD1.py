@@ -1,44 +1,129 @@
+import asyncio
+import sys
+from functools import lru_cache
+from pathlib import Path
+
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
+from langchain_core.exceptions import OutputParserException
 from typing import Literal
 
+from taskD1_latihan import troubleshoot_batch
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "shared"))
+from chainRegistry import get_chain, get_llm
+from microBatch import MicroBatcher
+from responseCache import ResponseCache, exact_key_fn, with_response_cache
+from streamingJson import astream_fields
+
 load_dotenv()
 
 class DevOpsTroubleshoot(BaseModel):
     issue: str = Field(description="Deskripsi singkat masalah yang terjadi")
     root_cause: str = Field(description="Analisis penyebab utama masalah")
-    possible_fixes: list[str] = Field(description="Langkah-langkah perbaikan yang bisa dilakukan")
     risk_level: Literal["low", "medium", "high"] = Field(description="Tingkat risiko jika tidak segera ditangani")
+    possible_fixes: list[str] = Field(description="Langkah-langkah perbaikan yang bisa dilakukan")
     estimated_fix_time_minutes: int = Field(description="Perkiraan waktu perbaikan dalam menit")
 
-def jsonOutput(issue):
-    
-    parser = JsonOutputParser(pydantic_object=DevOpsTroubleshoot)
-
-    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2)
-
-    prompt = PromptTemplate(
-        template=(
-            "Kamu adalah DevOps senior.\n"
-            "Analisa issue berikut dan berikan output dalam format JSON sesuai schema.\n\n"
-            "{format_instructions}\n\n"
-            "Issue: {issue}\n"
-        ),
-        input_variables=["issue"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
-    )
+TEMPLATE = (
+    "Kamu adalah DevOps senior.\n"
+    "Analisa issue berikut dan berikan output dalam format JSON sesuai schema.\n\n"
+    "{format_instructions}\n\n"
+    "Issue: {issue}\n"
+)
 
-    chain = prompt | llm | parser
+# versi batch: satu prompt untuk banyak issue, format_instructions sekali
+BATCH_TEMPLATE = (
+    "Kamu adalah DevOps senior.\n"
+    "Analisa SETIAP issue di bawah secara terpisah dan berikan output dalam format JSON sesuai schema.\n\n"
+    "{format_instructions}\n\n"
+    "Issues:\n{items}\n"
+)
+
+
+# issue yang sama (sering berulang di production) tidak perlu call LLM lagi
+RESPONSE_CACHE = ResponseCache(max_entries=1024, ttl_s=3600)
+
+
+@lru_cache(maxsize=2)
+def build_chain(structured=False):
+    # parser, ChatOpenAI (+ HTTP pool) dan prompt dibuat sekali lalu di-cache
+    # structured=True -> schema lewat API, tanpa format_instructions di prompt
+    chain = get_chain(TEMPLATE, schema=DevOpsTroubleshoot, model="gpt-4.1-mini",
+                      temperature=0.2, structured=structured)
+    return with_response_cache(chain, RESPONSE_CACHE)
+
+
+def jsonOutput(issue):
+    chain = build_chain()
 
     result = chain.invoke({"issue": issue})
     return result
 
 
-issues = ["Pod Kubernetes CrashLoopBackOff karena ImagePullBackOff","Latency API meningkat drastis setelah deploy versi baru","Disk usage di server hampir 100% dan aplikasi mulai error"]
+@lru_cache(maxsize=1)
+def get_batcher(max_batch=16, max_wait_s=0.02):
+    # burst alert: issue yang datang dalam 20 ms (maks 16) -> satu call LLM,
+    # item yang gagal divalidasi diulang lewat build_chain() satu per satu.
+    # key = key exact RESPONSE_CACHE milik jsonOutput -> issue yang sudah pernah
+    # dijawab tidak masuk batch, issue kembar dalam satu window digabung
+    raw_chain = get_chain(TEMPLATE, schema=DevOpsTroubleshoot, model="gpt-4.1-mini", temperature=0.2)
+    return MicroBatcher(
+        get_llm(model="gpt-4.1-mini", temperature=0.2),
+        DevOpsTroubleshoot,
+        BATCH_TEMPLATE,
+        single_chain=build_chain(),
+        render_item=lambda inputs: " ".join(inputs["issue"].split()),
+        max_batch=max_batch,
+        max_wait_s=max_wait_s,
+        key_fn=exact_key_fn(raw_chain),
+        cache=RESPONSE_CACHE,
+    )
+
+
+async def ajsonOutput(issue):
+    return await get_batcher().submit({"issue": issue})
+
+
+async def jsonOutput_burst(issues):
+    return await asyncio.gather(*(ajsonOutput(issue) for issue in issues), return_exceptions=True)
+
+
+async def jsonOutputStream(issue):
+    # mode streaming untuk UI on-call: yield (field, value) begitu field lengkap
+    chain = get_chain(TEMPLATE, schema=DevOpsTroubleshoot, model="gpt-4.1-mini",
+                      temperature=0.2, streaming=True)
+    async for key, value in astream_fields(chain, {"issue": issue}):
+        yield key, value
+
+
+async def print_stream(issues):
+    for issue in issues:
+        print(f"\n=== STREAM: {issue} ===")
+        try:
+            async for key, value in jsonOutputStream(issue):
+                print(f"[{key}] {value}")
+        except OutputParserException as e:
+            # field yang sudah tampil tetap berguna; sisa jawaban rusak
+            print(f"[error] output tidak valid: {e}")
+
+
+if __name__ == "__main__":
+    issues = ["Pod Kubernetes CrashLoopBackOff karena ImagePullBackOff","Latency API meningkat drastis setelah deploy versi baru","Disk usage di server hampir 100% dan aplikasi mulai error"]
+
+    if "--stream" in sys.argv:
+        asyncio.run(print_stream(issues))
+        sys.exit(0)
+
+    if "--batch" in sys.argv:
+        for result in asyncio.run(jsonOutput_burst(issues)):
+            print(result)
+        print("\nMicro-batch:", get_batcher().stats())
+        sys.exit(0)
+
+    # semua issue diproses paralel, bukan satu per satu
+    chain = build_chain(structured="--structured" in sys.argv)
+    for result in troubleshoot_batch(chain, issues, max_concurrency=4):
+        print(result)
 
-for issue in issues:
-    result = jsonOutput(issue)
-    print(result)
\ No newline at end of file
+    print("\nResponse cache:", RESPONSE_CACHE.stats())
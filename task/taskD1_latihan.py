@@ -1,10 +1,15 @@
+import asyncio
+import sys
+from pathlib import Path
 from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, ValidationError
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "shared"))
+from chainRegistry import get_chain, make_chain
+from instrumentation import count, instrument, print_stage_report
+from responseCache import ResponseCache, with_response_cache
 
 load_dotenv()
 
@@ -12,34 +17,36 @@ load_dotenv()
 class DevOpsTroubleshoot(BaseModel):
     issue: str = Field(description="Deskripsi singkat masalah yang terjadi")
     root_cause: str = Field(description="Analisis penyebab utama masalah")
-    possible_fixes: list[str] = Field(description="Langkah-langkah perbaikan yang bisa dilakukan")
     risk_level: Literal["low", "medium", "high"] = Field(description="Tingkat risiko jika tidak segera ditangani")
+    possible_fixes: list[str] = Field(description="Langkah-langkah perbaikan yang bisa dilakukan")
     estimated_fix_time_minutes: int = Field(description="Perkiraan waktu perbaikan dalam menit")
 
 
-def build_chain():
-    parser = JsonOutputParser(pydantic_object=DevOpsTroubleshoot)
+TEMPLATE = (
+    "Kamu adalah DevOps engineer senior.\n"
+    "Analisa issue berikut dan jawab DALAM FORMAT JSON sesuai schema.\n\n"
+    "{format_instructions}\n\n"
+    "Issue: {issue}\n"
+)
 
-    llm = ChatOpenAI(
-        model="gpt-4.1-mini",
-        temperature=0.2,
-    )
 
-    prompt = PromptTemplate(
-        template=(
-            "Kamu adalah DevOps engineer senior.\n"
-            "Analisa issue berikut dan jawab DALAM FORMAT JSON sesuai schema.\n\n"
-            "{format_instructions}\n\n"
-            "Issue: {issue}\n"
-        ),
-        input_variables=["issue"],
-        partial_variables={
-            "format_instructions": parser.get_format_instructions(),
-        },
-    )
+# exact tier: prompt + model + temperature; semantic tier bisa diaktifkan
+# dengan ResponseCache(embeddings=..., similarity_threshold=...)
+RESPONSE_CACHE = ResponseCache(max_entries=1024, ttl_s=3600)
 
-    chain = prompt | llm | parser
-    return chain
+
+def build_chain(llm=None, cache=RESPONSE_CACHE, structured=False):
+    # llm custom (mis. mock untuk benchmark) -> chain baru;
+    # default -> chain dari registry, dibangun sekali per proses
+    if llm is not None:
+        chain = make_chain(TEMPLATE, schema=DevOpsTroubleshoot, llm=llm, structured=structured)
+    else:
+        chain = get_chain(TEMPLATE, schema=DevOpsTroubleshoot, model="gpt-4.1-mini",
+                          temperature=0.2, structured=structured)
+
+    if cache is None:
+        return chain
+    return with_response_cache(chain, cache)
 
 
 def troubleshoot_issue(chain, issue: str):
@@ -49,16 +56,50 @@ def troubleshoot_issue(chain, issue: str):
         print("✅ Parsed successfully.")
         return result
     except ValidationError as ve:
+        count("failures_total", kind="validation")
         print("❌ Validation error (schema tidak terpenuhi):")
         print(ve)
     except Exception as e:
+        count("failures_total", kind=type(e).__name__)
         print("❌ Error lain saat memproses issue:")
         print(repr(e))
     return None
 
 
+def report_result(issue: str, result):
+    print(f"\n=== ANALISA ISSUE: {issue} ===")
+    if isinstance(result, ValidationError):
+        count("failures_total", kind="validation")
+        print("❌ Validation error (schema tidak terpenuhi):")
+        print(result)
+    elif isinstance(result, Exception):
+        count("failures_total", kind=type(result).__name__)
+        print("❌ Error lain saat memproses issue:")
+        print(repr(result))
+    else:
+        print("✅ Parsed successfully.")
+        return result
+    return None
+
+
+async def atroubleshoot_batch(chain, issues: list[str], max_concurrency: int = 4):
+    # semua issue jalan paralel (maks max_concurrency in-flight);
+    # return_exceptions -> error satu issue tidak menggagalkan yang lain
+    results = await chain.abatch(
+        [{"issue": iss} for iss in issues],
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=True,
+    )
+    # abatch menjaga urutan input
+    return [report_result(iss, res) for iss, res in zip(issues, results)]
+
+
+def troubleshoot_batch(chain, issues: list[str], max_concurrency: int = 4):
+    return asyncio.run(atroubleshoot_batch(chain, issues, max_concurrency))
+
+
 def main():
-    chain = build_chain()
+    chain = build_chain(structured="--structured" in sys.argv)
 
     issues = [
         "Docker compose service terus restart dengan exit code 137",
@@ -66,11 +107,17 @@ def main():
         "Latency API meningkat drastis setelah deploy versi baru",
     ]
 
-    for iss in issues:
-        res = troubleshoot_issue(chain, iss)
-        if res is not None:
-            print(res)
-        print("-" * 60)
+    # --trace -> span per stage ke traces.jsonl + histogram Prometheus ke metrics.prom
+    trace = "--trace" in sys.argv
+    with instrument(trace_path="traces.jsonl" if trace else None,
+                    prom_path="metrics.prom" if trace else None):
+        for res in troubleshoot_batch(chain, issues, max_concurrency=4):
+            if res is not None:
+                print(res)
+            print("-" * 60)
+
+    print("Response cache:", RESPONSE_CACHE.stats())
+    print_stage_report()
 
 
 if __name__ == "__main__":
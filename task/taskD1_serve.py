@@ -0,0 +1,211 @@
+import asyncio
+import json
+import sys
+
+from taskD1_latihan import RESPONSE_CACHE, build_chain
+
+
+# ====================================
+# HTTP service (ASGI) untuk troubleshooting chain
+# ====================================
+# - chain dibangun sekali saat startup (lifespan), dipakai semua request
+# - maks `max_concurrency` call LLM jalan bersamaan, sisanya antre
+# - antrean penuh (`max_queue`) -> 429 + Retry-After, bukan antre tanpa batas
+# - issue identik yang sedang diproses digabung (single-flight):
+#   satu call LLM, hasilnya dibagikan ke semua request yang menunggu
+#
+#   uvicorn taskD1_serve:app --port 8000
+#   curl -X POST localhost:8000/troubleshoot -d '{"issue": "Pod CrashLoopBackOff"}'
+
+
+class Overloaded(Exception):
+    pass
+
+
+class SingleFlight:
+    """Satu task per key; pemanggil berikutnya menunggu task yang sama."""
+
+    def __init__(self):
+        self._tasks = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        task = self._tasks.get(key)
+        if task is None:
+            self.leaders += 1
+            # task terpisah dari request pertama -> client yang disconnect
+            # tidak membatalkan call untuk request lain yang ikut menunggu
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self):
+        return len(self._tasks)
+
+
+def issue_key(issue):
+    # beda spasi / newline saja dianggap issue yang sama
+    return " ".join(issue.split())
+
+
+class TroubleshootService:
+    def __init__(self, llm=None, cache=RESPONSE_CACHE, structured=False,
+                 max_concurrency=8, max_queue=32, timeout_s=60.0, coalesce=True):
+        self.llm = llm
+        self.cache = cache
+        self.structured = structured
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout_s = timeout_s
+        self.coalesce = coalesce
+
+        self.chain = None
+        self.flights = SingleFlight()
+        self._slots = None
+        self._pending = 0          # call LLM yang jalan + yang antre slot
+        self.llm_calls = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    async def startup(self):
+        if self.chain is None:
+            self.chain = build_chain(llm=self.llm, cache=self.cache, structured=self.structured)
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    # ---------- inti: admission control + single-flight ----------
+    async def _call_llm(self, issue):
+        if self._pending >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise Overloaded
+        self._pending += 1
+        self.llm_calls += 1
+        try:
+            async with self._slots:
+                return await asyncio.wait_for(self.chain.ainvoke({"issue": issue}), self.timeout_s)
+        finally:
+            self._pending -= 1
+
+    async def troubleshoot(self, issue):
+        await self.startup()
+        if self.coalesce:
+            return await self.flights.do(issue_key(issue), lambda: self._call_llm(issue))
+        return await self._call_llm(issue)
+
+    def stats(self):
+        return {
+            "in_flight": self.flights.in_flight(),
+            "pending_llm_calls": self._pending,
+            "llm_calls": self.llm_calls,
+            "coalesced": self.flights.coalesced,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    # ---------- ASGI ----------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        # transport tanpa lifespan (mis. httpx.ASGITransport) -> build di request pertama
+        await self.startup()
+        route = (scope["method"], scope["path"])
+
+        if route == ("GET", "/healthz"):
+            await send_json(send, 200, {"status": "ok"})
+        elif route == ("GET", "/stats"):
+            await send_json(send, 200, self.stats())
+        elif route == ("POST", "/troubleshoot"):
+            await self._handle_troubleshoot(receive, send)
+        else:
+            await send_json(send, 404, {"error": "not found"})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": repr(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_troubleshoot(self, receive, send):
+        try:
+            issue = json.loads(await read_body(receive))["issue"]
+            if not isinstance(issue, str) or not issue.strip():
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            await send_json(send, 400, {"error": 'body harus JSON {"issue": "..."}'})
+            return
+
+        try:
+            result = await self.troubleshoot(issue)
+        except Overloaded:
+            await send_json(send, 429, {"error": "server sibuk, coba lagi"},
+                            headers=[(b"retry-after", b"1")])
+            return
+        except asyncio.TimeoutError:
+            self.failed += 1
+            await send_json(send, 504, {"error": "LLM timeout"})
+            return
+        except Exception as e:
+            # ValidationError / OutputParserException / error API
+            self.failed += 1
+            await send_json(send, 502, {"error": type(e).__name__, "detail": str(e)[:500]})
+            return
+
+        self.completed += 1
+        await send_json(send, 200, result)
+
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+app = TroubleshootService()
+
+
+def main():
+    # --fake -> FakeChatOpenAI (tanpa OpenAI key), untuk coba lokal / load test
+    import uvicorn
+
+    service = app
+    if "--fake" in sys.argv:
+        from benchServe import fake_llm
+        service = TroubleshootService(llm=fake_llm(), cache=None)
+
+    uvicorn.run(service, host="127.0.0.1", port=8000, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()